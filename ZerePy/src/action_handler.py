@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 logger = logging.getLogger("action_handler")
@@ -16,5 +17,14 @@ def execute_action(agent, action_name, **kwargs):
     else:
         logger.error(f"Action {action_name} not found")
         return None
-    
 
+async def execute_action_async(agent, action_name, **kwargs):
+    """Await a registered action, running plain (blocking) handlers in a worker thread"""
+    if action_name not in action_registry:
+        logger.error(f"Action {action_name} not found")
+        return None
+
+    handler = action_registry[action_name]
+    if asyncio.iscoroutinefunction(handler):
+        return await handler(agent, **kwargs)
+    return await asyncio.to_thread(handler, agent, **kwargs)
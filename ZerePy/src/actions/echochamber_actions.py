@@ -48,16 +48,18 @@ def reply_echochambers(agent, **kwargs):
         agent.state["echochambers_replied_messages"] = set()
         
 
-    # Get recent messages
-    history = agent.connection_manager.perform_action(
-        connection_name="echochambers",
-        action_name="get-room-history",
-        params={}
-    )
+    # Recent messages, prefetched in the background
+    history = agent.state.get("echochambers_history")
 
     if history:
         agent.logger.info(f"Found {len(history)} messages in history")
-        for message in history:
+        own_username = agent.connection_manager.connections["echochambers"].config["sender_username"]
+        batch_size = getattr(agent, "echochambers_reply_batch_size", 3)
+
+        # Collect a batch of messages to reply to, then draft all replies at once
+        messages = []
+        while history and len(messages) < batch_size:
+            message = history.pop(0)
             message_id = message.get('id')
             sender = message.get('sender', {})
             sender_username = sender.get('username')
@@ -71,24 +73,30 @@ def reply_echochambers(agent, **kwargs):
             # Skip if:
             # 1. It's our message
             # 2. We've already replied to it
-            if (sender_username == agent.connection_manager.connections["echochambers"].config["sender_username"] or 
+            if (sender_username == own_username or
                 message_id in agent.state.get("echochambers_replied_messages", set())):
                 agent.logger.info(f"Skipping message from {sender_username} (already replied or own message)")
                 continue
                 
             agent.logger.info(f"\n💬 GENERATING REPLY to: @{sender_username} - {content[:69]}...")
-            
+            messages.append(message)
+
+        prompts = []
+        for message in messages:
+            sender_username = message['sender']['username']
             refer_username = random.random() < 0.7
             username_prompt = f"Refer the sender by their @{sender_username}" if refer_username else "Respond without directly referring to the sender"
-            prompt = REPLY_ECHOCHAMBER_PROMPT.format(
-                content=content,
+            prompts.append(REPLY_ECHOCHAMBER_PROMPT.format(
+                content=message['content'],
                 sender_username=sender_username,
                 room_topic=agent.state['room_info']['topic'],
                 tags=", ".join(agent.state['room_info']['tags']),
                 username_prompt=username_prompt
-            )
-            reply = agent.prompt_llm(prompt)
-            
+            ))
+        replies = agent.prompt_llm_batch(prompts)
+
+        posted = False
+        for message, reply in zip(messages, replies):
             if reply:
                 agent.logger.info(f"\n🚀 Posting reply: '{reply[:69]}...'")
                 agent.connection_manager.perform_action(
@@ -96,9 +104,10 @@ def reply_echochambers(agent, **kwargs):
                     action_name="send-message",
                     params=[reply]
                 )
-                agent.state["echochambers_replied_messages"].add(message_id)
+                agent.state["echochambers_replied_messages"].add(message['id'])
                 agent.logger.info("✅ Reply posted successfully!")
-                return True
+                posted = True
+        return posted
     else:
         agent.logger.info("No messages in history")
     return False
\ No newline at end of file
@@ -1,6 +1,6 @@
 import logging
 import os
-from dotenv import load_dotenv
+from src.helpers.env_store import env_store
 from src.action_handler import register_action
 
 logger = logging.getLogger("actions.ethereum_actions")
@@ -33,7 +33,7 @@ def get_eth_balance(agent, **kwargs):
     try:
         token_address = kwargs.get("token_address")
         
-        load_dotenv()
+        env_store.load()
         private_key = os.getenv('ETH_PRIVATE_KEY')
         web3 = agent.connection_manager.connections["ethereum"]._web3
         account = web3.eth.account.from_key(private_key)
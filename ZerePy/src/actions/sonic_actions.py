@@ -1,6 +1,6 @@
 import logging
 import os
-from dotenv import load_dotenv
+from src.helpers.env_store import env_store
 from src.action_handler import register_action
 
 logger = logging.getLogger("actions.sonic_actions")
@@ -38,7 +38,7 @@ def get_sonic_balance(agent, **kwargs):
         token_address = kwargs.get("token_address")
         
         if not address:
-            load_dotenv()
+            env_store.load()
             private_key = os.getenv('SONIC_PRIVATE_KEY')
             web3 = agent.connection_manager.connections["sonic"]._web3
             account = web3.eth.account.from_key(private_key)
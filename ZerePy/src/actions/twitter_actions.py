@@ -39,26 +39,37 @@ def post_tweet(agent, **kwargs):
 @register_action("reply-to-tweet")
 def reply_to_tweet(agent, **kwargs):
     if "timeline_tweets" in agent.state and agent.state["timeline_tweets"] is not None and len(agent.state["timeline_tweets"]) > 0:
-        tweet = agent.state["timeline_tweets"].pop(0)
-        tweet_id = tweet.get('id')
-        if not tweet_id:
-            return
+        # Draft replies for a page of the timeline in one batch
+        batch_size = getattr(agent, "tweet_reply_batch_size", 5)
+        tweets = []
+        while agent.state["timeline_tweets"] and len(tweets) < batch_size:
+            tweet = agent.state["timeline_tweets"].pop(0)
+            if tweet.get('id'):
+                tweets.append(tweet)
+        if not tweets:
+            return False
 
-        agent.logger.info(f"\n💬 GENERATING REPLY to: {tweet.get('text', '')[:50]}...")
+        agent.logger.info(f"\n💬 GENERATING {len(tweets)} REPLIES")
+        for tweet in tweets:
+            agent.logger.info(f"- {tweet.get('text', '')[:50]}...")
 
-        base_prompt = REPLY_TWEET_PROMPT.format(tweet_text =tweet.get('text') )
+        prompts = [REPLY_TWEET_PROMPT.format(tweet_text=tweet.get('text')) for tweet in tweets]
         system_prompt = agent._construct_system_prompt()
-        reply_text = agent.prompt_llm(prompt=base_prompt, system_prompt=system_prompt)
+        replies = agent.prompt_llm_batch(prompts, system_prompt=system_prompt)
 
-        if reply_text:
+        posted = False
+        for tweet, reply_text in zip(tweets, replies):
+            if not reply_text:
+                continue
             agent.logger.info(f"\n🚀 Posting reply: '{reply_text}'")
             agent.connection_manager.perform_action(
                 connection_name="twitter",
                 action_name="reply-to-tweet",
-                params=[tweet_id, reply_text]
+                params=[tweet['id'], reply_text]
             )
             agent.logger.info("✅ Reply posted successfully!")
-            return True
+            posted = True
+        return posted
     else:
         agent.logger.info("\n👀 No tweets found to reply to...")
         return False
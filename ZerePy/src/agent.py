@@ -1,13 +1,21 @@
+import asyncio
 import json
-import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import List, Optional
+from src.helpers.env_store import env_store
 from src.connection_manager import ConnectionManager
 from src.helpers import print_h_bar
-from src.action_handler import execute_action
+from src.helpers.http_pool import http_pool
+from src.helpers.prefetch import InputBuffer, Prefetcher
+from src.helpers.state_store import AgentStateStore
+from src.helpers.example_tweets import example_tweet_store
+from src.action_handler import execute_action, execute_action_async
+from src.task_scheduler import TaskScheduler
 import src.actions.twitter_actions  
 import src.actions.echochamber_actions
 import src.actions.solana_actions
@@ -20,10 +28,12 @@ logger = logging.getLogger("agent")
 class ZerePyAgent:
     def __init__(
             self,
-            agent_name: str
+            agent_name: str,
+            connection_cache: dict = None,
+            agents_dir: Path = Path("agents")
     ):
         try:
-            agent_path = Path("agents") / f"{agent_name}.json"
+            agent_path = Path(agents_dir) / f"{agent_name}.json"
             agent_dict = json.load(open(agent_path, "r"))
 
             missing_fields = [field for field in REQUIRED_FIELDS if field not in agent_dict]
@@ -36,10 +46,28 @@ class ZerePyAgent:
             self.examples = agent_dict["examples"]
             self.example_accounts = agent_dict["example_accounts"]
             self.loop_delay = agent_dict["loop_delay"]
-            self.connection_manager = ConnectionManager(agent_dict["config"])
+            self.connection_manager = ConnectionManager(
+                agent_dict["config"],
+                connection_cache=connection_cache,
+                config_status_ttl=agent_dict.get("config_status_ttl", 300),
+                config_failure_ttl=agent_dict.get("config_failure_ttl", 10)
+            )
             self.use_time_based_weights = agent_dict["use_time_based_weights"]
             self.time_based_multipliers = agent_dict["time_based_multipliers"]
 
+            # Optional asyncio runtime: actions are dispatched every loop_delay and run
+            # concurrently, bounded by max_concurrent_actions
+            self.use_async_runtime = agent_dict.get("use_async_runtime", False)
+            self.max_concurrent_actions = agent_dict.get("max_concurrent_actions", 4)
+
+            # Optional watermarks for the background input buffers, keyed by buffer name
+            self.prefetch_config = agent_dict.get("prefetch", {})
+            self.prefetcher = None
+
+            # Optional limits for the shared keep-alive HTTP pool used by REST connections
+            if "http_pool" in agent_dict:
+                http_pool.configure(**agent_dict["http_pool"])
+
             has_twitter_tasks = any("tweet" in task["name"] for task in agent_dict.get("tasks", []))
             
             twitter_config = next((config for config in agent_dict["config"] if config["name"] == "twitter"), None)
@@ -47,25 +75,52 @@ class ZerePyAgent:
             if has_twitter_tasks and twitter_config:
                 self.tweet_interval = twitter_config.get("tweet_interval", 900)
                 self.own_tweet_replies_count = twitter_config.get("own_tweet_replies_count", 2)
+                self.tweet_reply_batch_size = twitter_config.get("reply_batch_size", 5)
 
             # Extract Echochambers config
             echochambers_config = next((config for config in agent_dict["config"] if config["name"] == "echochambers"), None)
             if echochambers_config:
                 self.echochambers_message_interval = echochambers_config.get("message_interval", 60)
                 self.echochambers_history_count = echochambers_config.get("history_read_count", 50)
+                self.echochambers_reply_batch_size = echochambers_config.get("reply_batch_size", 3)
 
             self.is_llm_set = False
 
             # Cache for system prompt
             self._system_prompt = None
+            # Example account tweets are read from the store and refreshed in the background
+            # once older than example_tweets_ttl seconds
+            self.example_tweets_ttl = agent_dict.get("example_tweets_ttl", 24 * 3600)
+            # Staleness is re-checked on prompt construction at most this often, so failed
+            # fetches are retried and long-running agents pick up expired entries
+            self._example_check_interval = min(self.example_tweets_ttl, 300)
+            self._example_checked_at = 0.0
+            self._example_refresh_lock = threading.Lock()
+            self._example_refreshing = False
 
             # Extract loop tasks
             self.tasks = agent_dict.get("tasks", [])
             self.task_weights = [task.get("weight", 0) for task in self.tasks]
             self.logger = logging.getLogger("agent")
-
-            # Set up empty agent state
+            self.scheduler = TaskScheduler(
+                self.tasks,
+                loop_delay=self.loop_delay,
+                intervals=self._task_intervals(),
+                weight_fn=self._current_weights if self.use_time_based_weights else None,
+            )
+
+            # Set up agent state, resumed from the previous run unless the state store is "memory"
             self.state = {}
+            state_config = agent_dict.get("state_store", {})
+            self.state_store = None
+            if state_config.get("backend", "sqlite") != "memory":
+                self.state_store = AgentStateStore(
+                    agent_name,
+                    backend=state_config.get("backend", "sqlite"),
+                    flush_interval=state_config.get("flush_interval", 2.0),
+                    snapshot_interval=state_config.get("snapshot_interval", 300)
+                )
+                self._restore_state(self.state_store.load())
 
         except Exception as e:
             logger.error("Could not load ZerePy agent")
@@ -80,13 +135,14 @@ class ZerePyAgent:
 
         # Load Twitter username for self-reply detection if Twitter tasks exist
         if any("tweet" in task["name"] for task in self.tasks):
-            load_dotenv()
+            env_store.load()
             self.username = os.getenv('TWITTER_USERNAME', '').lower()
             if not self.username:
                 logger.warning("Twitter username not found, some Twitter functionalities may be limited")
 
     def _construct_system_prompt(self) -> str:
         """Construct the system prompt from agent configuration"""
+        self._check_example_tweets()
         if self._system_prompt is None:
             prompt_parts = []
             prompt_parts.extend(self.bio)
@@ -101,18 +157,71 @@ class ZerePyAgent:
                     prompt_parts.extend(f"- {example}" for example in self.examples)
 
                 if self.example_accounts:
-                    for example_account in self.example_accounts:
-                        tweets = self.connection_manager.perform_action(
-                            connection_name="twitter",
-                            action_name="get-latest-tweets",
-                            params=[example_account]
-                        )
-                        if tweets:
-                            prompt_parts.extend(f"- {tweet['text']}" for tweet in tweets)
+                    prompt_parts.extend(f"- {text}" for text in self._example_account_tweets())
 
             self._system_prompt = "\n".join(prompt_parts)
 
         return self._system_prompt
+
+    def _example_account_tweets(self) -> list:
+        """Stored tweets of the example accounts"""
+        texts = []
+        for account in self.example_accounts:
+            stored = example_tweet_store.get(account)
+            if stored is not None:
+                texts.extend(stored[0])
+        return texts
+
+    def _check_example_tweets(self, force: bool = False) -> None:
+        """Fetch missing or stale example tweets in the background, checking at most every _example_check_interval"""
+        if not self.example_accounts:
+            return
+        now = time.time()
+        if not force and now - self._example_checked_at < self._example_check_interval:
+            return
+        self._example_checked_at = now
+        stale = []
+        for account in self.example_accounts:
+            stored = example_tweet_store.get(account)
+            if stored is None or now - stored[1] > self.example_tweets_ttl:
+                stale.append(account)
+        if stale:
+            self._refresh_example_tweets(stale)
+
+    def _fetch_example_tweets(self, account: str) -> bool:
+        try:
+            tweets = self.connection_manager.perform_action(
+                connection_name="twitter",
+                action_name="get-latest-tweets",
+                params=[account]
+            )
+        except Exception as e:
+            logger.warning(f"Could not fetch example tweets of {account}: {e}")
+            return False
+        if not tweets:
+            return False
+        example_tweet_store.set(account, [tweet["text"] for tweet in tweets])
+        return True
+
+    def _refresh_example_tweets(self, accounts: list) -> None:
+        """Fetch the accounts concurrently on a background thread, then rebuild the system prompt"""
+        with self._example_refresh_lock:
+            if self._example_refreshing:
+                return
+            self._example_refreshing = True
+
+        def refresh():
+            try:
+                with ThreadPoolExecutor(max_workers=min(len(accounts), 8)) as executor:
+                    updated = any(list(executor.map(self._fetch_example_tweets, accounts)))
+                if updated:
+                    # Picked up by the next generation
+                    self._system_prompt = None
+            finally:
+                with self._example_refresh_lock:
+                    self._example_refreshing = False
+
+        threading.Thread(target=refresh, name="example-tweets", daemon=True).start()
     
     def _adjust_weights_for_time(self, current_hour: int, task_weights: list) -> list:
         weights = task_weights.copy()
@@ -135,6 +244,96 @@ class ZerePyAgent:
         
         return weights
 
+    def _current_weights(self, task_weights: list) -> list:
+        return self._adjust_weights_for_time(datetime.now().hour, task_weights)
+
+    def _task_intervals(self) -> dict:
+        """Minimum seconds between runs of each task: the connection's post interval, or the task's own interval"""
+        intervals = {}
+        if hasattr(self, "tweet_interval"):
+            intervals["post-tweet"] = self.tweet_interval
+        if hasattr(self, "echochambers_message_interval"):
+            intervals["post-echochambers"] = self.echochambers_message_interval
+        for task in self.tasks:
+            if "interval" in task:
+                intervals[task["name"]] = task["interval"]
+        return intervals
+
+    def _restore_state(self, saved: dict) -> None:
+        """Apply state saved by a previous run: schedule, connection state and the state dict"""
+        schedule = saved.pop("_schedule", None)
+        if schedule:
+            self.scheduler.restore_due(schedule)
+        for name, connection_state in saved.pop("_connections", {}).items():
+            if name in self.connection_manager.connections:
+                self.connection_manager.connections[name].import_state(connection_state)
+        self.state.update(saved)
+        if saved:
+            logger.info(f"Resumed saved state: {', '.join(saved)}")
+
+    def _persisted_state(self) -> dict:
+        """Everything the state store keeps: the state dict, task schedule and connection state"""
+        connection_states = {}
+        for name, connection in self.connection_manager.connections.items():
+            connection_state = connection.export_state()
+            if connection_state is not None:
+                connection_states[name] = connection_state
+        return {**self.state, "_schedule": self.scheduler.export_due(), "_connections": connection_states}
+
+    def _start_background(self) -> None:
+        self._start_prefetch()
+        # Start refreshing stale example tweets before the first generation needs them
+        self._check_example_tweets(force=True)
+        if self.state_store:
+            self.state_store.start(self._persisted_state)
+
+    def _stop_background(self) -> None:
+        if self.prefetcher:
+            self.prefetcher.stop()
+        if self.state_store:
+            self.state_store.stop()
+
+    def _build_prefetcher(self) -> Prefetcher:
+        """Input buffers for the inputs this agent's tasks consume, refilled in the background"""
+        task_names = [task["name"] for task in self.tasks]
+        buffers = []
+
+        def add_buffer(name, connection, action, params, **defaults):
+            settings = {**defaults, **self.prefetch_config.get(name, {})}
+
+            def fetch():
+                return self.connection_manager.perform_action(
+                    connection_name=connection,
+                    action_name=action,
+                    params=params
+                )
+
+            buffers.append(InputBuffer(
+                name,
+                fetch,
+                low=settings.get("low", 3),
+                high=settings.get("high", 50),
+                min_interval=settings.get("min_interval", 60)
+            ))
+
+        if any("tweet" in name for name in task_names):
+            add_buffer("timeline_tweets", "twitter", "read-timeline", [])
+        if "reply-echochambers" in task_names:
+            add_buffer("echochambers_history", "echochambers", "get-room-history", {}, min_interval=getattr(self, "echochambers_message_interval", 60))
+
+        return Prefetcher(buffers)
+
+    def _start_prefetch(self) -> None:
+        """Start filling the input buffers, exposed to actions through the agent state"""
+        if self.prefetcher is None:
+            self.prefetcher = self._build_prefetcher()
+            # Inputs left over from the previous run are consumed before fetching new ones
+            for name, buffer in self.prefetcher.buffers.items():
+                if isinstance(self.state.get(name), list):
+                    buffer.restore(self.state[name])
+            self.state.update(self.prefetcher.buffers)
+        self.prefetcher.start()
+
     def prompt_llm(self, prompt: str, system_prompt: str = None) -> str:
         """Generate text using the configured LLM provider"""
         system_prompt = system_prompt or self._construct_system_prompt()
@@ -145,17 +344,54 @@ class ZerePyAgent:
             params=[prompt, system_prompt]
         )
 
+    async def prompt_llm_async(self, prompt: str, system_prompt: str = None) -> str:
+        """Awaitable version of prompt_llm for the async runtime"""
+        system_prompt = system_prompt or await asyncio.to_thread(self._construct_system_prompt)
+
+        return await self.connection_manager.perform_action_async(
+            connection_name=self.model_provider,
+            action_name="generate-text",
+            params=[prompt, system_prompt]
+        )
+
+    def prompt_llm_batch(self, prompts: List[str], system_prompt: str = None) -> List[Optional[str]]:
+        """Generate one completion per prompt in a single batch; None where a prompt failed"""
+        if not prompts:
+            return []
+        system_prompt = system_prompt or self._construct_system_prompt()
+
+        replies = self.connection_manager.perform_action(
+            connection_name=self.model_provider,
+            action_name="generate-text-batch",
+            params=[list(prompts), system_prompt]
+        )
+        # A failed action returns None; report every prompt as failed instead
+        return replies or [None] * len(prompts)
+
+    async def prompt_llm_batch_async(self, prompts: List[str], system_prompt: str = None) -> List[Optional[str]]:
+        """Awaitable version of prompt_llm_batch for the async runtime"""
+        if not prompts:
+            return []
+        system_prompt = system_prompt or await asyncio.to_thread(self._construct_system_prompt)
+
+        replies = await self.connection_manager.perform_action_async(
+            connection_name=self.model_provider,
+            action_name="generate-text-batch",
+            params=[list(prompts), system_prompt]
+        )
+        # A failed action returns None; report every prompt as failed instead
+        return replies or [None] * len(prompts)
+
     def perform_action(self, connection: str, action: str, **kwargs) -> None:
         return self.connection_manager.perform_action(connection, action, **kwargs)
+
+    async def perform_action_async(self, connection: str, action: str, **kwargs):
+        return await self.connection_manager.perform_action_async(connection, action, **kwargs)
     
-    def select_action(self, use_time_based_weights: bool = False) -> dict:
-        task_weights = [weight for weight in self.task_weights.copy()]
-        
-        if use_time_based_weights:
-            current_hour = datetime.now().hour
-            task_weights = self._adjust_weights_for_time(current_hour, task_weights)
-        
-        return random.choices(self.tasks, weights=task_weights, k=1)[0]
+    def select_action(self) -> dict:
+        """The task due soonest according to the scheduler"""
+        task, _ = self.scheduler.next_task()
+        return task
 
     def loop(self):
         """Main agent loop for autonomous behavior"""
@@ -166,27 +402,41 @@ class ZerePyAgent:
         logger.info("Press Ctrl+C at any time to stop the loop.")
         print_h_bar()
 
+        # Input buffers fill up during the countdown
+        self._start_background()
+
         time.sleep(2)
         logger.info("Starting loop in 5 seconds...")
         for i in range(5, 0, -1):
             logger.info(f"{i}...")
             time.sleep(1)
 
+        if self.use_async_runtime:
+            try:
+                asyncio.run(self.loop_async())
+            except KeyboardInterrupt:
+                logger.info("\n🛑 Agent loop stopped by user.")
+            finally:
+                self._stop_background()
+            return
+
         try:
             while True:
-                success = False
                 try:
-                    # REPLENISH INPUTS
-                    # TODO: Add more inputs to complexify agent behavior
-                    if "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
-                        if any("tweet" in task["name"] for task in self.tasks):
-                            logger.info("\n👀 READING TIMELINE")
-                            self.state["timeline_tweets"] = self.connection_manager.perform_action(
-                                connection_name="twitter",
-                                action_name="read-timeline",
-                                params=[]
-                            )
+                    # CHOOSE AN ACTION: sleep until the next task is due
+                    action, wait = self.scheduler.next_task()
+                    if action is None:
+                        logger.info(f"\n⏳ No runnable tasks, waiting {self.loop_delay} seconds...")
+                        time.sleep(self.loop_delay)
+                        continue
+                    action_name = action["name"]
+                    if wait > 0:
+                        logger.info(f"\n⏳ Next task {action_name} in {wait:.0f} seconds...")
+                        print_h_bar()
+                        time.sleep(wait)
 
+                    # REPLENISH INPUTS: streams are kept topped up by the prefetcher,
+                    # only the room info is read once here
                     if "room_info" not in self.state or self.state["room_info"] is None:
                         if any("echochambers" in task["name"] for task in self.tasks):
                             logger.info("\n👀 READING ECHOCHAMBERS ROOM INFO")
@@ -196,18 +446,13 @@ class ZerePyAgent:
                                 params={}
                             )
 
-                    # CHOOSE AN ACTION
-                    # TODO: Add agentic action selection
-                    
-                    action = self.select_action(use_time_based_weights=self.use_time_based_weights)
-                    action_name = action["name"]
-
                     # PERFORM ACTION
-                    success = execute_action(self, action_name)
-
-                    logger.info(f"\n⏳ Waiting {self.loop_delay} seconds before next loop...")
-                    print_h_bar()
-                    time.sleep(self.loop_delay if success else 60)
+                    self.scheduler.start(action_name)
+                    success = False
+                    try:
+                        success = execute_action(self, action_name)
+                    finally:
+                        self.scheduler.complete(action_name, bool(success))
 
                 except Exception as e:
                     logger.error(f"\n❌ Error in agent loop iteration: {e}")
@@ -216,4 +461,71 @@ class ZerePyAgent:
 
         except KeyboardInterrupt:
             logger.info("\n🛑 Agent loop stopped by user.")
-            return
\ No newline at end of file
+            self._stop_background()
+            return
+
+    async def _replenish_inputs_async(self):
+        """Read inputs that are not prefetched (the Echochambers room info) if still missing"""
+        fetches = {}
+        if self.state.get("room_info") is None and any("echochambers" in task["name"] for task in self.tasks):
+            logger.info("\n👀 READING ECHOCHAMBERS ROOM INFO")
+            fetches["room_info"] = self.connection_manager.perform_action_async(
+                connection_name="echochambers",
+                action_name="get-room-info",
+                params={}
+            )
+
+        if fetches:
+            results = await asyncio.gather(*fetches.values())
+            self.state.update(zip(fetches.keys(), results))
+
+    async def _run_action_async(self, action_name: str, semaphore: asyncio.Semaphore):
+        """Run a single action, then reschedule it and release its concurrency slot"""
+        success = False
+        try:
+            success = await execute_action_async(self, action_name)
+            if not success:
+                logger.info(f"\n⚠️ Action {action_name} did not complete")
+        except Exception as e:
+            logger.error(f"\n❌ Error in action {action_name}: {e}")
+        finally:
+            self.scheduler.complete(action_name, bool(success))
+            semaphore.release()
+
+    async def loop_async(self):
+        """Asyncio agent loop: dispatches each task when the scheduler says it is due without
+        waiting for earlier ones, keeping at most max_concurrent_actions in flight"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_actions)
+        in_flight = set()
+
+        try:
+            while True:
+                try:
+                    # CHOOSE AN ACTION: the next due task. Running tasks are rescheduled when they
+                    # finish, possibly earlier, so long waits are re-checked every loop_delay
+                    action, wait = self.scheduler.next_task()
+                    if action is None or wait > 0:
+                        await asyncio.sleep(min(wait, self.loop_delay))
+                        continue
+                    action_name = action["name"]
+
+                    # REPLENISH INPUTS
+                    await self._replenish_inputs_async()
+
+                    # PERFORM ACTION (waits for a free slot when the limit is reached)
+                    await semaphore.acquire()
+                    self.scheduler.start(action_name)
+                    task = asyncio.create_task(self._run_action_async(action_name, semaphore))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+
+                    logger.info(f"\n⏳ Dispatched {action_name} ({len(in_flight)} in flight)")
+                    print_h_bar()
+
+                except Exception as e:
+                    logger.error(f"\n❌ Error in agent loop iteration: {e}")
+                    logger.info(f"⏳ Waiting {self.loop_delay} seconds before retrying...")
+                    await asyncio.sleep(self.loop_delay)
+        finally:
+            for task in in_flight:
+                task.cancel()
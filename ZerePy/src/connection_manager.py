@@ -1,79 +1,92 @@
+import asyncio
+import importlib
+import json
 import logging
-from typing import Any, List, Optional, Type, Dict
+import threading
+import time
+from typing import Any, List, Optional, Type, Dict, Tuple
 from src.connections.base_connection import BaseConnection
-from src.connections.anthropic_connection import AnthropicConnection
-from src.connections.eternalai_connection import EternalAIConnection
-from src.connections.goat_connection import GoatConnection
-from src.connections.groq_connection import GroqConnection
-from src.connections.openai_connection import OpenAIConnection
-from src.connections.twitter_connection import TwitterConnection
-from src.connections.farcaster_connection import FarcasterConnection
-from src.connections.ollama_connection import OllamaConnection
-from src.connections.echochambers_connection import EchochambersConnection
-from src.connections.solana_connection import SolanaConnection
-from src.connections.hyperbolic_connection import HyperbolicConnection
-from src.connections.galadriel_connection import GaladrielConnection
-from src.connections.sonic_connection import SonicConnection
-from src.connections.discord_connection import DiscordConnection
-from src.connections.allora_connection import AlloraConnection
-from src.connections.xai_connection import XAIConnection
-from src.connections.ethereum_connection import EthereumConnection
-from src.connections.together_connection import TogetherAIConnection
-from src.connections.evm_connection import EVMConnection
-from src.connections.perplexity_connection import PerplexityConnection
+from src.helpers.env_store import env_store
 
 logger = logging.getLogger("connection_manager")
 
+# Connection modules are imported on first use, so an agent only needs the SDKs of the
+# connections it configures
+CONNECTION_CLASSES = {
+    "twitter": ("src.connections.twitter_connection", "TwitterConnection"),
+    "anthropic": ("src.connections.anthropic_connection", "AnthropicConnection"),
+    "openai": ("src.connections.openai_connection", "OpenAIConnection"),
+    "farcaster": ("src.connections.farcaster_connection", "FarcasterConnection"),
+    "groq": ("src.connections.groq_connection", "GroqConnection"),
+    "eternalai": ("src.connections.eternalai_connection", "EternalAIConnection"),
+    "ollama": ("src.connections.ollama_connection", "OllamaConnection"),
+    "echochambers": ("src.connections.echochambers_connection", "EchochambersConnection"),
+    "goat": ("src.connections.goat_connection", "GoatConnection"),
+    "solana": ("src.connections.solana_connection", "SolanaConnection"),
+    "hyperbolic": ("src.connections.hyperbolic_connection", "HyperbolicConnection"),
+    "galadriel": ("src.connections.galadriel_connection", "GaladrielConnection"),
+    "sonic": ("src.connections.sonic_connection", "SonicConnection"),
+    "discord": ("src.connections.discord_connection", "DiscordConnection"),
+    "allora": ("src.connections.allora_connection", "AlloraConnection"),
+    "xai": ("src.connections.xai_connection", "XAIConnection"),
+    "ethereum": ("src.connections.ethereum_connection", "EthereumConnection"),
+    "together": ("src.connections.together_connection", "TogetherAIConnection"),
+    "evm": ("src.connections.evm_connection", "EVMConnection"),
+    "perplexity": ("src.connections.perplexity_connection", "PerplexityConnection"),
+}
+
 
 class ConnectionManager:
-    def __init__(self, agent_config):
+    def __init__(
+        self,
+        agent_config,
+        connection_cache: Optional[Dict[str, BaseConnection]] = None,
+        config_status_ttl: float = 300,
+        config_failure_ttl: float = 10,
+    ):
         self.connections: Dict[str, BaseConnection] = {}
+        self.connection_keys: Dict[str, str] = {}
+        # Cached is_configured() results: name -> (configured, checked_at). Many connections
+        # probe their API to answer is_configured, so actions read this cache instead and
+        # stale entries are refreshed in the background. A negative result may come from a
+        # transient error, so it is only trusted for config_failure_ttl and then re-probed inline
+        self.config_status_ttl = config_status_ttl
+        self.config_failure_ttl = config_failure_ttl
+        self._config_status: Dict[str, Tuple[bool, float]] = {}
+        self._config_refreshing: set = set()
+        self._config_probes: Dict[str, threading.Event] = {}
+        self._config_lock = threading.Lock()
+        # Optional cache shared between managers (e.g. several agents in one server) so that
+        # identical connection configs reuse a single client instead of building their own
+        self._connection_cache = connection_cache
         for config in agent_config:
             self._register_connection(config)
+        env_store.subscribe(self._on_env_change)
+        # Warm the status cache so the first action rarely waits on a probe
+        for name in self.connections:
+            self._schedule_config_refresh(name)
+
+    def _on_env_change(self, changed_keys) -> None:
+        """Credentials may have changed: rebuild clients and re-check configuration status"""
+        logger.debug(f"Environment changed ({', '.join(sorted(changed_keys))}), refreshing connections")
+        for connection in self.connections.values():
+            try:
+                connection.refresh_credentials(changed_keys)
+            except Exception as e:
+                logger.warning(f"Failed to refresh credentials of {connection.__class__.__name__}: {e}")
+        self.invalidate_config_status()
+
+    @staticmethod
+    def connection_key(config_dic: Dict[str, Any]) -> str:
+        """Stable key identifying a connection config, used for sharing connections"""
+        return json.dumps(config_dic, sort_keys=True, default=str)
 
     @staticmethod
     def _class_name_to_type(class_name: str) -> Type[BaseConnection]:
-        if class_name == "twitter":
-            return TwitterConnection
-        elif class_name == "anthropic":
-            return AnthropicConnection
-        elif class_name == "openai":
-            return OpenAIConnection
-        elif class_name == "farcaster":
-            return FarcasterConnection
-        elif class_name == "groq":
-            return GroqConnection
-        elif class_name == "eternalai":
-            return EternalAIConnection
-        elif class_name == "ollama":
-            return OllamaConnection
-        elif class_name == "echochambers":
-            return EchochambersConnection
-        elif class_name == "goat":
-            return GoatConnection
-        elif class_name == "solana":
-            return SolanaConnection
-        elif class_name == "hyperbolic":
-            return HyperbolicConnection
-        elif class_name == "galadriel":
-            return GaladrielConnection
-        elif class_name == "sonic":
-            return SonicConnection
-        elif class_name == "discord":
-            return DiscordConnection
-        elif class_name == "allora":
-            return AlloraConnection
-        elif class_name == "xai":
-            return XAIConnection
-        elif class_name == "ethereum":
-            return EthereumConnection
-        elif class_name == "together":
-            return TogetherAIConnection
-        elif class_name == "evm":
-            return EVMConnection
-        elif class_name == "perplexity":
-            return PerplexityConnection
-        return None
+        if class_name not in CONNECTION_CLASSES:
+            return None
+        module_name, attr = CONNECTION_CLASSES[class_name]
+        return getattr(importlib.import_module(module_name), attr)
 
     def _register_connection(self, config_dic: Dict[str, Any]) -> None:
         """
@@ -86,12 +99,90 @@ class ConnectionManager:
         """
         try:
             name = config_dic["name"]
+            key = self.connection_key(config_dic)
+            if self._connection_cache is not None and key in self._connection_cache:
+                self.connections[name] = self._connection_cache[key]
+                self.connection_keys[name] = key
+                return
+
             connection_class = self._class_name_to_type(name)
             connection = connection_class(config_dic)
             self.connections[name] = connection
+            self.connection_keys[name] = key
+            if self._connection_cache is not None:
+                self._connection_cache[key] = connection
         except Exception as e:
             logging.error(f"Failed to initialize connection {name}: {e}")
 
+    def _probe_config_status(self, connection_name: str) -> bool:
+        """Run the connection's own is_configured check and cache the result; concurrent callers share one probe"""
+        with self._config_lock:
+            probe = self._config_probes.get(connection_name)
+            owner = probe is None
+            if owner:
+                probe = self._config_probes[connection_name] = threading.Event()
+        if not owner:
+            probe.wait()
+            cached = self._config_status.get(connection_name)
+            return cached[0] if cached else False
+
+        configured = False
+        try:
+            configured = bool(self.connections[connection_name].is_configured())
+        except Exception as e:
+            logging.debug(f"Configuration check for {connection_name} failed: {e}")
+        finally:
+            with self._config_lock:
+                self._config_status[connection_name] = (configured, time.monotonic())
+                self._config_refreshing.discard(connection_name)
+                self._config_probes.pop(connection_name, None)
+            probe.set()
+        return configured
+
+    def _schedule_config_refresh(self, connection_name: str) -> None:
+        with self._config_lock:
+            if connection_name in self._config_refreshing:
+                return
+            self._config_refreshing.add(connection_name)
+        threading.Thread(
+            target=self._probe_config_status, args=(connection_name,), daemon=True
+        ).start()
+
+    def is_connection_configured(self, connection_name: str) -> bool:
+        """
+        Cached configuration status of a connection.
+
+        The cache is warmed in the background when the manager is created; a check that
+        finds no entry yet waits for that probe (or runs one). A positive result older than
+        config_status_ttl is still returned while a background thread refreshes it. A
+        negative result is re-probed inline once older than config_failure_ttl, so a
+        transient error does not disable the connection for long.
+        """
+        if connection_name not in self.connections:
+            raise KeyError(connection_name)
+
+        cached = self._config_status.get(connection_name)
+        if cached is None:
+            return self._probe_config_status(connection_name)
+
+        configured, checked_at = cached
+        age = time.monotonic() - checked_at
+        if not configured:
+            if age > self.config_failure_ttl:
+                return self._probe_config_status(connection_name)
+            return False
+        if age > self.config_status_ttl:
+            self._schedule_config_refresh(connection_name)
+        return configured
+
+    def invalidate_config_status(self, connection_name: Optional[str] = None) -> None:
+        """Drop cached configuration status for one connection, or all when no name is given"""
+        with self._config_lock:
+            if connection_name is None:
+                self._config_status.clear()
+            else:
+                self._config_status.pop(connection_name, None)
+
     def _check_connection(self, connection_string: str) -> bool:
         try:
             connection = self.connections[connection_string]
@@ -110,6 +201,7 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
             success = connection.configure()
+            self.invalidate_config_status(connection_name)
 
             if success:
                 logging.info(
@@ -133,7 +225,7 @@ class ConnectionManager:
         logging.info("\nAVAILABLE CONNECTIONS:")
         for name, connection in self.connections.items():
             status = (
-                "✅ Configured" if connection.is_configured() else "❌ Not Configured"
+                "✅ Configured" if self.is_connection_configured(name) else "❌ Not Configured"
             )
             logging.info(f"- {name}: {status}")
 
@@ -142,7 +234,7 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
 
-            if connection.is_configured():
+            if self.is_connection_configured(connection_name):
                 logging.info(
                     f"\n✅ {connection_name} is configured. You can use any of its actions."
                 )
@@ -166,6 +258,45 @@ class ConnectionManager:
         except Exception as e:
             logging.error(f"\nAn error occurred: {e}")
 
+    def _build_action_kwargs(
+        self, connection_name: str, action_name: str, params: List[Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Resolve an action and map positional params onto its named parameters"""
+        connection = self.connections[connection_name]
+
+        if action_name not in connection.actions:
+            logging.error(
+                f"\nError: Unknown action '{action_name}' for connection '{connection_name}'"
+            )
+            return None
+
+        action = connection.actions[action_name]
+
+        # Convert list of params to kwargs dictionary, handling both required and optional params
+        kwargs = {}
+        param_index = 0
+
+        # Add provided parameters up to the number provided
+        for i, param in enumerate(action.parameters):
+            if param_index < len(params):
+                kwargs[param.name] = params[param_index]
+                param_index += 1
+
+        # Validate all required parameters are present
+        missing_required = [
+            param.name
+            for param in action.parameters
+            if param.required and param.name not in kwargs
+        ]
+
+        if missing_required:
+            logging.error(
+                f"\nError: Missing required parameters: {', '.join(missing_required)}"
+            )
+            return None
+
+        return kwargs
+
     def perform_action(
         self, connection_name: str, action_name: str, params: List[Any]
     ) -> Optional[Any]:
@@ -173,44 +304,42 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
 
-            if not connection.is_configured():
+            if not self.is_connection_configured(connection_name):
                 logging.error(
                     f"\nError: Connection '{connection_name}' is not configured"
                 )
                 return None
 
-            if action_name not in connection.actions:
-                logging.error(
-                    f"\nError: Unknown action '{action_name}' for connection '{connection_name}'"
-                )
+            kwargs = self._build_action_kwargs(connection_name, action_name, params)
+            if kwargs is None:
                 return None
 
-            action = connection.actions[action_name]
-
-            # Convert list of params to kwargs dictionary, handling both required and optional params
-            kwargs = {}
-            param_index = 0
+            return connection.perform_action(action_name, kwargs)
 
-            # Add provided parameters up to the number provided
-            for i, param in enumerate(action.parameters):
-                if param_index < len(params):
-                    kwargs[param.name] = params[param_index]
-                    param_index += 1
+        except Exception as e:
+            logging.error(
+                f"\nAn error occurred while trying action {action_name} for {connection_name} connection: {e}"
+            )
+            return None
 
-            # Validate all required parameters are present
-            missing_required = [
-                param.name
-                for param in action.parameters
-                if param.required and param.name not in kwargs
-            ]
+    async def perform_action_async(
+        self, connection_name: str, action_name: str, params: List[Any]
+    ) -> Optional[Any]:
+        """Awaitable version of perform_action used by the async agent runtime"""
+        try:
+            connection = self.connections[connection_name]
 
-            if missing_required:
+            if not await asyncio.to_thread(self.is_connection_configured, connection_name):
                 logging.error(
-                    f"\nError: Missing required parameters: {', '.join(missing_required)}"
+                    f"\nError: Connection '{connection_name}' is not configured"
                 )
                 return None
 
-            return connection.perform_action(action_name, kwargs)
+            kwargs = self._build_action_kwargs(connection_name, action_name, params)
+            if kwargs is None:
+                return None
+
+            return await connection.perform_action_async(action_name, kwargs)
 
         except Exception as e:
             logging.error(
@@ -223,5 +352,5 @@ class ConnectionManager:
         return [
             name
             for name, conn in self.connections.items()
-            if conn.is_configured() and getattr(conn, "is_llm_provider", lambda: False)
+            if self.is_connection_configured(name) and getattr(conn, "is_llm_provider", lambda: False)
         ]
@@ -1,6 +1,6 @@
 import logging
 from typing import List, Dict, Any
-from dotenv import set_key
+from src.helpers.env_store import env_store
 from allora_sdk.v2.api_client import AlloraAPIClient, ChainSlug
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 import os
@@ -112,7 +112,7 @@ class AlloraConnection(BaseConnection):
                 raise AlloraConfigurationError("API key cannot be empty")
 
             # Save to .env file
-            set_key('.env', 'ALLORA_API_KEY', api_key)
+            env_store.set('ALLORA_API_KEY', api_key)
             print("\n✅ Allora API key saved successfully!")
             return True
             
@@ -1,9 +1,10 @@
 import logging
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+from typing import Dict, Any, Iterator
+from src.helpers.env_store import env_store
 from anthropic import Anthropic, NotFoundError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.llm_batch import prompt_list
 
 logger = logging.getLogger("connections.anthropic_connection")
 
@@ -53,6 +54,24 @@ class AnthropicConnection(BaseConnection):
                 ],
                 description="Generate text using Anthropic models"
             ),
+            "generate-text-batch": Action(
+                name="generate-text-batch",
+                parameters=[
+                    ActionParameter("prompts", True, prompt_list, "Prompts to generate text for, one completion each"),
+                    ActionParameter("system_prompt", True, str, "System prompt shared by all prompts"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Generate text for many prompts at once using Anthropic models"
+            ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream generated text using Anthropic models"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -97,7 +116,7 @@ class AnthropicConnection(BaseConnection):
                 with open('.env', 'w') as f:
                     f.write('')
 
-            set_key('.env', 'ANTHROPIC_API_KEY', api_key)
+            env_store.set('ANTHROPIC_API_KEY', api_key)
             
             # Validate the API key
             client = Anthropic(api_key=api_key)
@@ -114,7 +133,7 @@ class AnthropicConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if Anthropic API key is configured and valid"""
         try:
-            load_dotenv()
+            env_store.load()
             api_key = os.getenv('ANTHROPIC_API_KEY')
             if not api_key:
                 return False
@@ -128,6 +147,11 @@ class AnthropicConnection(BaseConnection):
                 logger.debug(f"Configuration check failed: {e}")
             return False
 
+    @staticmethod
+    def _system_blocks(system_prompt: str) -> list:
+        """System prompt marked for prompt caching, so the static prefix is not reprocessed on every call"""
+        return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
         """Generate text using Anthropic models"""
         try:
@@ -141,7 +165,7 @@ class AnthropicConnection(BaseConnection):
                 model=model,
                 max_tokens=1000,
                 temperature=0,
-                system=system_prompt,
+                system=self._system_blocks(system_prompt),
                 messages=[
                     {
                         "role": "user",
@@ -159,6 +183,38 @@ class AnthropicConnection(BaseConnection):
         except Exception as e:
             raise AnthropicAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from Anthropic models as it is generated"""
+        try:
+            client = self._get_client()
+
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            with client.messages.stream(
+                model=model,
+                max_tokens=1000,
+                temperature=0,
+                system=self._system_blocks(system_prompt),
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": prompt
+                            }
+                        ]
+                    }
+                ]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+
+        except Exception as e:
+            raise AnthropicAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -1,7 +1,9 @@
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Callable
+from typing import Any, Dict, List, Callable, Optional
 from dataclasses import dataclass
+from src.helpers.llm_batch import generate_batch
 
 @dataclass
 class ActionParameter:
@@ -84,6 +86,46 @@ class BaseConnection(ABC):
         """
         pass
 
+    def refresh_credentials(self, changed_keys) -> None:
+        """
+        Called when environment variables change. Drops the cached API client, if the
+        connection keeps one, so the next call builds it with the new credentials.
+
+        Args:
+            changed_keys: Names of the environment variables that changed
+        """
+        if getattr(self, "_client", None) is not None:
+            self._client = None
+
+    def generate_text_batch(self, prompts: List[str], system_prompt: str, model: str = None, **kwargs) -> List[Optional[str]]:
+        """
+        Generate one completion per prompt, all sharing the same system prompt.
+
+        LLM connections register this as generate-text-batch. The prompts are sent as
+        concurrent generate_text requests, at most "batch_concurrency" (default 4) at a time.
+        Provider batch APIs are asynchronous jobs that finish in minutes to hours, too slow
+        for replies.
+
+        Returns:
+            List[Optional[str]]: Completions in prompt order, None where a prompt failed
+        """
+        return generate_batch(
+            lambda prompt: self.generate_text(prompt, system_prompt, model=model, **kwargs),
+            prompts,
+            max_workers=self.config.get("batch_concurrency", 4)
+        )
+
+    def export_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Runtime state worth keeping across restarts (e.g. recently sent messages),
+        saved with the agent state. None when the connection has nothing to keep.
+        """
+        return None
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        """Restore what export_state returned in a previous run"""
+        pass
+
     @abstractmethod
     def register_actions(self) -> None:
         """
@@ -112,3 +154,20 @@ class BaseConnection(ABC):
             
         handler = self.actions[action_name]
         return handler(**kwargs)
+
+    async def perform_action_async(self, action_name: str, kwargs) -> Any:
+        """
+        Awaitable counterpart of perform_action for the async agent runtime.
+
+        Connections backed by blocking SDKs are run in a worker thread so the
+        event loop stays free; connections with native coroutines can override
+        this to await them directly.
+
+        Args:
+            action_name: Name of the action to perform
+            kwargs: Parameters for the action
+
+        Returns:
+            Any: Result of the action
+        """
+        return await asyncio.to_thread(self.perform_action, action_name, kwargs)
@@ -4,8 +4,9 @@ from typing import Dict, Any, List
 from collections import deque
 
 import requests
-from dotenv import load_dotenv
+from src.helpers.env_store import env_store
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.http_pool import http_pool
 
 logger = logging.getLogger("connections.echochambers_connection")
 
@@ -181,6 +182,18 @@ class EchochambersConnection(BaseConnection):
             self._handle_error("Failed to send message", e)
             raise
 
+    def export_state(self) -> Dict[str, Any]:
+        return {
+            "sent_messages": list(self.sent_messages),
+            "message_queue": list(self.message_queue),
+            "processed_messages": list(self.processed_messages),
+        }
+
+    def import_state(self, state: Dict[str, Any]) -> None:
+        self.sent_messages.extend(state.get("sent_messages", []))
+        self.message_queue = state.get("message_queue", [])[:self.max_queue_size]
+        self.processed_messages = set(state.get("processed_messages", []))
+
     def process_room_history(self) -> None:
         """Process and queue messages for replies"""
         try:
@@ -211,7 +224,7 @@ class EchochambersConnection(BaseConnection):
 
         for attempt in range(3):
             try:
-                response = requests.request(method, url, timeout=10, **kwargs)
+                response = http_pool.request(method, url, timeout=10, **kwargs)
                 if response.status_code == 429:  # Rate limit
                     retry_after = int(response.headers.get('Retry-After', 60))
                     logger.warning(f"Rate limit hit, waiting {retry_after}s")
@@ -1,10 +1,11 @@
 import logging
 import os
 import json
-from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+from typing import Dict, Any, Iterator
+from src.helpers.env_store import env_store
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.llm_batch import prompt_list
 from web3 import Web3
 import requests
 
@@ -63,6 +64,24 @@ class EternalAIConnection(BaseConnection):
                 ],
                 description="Generate text using EternalAI models"
             ),
+            "generate-text-batch": Action(
+                name="generate-text-batch",
+                parameters=[
+                    ActionParameter("prompts", True, prompt_list, "Prompts to generate text for, one completion each"),
+                    ActionParameter("system_prompt", True, str, "System prompt shared by all prompts"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Generate text for many prompts at once using EternalAI models"
+            ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream generated text using EternalAI models"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -110,8 +129,7 @@ class EternalAIConnection(BaseConnection):
                 with open('.env', 'w') as f:
                     f.write('')
 
-            set_key('.env', 'EternalAI_API_KEY', api_key)
-            set_key('.env', 'EternalAI_API_URL', api_url)
+            env_store.update({'EternalAI_API_KEY': api_key, 'EternalAI_API_URL': api_url})
 
             # Validate credentials
             client = OpenAI(api_key=api_key, base_url=api_url)
@@ -128,7 +146,7 @@ class EternalAIConnection(BaseConnection):
     def is_configured(self, verbose=False) -> bool:
         """Check if EternalAI API credentials are configured and valid"""
         try:
-            load_dotenv()
+            env_store.load()
             api_key = os.getenv('EternalAI_API_KEY')
             api_url = os.getenv('EternalAI_API_URL')
             if not api_key or not api_url:
@@ -163,6 +181,50 @@ class EternalAIConnection(BaseConnection):
             else:
                 raise Exception(f"invalid on-chain system prompt")
 
+    def _resolve_chain_id(self, chain_id: str = None) -> str:
+        chain_id = chain_id or self.config["chain_id"]
+        if not chain_id or chain_id == "":
+            chain_id = "45762"
+        logger.info(f"chain_id {chain_id}")
+        return chain_id
+
+    def _resolve_system_prompt(self, system_prompt: str) -> str:
+        """Use the agent's on-chain system prompt when one is configured"""
+        agent_id = self.config["agent_id"] or None
+        contract_address = self.config["contract_address"] or None
+        rpc = self.config["rpc_url"] or None
+
+        if agent_id and contract_address and rpc:
+            logger.info(f"agent_id: {agent_id}, contract_address: {contract_address}")
+            # call on-chain system prompt
+            web3 = Web3(Web3.HTTPProvider(rpc))
+            logger.info(f"web3 connected to {rpc} {web3.is_connected()}")
+            contract = web3.eth.contract(address=contract_address, abi=AGENT_CONTRACT_ABI)
+            result = contract.functions.getAgentSystemPrompt(agent_id).call()
+            logger.info(f"on-chain system_prompt: {result}")
+            if len(result) > 0:
+                try:
+                    system_prompt = self.get_on_chain_system_prompt_content(result[0].decode("utf-8"))
+                    logging.info(f"new system_prompt: {system_prompt}")
+                except Exception as e:
+                    logger.error(f"get on-chain system_prompt fail {e}")
+        return system_prompt
+
+    def _iter_completion_stream(self, completion) -> Iterator[str]:
+        """Yield content deltas from a streamed completion, logging the trailing on-chain data"""
+        for chunk in completion:
+            if chunk.choices is not None:
+                delta = chunk.choices[0].delta
+                if delta is not None and delta.content is not None:
+                    yield delta.content
+            else:
+                try:
+                    if chunk.onchain_data is not None and chunk.onchain_data.infer_id is not None and chunk.onchain_data.infer_id != "":
+                        logger.info(f"response onchain data: {json.dumps(chunk.onchain_data, indent=4)}")
+                except:
+                    logger.info(f"response onchain data object: {chunk.onchain_data}", )
+                break
+
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None, **kwargs) -> str:
         """Generate text using EternalAI models"""
         try:
@@ -170,29 +232,8 @@ class EternalAIConnection(BaseConnection):
             model = model or self.config["model"]
             logger.info(f"model {model}")
 
-            chain_id = chain_id or self.config["chain_id"]
-            if not chain_id or chain_id == "":
-                chain_id = "45762"
-            logger.info(f"chain_id {chain_id}")
-
-            agent_id = self.config["agent_id"] or None
-            contract_address = self.config["contract_address"] or None
-            rpc = self.config["rpc_url"] or None
-
-            if agent_id and contract_address and rpc:
-                logger.info(f"agent_id: {agent_id}, contract_address: {contract_address}")
-                # call on-chain system prompt
-                web3 = Web3(Web3.HTTPProvider(rpc))
-                logger.info(f"web3 connected to {rpc} {web3.is_connected()}")
-                contract = web3.eth.contract(address=contract_address, abi=AGENT_CONTRACT_ABI)
-                result = contract.functions.getAgentSystemPrompt(agent_id).call()
-                logger.info(f"on-chain system_prompt: {result}")
-                if len(result) > 0:
-                    try:
-                        system_prompt = self.get_on_chain_system_prompt_content(result[0].decode("utf-8"))
-                        logging.info(f"new system_prompt: {system_prompt}")
-                    except Exception as e:
-                        logger.error(f"get on-chain system_prompt fail {e}")
+            chain_id = self._resolve_chain_id(chain_id)
+            system_prompt = self._resolve_system_prompt(system_prompt)
 
             stream = self.config["stream"]
             logger.info(f"call completions api stream {stream}")
@@ -217,27 +258,35 @@ class EternalAIConnection(BaseConnection):
                     f"end call completions api with content:\n\n {completion.choices[0].message.content} \n\n\n\n")
                 return completion.choices[0].message.content
             else:
-                content = ""
-                # logger.info(f"completion {str(completion)}")
-                for chunk in completion:
-                    if chunk.choices is not None:
-                        delta = chunk.choices[0].delta
-                        if delta is not None and delta.content is not None:
-                            content += delta.content
-                            # logger.info(f"content -> {delta.content}")
-                    else:
-                        try:
-                            if chunk.onchain_data is not None and chunk.onchain_data.infer_id is not None and chunk.onchain_data.infer_id != "":
-                                logger.info(f"response onchain data: {json.dumps(chunk.onchain_data, indent=4)}")
-                        except:
-                            logger.info(f"response onchain data object: {chunk.onchain_data}", )
-                        break
+                content = "".join(self._iter_completion_stream(completion))
                 logger.info(f"end call completions api with content:\n\n {content} \n\n\n\n")
                 return content
 
         except Exception as e:
             raise EternalAIAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from EternalAI models as it is generated"""
+        try:
+            client = self._get_client()
+            model = model or self.config["model"]
+            chain_id = self._resolve_chain_id(chain_id)
+            system_prompt = self._resolve_system_prompt(system_prompt)
+
+            completion = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                extra_body={"chain_id": chain_id},
+                stream=True,
+            )
+            yield from self._iter_completion_stream(completion)
+
+        except Exception as e:
+            raise EternalAIAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
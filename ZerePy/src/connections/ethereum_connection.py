@@ -1,14 +1,17 @@
 import logging
 import os
 import time
-import requests
 from typing import Dict, Any, Optional, Union
-from dotenv import load_dotenv, set_key
+from src.helpers.env_store import env_store
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from src.constants.networks import EVM_NETWORKS
 from src.constants.abi import ERC20_ABI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.http_pool import http_pool
+from src.helpers.token_cache import token_cache
+from src.helpers.evm_tx import gas_oracle, send_transaction
+from src.helpers.multicall import address_list, get_balances
 
 logger = logging.getLogger("connections.ethereum_connection")
 
@@ -30,6 +33,8 @@ class EthereumConnection(BaseConnection):
             
         self.scanner_url = EVM_NETWORKS[self.network]["scanner_url"]
         self.chain_id = EVM_NETWORKS[self.network]["chain_id"]
+        self.block_time = EVM_NETWORKS[self.network].get("block_time", 12)
+        self.native_symbol = EVM_NETWORKS[self.network].get("native_symbol", "ETH")
         
         super().__init__(config)
         self._initialize_web3()
@@ -37,6 +42,10 @@ class EthereumConnection(BaseConnection):
         # Kyberswap aggregator API for best swap routes
         self.aggregator_api = f"https://aggregator-api.kyberswap.com/{self.network}/api/v1"
 
+    def _gas_price(self) -> int:
+        """Gas price from the shared oracle, refreshed at most once per block"""
+        return gas_oracle.gas_price(self._web3, self.block_time)
+
     def _get_explorer_link(self, tx_hash: str) -> str:
         """Generate block explorer link for transaction"""
         return f"https://{self.scanner_url}/tx/{tx_hash}"
@@ -93,6 +102,14 @@ class EthereumConnection(BaseConnection):
                 ],
                 description="Get ETH or token balance"
             ),
+            "get-balances": Action(
+                name="get-balances",
+                parameters=[
+                    ActionParameter("tokens", True, address_list, "Token addresses (comma separated, native token placeholder for ETH)"),
+                    ActionParameter("addresses", False, address_list, "Addresses to check (optional, configured wallet if not provided)")
+                ],
+                description="Get balances of several tokens for several addresses in one batched call"
+            ),
             "transfer": Action(
                 name="transfer", 
                 parameters=[
@@ -151,9 +168,9 @@ class EthereumConnection(BaseConnection):
             explorer_key = input("\nEnter your block explorer API key (optional, press Enter to skip): ")
             
             # Save credentials
-            set_key('.env', 'ETH_PRIVATE_KEY', private_key)
+            env_store.set('ETH_PRIVATE_KEY', private_key)
             if explorer_key:
-                set_key('.env', f'ETH_EXPLORER_KEY', explorer_key)
+                env_store.set(f'ETH_EXPLORER_KEY', explorer_key)
 
             logger.info("\n✅ Ethereum configuration saved successfully!")
             return True
@@ -165,7 +182,7 @@ class EthereumConnection(BaseConnection):
     def is_configured(self, verbose: bool = False) -> bool:
         """Check if Ethereum connection is properly configured"""
         try:
-            load_dotenv()
+            env_store.load()
             
             # Check private key exists
             private_key = os.getenv('ETH_PRIVATE_KEY')
@@ -199,38 +216,35 @@ class EthereumConnection(BaseConnection):
         except Exception as e:
             return f"Failed to get address: {str(e)}"
 
+    def _search_token_address(self, ticker: str) -> Optional[str]:
+        """Look up a token address on DEXScreener, picking the most liquid exact match"""
+        response = http_pool.get(
+            f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
+        )
+        response.raise_for_status()
+
+        data = response.json()
+        network_pairs = [
+            pair
+            for pair in data.get("pairs") or []
+            if pair.get("chainId", "").lower() == "ethereum"
+            and pair.get("baseToken", {}).get("symbol", "").lower() == ticker.lower()
+        ]
+        if not network_pairs:
+            return None
+
+        # Rank by liquidity/volume
+        best = max(
+            network_pairs,
+            key=lambda x: float(x.get('liquidity', {}).get('usd', 0) or 0) *
+                          float(x.get('volume', {}).get('h24', 0) or 0)
+        )
+        return best.get("baseToken", {}).get("address")
+
     def _get_token_address(self, ticker: str) -> Optional[str]:
         """Helper function to get token address from DEXScreener"""
         try:
-            response = requests.get(
-                f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            if not data.get('pairs'):
-                return None
-
-            # Filter pairs for Ethereum network
-            eth_pairs = [
-                pair for pair in data["pairs"] 
-                if pair.get("chainId", "").lower() == "ethereum"
-            ]
-            
-            # Sort by liquidity/volume
-            eth_pairs.sort(
-                key=lambda x: float(x.get('liquidity', {}).get('usd', 0) or 0) * 
-                            float(x.get('volume', {}).get('h24', 0) or 0),
-                reverse=True
-            )
-
-            # Find exact ticker match
-            for pair in eth_pairs:
-                base_token = pair.get("baseToken", {})
-                if base_token.get("symbol", "").lower() == ticker.lower():
-                    return base_token.get("address")
-            
-            return None
+            return token_cache.resolve("ethereum", ticker, lambda: self._search_token_address(ticker))
 
         except Exception as error:
             logger.error(f"Error fetching token address: {str(error)}")
@@ -251,16 +265,9 @@ class EthereumConnection(BaseConnection):
     def _get_raw_balance(self, address: str, token_address: Optional[str] = None) -> float:
         """Helper function to get raw balance value"""
         if token_address and token_address.lower() != self.NATIVE_TOKEN.lower():
-            # Get ERC20 token balance
-            contract = self._web3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
-                abi=ERC20_ABI
-            )
-            balance = contract.functions.balanceOf(
-                Web3.to_checksum_address(address)
-            ).call()
-            decimals = contract.functions.decimals().call()
-            return balanqce / (10 ** decimals)
+            # Get ERC20 token balance, decimals come from the metadata cache after the first read
+            balances = get_balances(self._web3, [address], [token_address], self.native_symbol)
+            return balances[Web3.to_checksum_address(address)][Web3.to_checksum_address(token_address)]["balance"]
         else:
             # Get native ETH balance
             balance = self._web3.eth.get_balance(Web3.to_checksum_address(address))
@@ -291,24 +298,17 @@ class EthereumConnection(BaseConnection):
                 raw_balance = self._web3.eth.get_balance(account.address)
                 return self._web3.from_wei(raw_balance, 'ether')
             
-            # Get token contract
-            token_contract = self._web3.eth.contract(
-                address=Web3.to_checksum_address(token_address), 
-                abi=ERC20_ABI 
-            )
-            
-            # Get token info
-            symbol = token_contract.functions.symbol().call()
-            decimals = token_contract.functions.decimals().call()
-            
-            # Get balance
-            raw_balance = token_contract.functions.balanceOf(account.address).call()
-            token_balance = raw_balance / (10 ** decimals)
+            # Get token info and balance in a single aggregated call
+            token_info = get_balances(
+                self._web3, [account.address], [token_address], self.native_symbol
+            )[account.address][Web3.to_checksum_address(token_address)]
+            raw_balance = token_info["raw_balance"]
+            token_balance = token_info["balance"]
             
             # Try to get ETH value using Kyberswap price API
             try:
                 kyber_url = f"{self.aggregator_api}/tokens/rates"
-                response = requests.get(kyber_url, params={
+                response = http_pool.get(kyber_url, params={
                     "tokenIn": token_address, 
                     "tokenOut": self.NATIVE_TOKEN, 
                     "amount": str(raw_balance) 
@@ -328,6 +328,33 @@ class EthereumConnection(BaseConnection):
         except Exception as e:
             return False
 
+    def get_balances(self, tokens: list, addresses: Optional[list] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get balances of several tokens for several addresses.
+
+        All reads (and any token symbol/decimals not seen before) are aggregated into
+        Multicall3 calls instead of one round trip per token.
+
+        Args:
+            tokens (list): Token addresses; the native token placeholder reads ETH
+            addresses (list, optional): Addresses to check. Defaults to the configured wallet.
+
+        Returns:
+            Dict: address -> token -> {"symbol", "decimals", "raw_balance", "balance"}
+        """
+        try:
+            if not addresses:
+                private_key = os.getenv('ETH_PRIVATE_KEY')
+                if not private_key:
+                    return "No wallet private key configured in .env"
+                addresses = [self._web3.eth.account.from_key(private_key).address]
+
+            return get_balances(self._web3, addresses, tokens, self.native_symbol)
+
+        except Exception as e:
+            logger.error(f"Failed to get balances: {str(e)}")
+            return False
+
     def _prepare_transfer_tx(
         self, 
         to_address: str,
@@ -339,9 +366,7 @@ class EthereumConnection(BaseConnection):
             private_key = os.getenv('ETH_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
             
-            # Get latest nonce and gas price
-            nonce = self._web3.eth.get_transaction_count(account.address)
-            gas_price = self._web3.eth.gas_price
+            gas_price = self._gas_price()
             
             if token_address and token_address.lower() != self.NATIVE_TOKEN.lower():
                 # Prepare ERC20 transfer
@@ -357,14 +382,12 @@ class EthereumConnection(BaseConnection):
                     amount_raw
                 ).build_transaction({
                     'from': account.address,
-                    'nonce': nonce,
                     'gasPrice': gas_price,
                     'chainId': self.chain_id
                 })
             else:
                 # Prepare native ETH transfer
                 tx = {
-                    'nonce': nonce,
                     'to': Web3.to_checksum_address(to_address),
                     'value': self._web3.to_wei(amount, 'ether'),
                     'gas': 21000,  # Standard ETH transfer gas
@@ -398,8 +421,7 @@ class EthereumConnection(BaseConnection):
             private_key = os.getenv('ETH_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
             
-            signed = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed.rawTransaction)
+            tx_hash = send_transaction(self._web3, account, tx)
             
             # Return explorer link
             tx_url = self._get_explorer_link(tx_hash.hex())
@@ -441,7 +463,7 @@ class EthereumConnection(BaseConnection):
                 "gasInclude": "true"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http_pool.get(url, headers=headers, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -479,7 +501,7 @@ class EthereumConnection(BaseConnection):
                 "source": "zerepy"
             }
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = http_pool.post(url, headers=headers, json=payload)
             response.raise_for_status()
             
             data = response.json()
@@ -492,8 +514,7 @@ class EthereumConnection(BaseConnection):
                 'to': Web3.to_checksum_address(route_data["routerAddress"]),
                 'data': data["data"]["data"],
                 'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0,
-                'nonce': self._web3.eth.get_transaction_count(account.address),
-                'gasPrice': self._web3.eth.gas_price,
+                'gasPrice': self._gas_price(),
                 'chainId': self.chain_id
             }
             
@@ -511,64 +532,62 @@ class EthereumConnection(BaseConnection):
             logger.error(f"Failed to build swap transaction: {str(e)}")
             raise
 
-        def _handle_token_approval(
-            self,
-            token_address: str,
-            spender_address: str,
-            amount: int
-        ) -> Optional[str]:
-            """Handle token approval for spender, returns tx hash if approval needed"""
-            try:
-                private_key = os.getenv('ETH_PRIVATE_KEY')
-                account = self._web3.eth.account.from_key(private_key)
+    def _handle_token_approval(
+        self,
+        token_address: str,
+        spender_address: str,
+        amount: int
+    ) -> Optional[str]:
+        """Handle token approval for spender, returns tx hash if approval needed"""
+        try:
+            private_key = os.getenv('ETH_PRIVATE_KEY')
+            account = self._web3.eth.account.from_key(private_key)
+            
+            token_contract = self._web3.eth.contract(
+                address=Web3.to_checksum_address(token_address),
+                abi=ERC20_ABI
+            )
+            
+            # Check current allowance
+            current_allowance = token_contract.functions.allowance(
+                account.address,
+                spender_address
+            ).call()
+            
+            if current_allowance < amount:
+                # Prepare approval transaction
+                approve_tx = token_contract.functions.approve(
+                    spender_address,
+                    amount
+                ).build_transaction({
+                    'from': account.address,
+                    'gasPrice': self._gas_price(),
+                    'chainId': self.chain_id
+                })
                 
-                token_contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=ERC20_ABI
-                )
+                # Estimate gas for approval
+                try:
+                    gas_estimate = self._web3.eth.estimate_gas(approve_tx)
+                    approve_tx['gas'] = int(gas_estimate * 1.1)  # Add 10% buffer
+                except Exception as e:
+                    logger.warning(f"Approval gas estimation failed: {e}, using default")
+                    approve_tx['gas'] = 100000  # Default gas for approvals
                 
-                # Check current allowance
-                current_allowance = token_contract.functions.allowance(
-                    account.address,
-                    spender_address
-                ).call()
+                # Sign and send approval transaction
+                tx_hash = send_transaction(self._web3, account, approve_tx)
                 
-                if current_allowance < amount:
-                    # Prepare approval transaction
-                    approve_tx = token_contract.functions.approve(
-                        spender_address,
-                        amount
-                    ).build_transaction({
-                        'from': account.address,
-                        'nonce': self._web3.eth.get_transaction_count(account.address),
-                        'gasPrice': self._web3.eth.gas_price,
-                        'chainId': self.chain_id
-                    })
-                    
-                    # Estimate gas for approval
-                    try:
-                        gas_estimate = self._web3.eth.estimate_gas(approve_tx)
-                        approve_tx['gas'] = int(gas_estimate * 1.1)  # Add 10% buffer
-                    except Exception as e:
-                        logger.warning(f"Approval gas estimation failed: {e}, using default")
-                        approve_tx['gas'] = 100000  # Default gas for approvals
-                    
-                    # Sign and send approval transaction
-                    signed_approve = account.sign_transaction(approve_tx)
-                    tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
-                    
-                    # Wait for approval to be mined
-                    receipt = self._web3.eth.wait_for_transaction_receipt(tx_hash)
-                    if receipt['status'] != 1:
-                        raise ValueError("Token approval failed")
-                    
-                    return tx_hash.hex()
-                    
-                return None
+                # Wait for approval to be mined
+                receipt = self._web3.eth.wait_for_transaction_receipt(tx_hash)
+                if receipt['status'] != 1:
+                    raise ValueError("Token approval failed")
+                
+                return tx_hash.hex()
+                
+            return None
 
-            except Exception as e:
-                logger.error(f"Token approval failed: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Token approval failed: {str(e)}")
+            raise
 
     def swap(
         self,
@@ -617,8 +636,7 @@ class EthereumConnection(BaseConnection):
             
             # Build and send swap transaction
             swap_tx = self._build_swap_tx(token_in, token_out, amount, slippage, route_data)
-            signed_tx = account.sign_transaction(swap_tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            tx_hash = send_transaction(self._web3, account, swap_tx)
 
             tx_url = self._get_explorer_link(tx_hash.hex())
             
@@ -633,7 +651,7 @@ class EthereumConnection(BaseConnection):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        load_dotenv()
+        env_store.load()
         
         if not self.is_configured(verbose=True):
             raise EthereumConnectionError("Ethereum connection is not properly configured")
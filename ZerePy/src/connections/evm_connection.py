@@ -1,14 +1,17 @@
 import logging
 import os
 import time
-import requests
 from typing import Dict, Any, Optional, Union
-from dotenv import load_dotenv, set_key
+from src.helpers.env_store import env_store
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from src.constants.networks import EVM_NETWORKS
 from src.constants.abi import ERC20_ABI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.http_pool import http_pool
+from src.helpers.token_cache import token_cache
+from src.helpers.evm_tx import gas_oracle, send_transaction
+from src.helpers.multicall import address_list, get_balances
 
 logger = logging.getLogger("connections.evm_connection")
 
@@ -36,6 +39,8 @@ class EVMConnection(BaseConnection):
         self.rpc_url = config.get("rpc") or network_config["rpc_url"]
         self.scanner_url = network_config["scanner_url"]
         self.chain_id = network_config["chain_id"]
+        self.block_time = network_config.get("block_time", 12)
+        self.native_symbol = network_config.get("native_symbol", "ETH")
         
         super().__init__(config)
         self._initialize_web3()
@@ -43,6 +48,10 @@ class EVMConnection(BaseConnection):
         # Kyberswap aggregator API for best swap routes
         self.aggregator_api = f"https://aggregator-api.kyberswap.com/{self.network}/api/v1"
 
+    def _gas_price(self) -> int:
+        """Gas price from the shared oracle, refreshed at most once per block"""
+        return gas_oracle.gas_price(self._web3, self.block_time)
+
     def _get_explorer_link(self, tx_hash: str) -> str:
         """Generate block explorer link for transaction"""
         return f"https://{self.scanner_url}/tx/{tx_hash}"
@@ -100,6 +109,14 @@ class EVMConnection(BaseConnection):
                 ],
                 description="Get ETH or token balance"
             ),
+            "get-balances": Action(
+                name="get-balances",
+                parameters=[
+                    ActionParameter("tokens", True, address_list, "Token addresses (comma separated, native token placeholder for the native token)"),
+                    ActionParameter("addresses", False, address_list, "Addresses to check (optional, configured wallet if not provided)")
+                ],
+                description="Get balances of several tokens for several addresses in one batched call"
+            ),
             "transfer": Action(
                 name="transfer", 
                 parameters=[
@@ -158,9 +175,9 @@ class EVMConnection(BaseConnection):
             explorer_key = input("\nEnter your block explorer API key (optional, press Enter to skip): ")
             
             # Save credentials using the unified EVM_PRIVATE_KEY variable
-            set_key('.env', 'EVM_PRIVATE_KEY', private_key)
+            env_store.set('EVM_PRIVATE_KEY', private_key)
             if explorer_key:
-                set_key('.env', 'ETH_EXPLORER_KEY', explorer_key)
+                env_store.set('ETH_EXPLORER_KEY', explorer_key)
 
             logger.info("\n✅ Ethereum configuration saved successfully!")
             return True
@@ -172,7 +189,7 @@ class EVMConnection(BaseConnection):
     def is_configured(self, verbose: bool = False) -> bool:
         """Check if Ethereum connection is properly configured"""
         try:
-            load_dotenv()
+            env_store.load()
             private_key = os.getenv('EVM_PRIVATE_KEY') or os.getenv('ETH_PRIVATE_KEY')
             if not private_key:
                 if verbose:
@@ -202,35 +219,35 @@ class EVMConnection(BaseConnection):
         except Exception as e:
             return f"Failed to get address: {str(e)}"
 
+    def _search_token_address(self, ticker: str) -> Optional[str]:
+        """Look up a token address on DEXScreener, picking the most liquid exact match"""
+        response = http_pool.get(
+            f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
+        )
+        response.raise_for_status()
+
+        data = response.json()
+        network_pairs = [
+            pair
+            for pair in data.get("pairs") or []
+            if pair.get("chainId", "").lower() == self.network.lower()
+            and pair.get("baseToken", {}).get("symbol", "").lower() == ticker.lower()
+        ]
+        if not network_pairs:
+            return None
+
+        # Rank by liquidity/volume
+        best = max(
+            network_pairs,
+            key=lambda x: float(x.get('liquidity', {}).get('usd', 0) or 0) *
+                          float(x.get('volume', {}).get('h24', 0) or 0)
+        )
+        return best.get("baseToken", {}).get("address")
+
     def _get_token_address(self, ticker: str) -> Optional[str]:
         """Helper function to get token address from DEXScreener"""
         try:
-            response = requests.get(f"https://api.dexscreener.com/latest/dex/search?q={ticker}")
-            response.raise_for_status()
-            data = response.json()
-            if not data.get('pairs'):
-                return None
-
-            # Filter pairs for the current network (using lowercase for comparison)
-            network_pairs = [
-                pair for pair in data["pairs"] 
-                if pair.get("chainId", "").lower() == self.network.lower()
-            ]
-            
-            # Sort by liquidity/volume
-            network_pairs.sort(
-                key=lambda x: float(x.get('liquidity', {}).get('usd', 0) or 0) * 
-                            float(x.get('volume', {}).get('h24', 0) or 0),
-                reverse=True
-            )
-
-            # Find exact ticker match
-            for pair in network_pairs:
-                base_token = pair.get("baseToken", {})
-                if base_token.get("symbol", "").lower() == ticker.lower():
-                    return base_token.get("address")
-            
-            return None
+            return token_cache.resolve(self.network, ticker, lambda: self._search_token_address(ticker))
 
         except Exception as error:
             logger.error(f"Error fetching token address: {str(error)}")
@@ -249,13 +266,8 @@ class EVMConnection(BaseConnection):
     def _get_raw_balance(self, address: str, token_address: Optional[str] = None) -> float:
         """Helper function to get raw balance value"""
         if token_address and token_address.lower() != self.NATIVE_TOKEN.lower():
-            contract = self._web3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
-                abi=ERC20_ABI
-            )
-            balance = contract.functions.balanceOf(Web3.to_checksum_address(address)).call()
-            decimals = contract.functions.decimals().call()
-            return balance / (10 ** decimals)
+            balances = get_balances(self._web3, [address], [token_address], self.native_symbol)
+            return balances[Web3.to_checksum_address(address)][Web3.to_checksum_address(token_address)]["balance"]
         else:
             balance = self._web3.eth.get_balance(Web3.to_checksum_address(address))
             return self._web3.from_wei(balance, 'ether')
@@ -276,25 +288,36 @@ class EVMConnection(BaseConnection):
                 raw_balance = self._web3.eth.get_balance(account.address)
                 return self._web3.from_wei(raw_balance, 'ether')
             
-            token_contract = self._web3.eth.contract(
-                address=Web3.to_checksum_address(token_address), 
-                abi=ERC20_ABI 
-            )
-            decimals = token_contract.functions.decimals().call()
-            raw_balance = token_contract.functions.balanceOf(account.address).call()
-            token_balance = raw_balance / (10 ** decimals)
-            return token_balance
+            balances = get_balances(self._web3, [account.address], [token_address], self.native_symbol)
+            return balances[account.address][Web3.to_checksum_address(token_address)]["balance"]
         
         except Exception as e:
             return False
 
+    def get_balances(self, tokens: list, addresses: Optional[list] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get balances of several tokens for several addresses.
+        Reads are aggregated through Multicall3 and token metadata is cached per token.
+        """
+        try:
+            if not addresses:
+                private_key = os.getenv('EVM_PRIVATE_KEY') or os.getenv('ETH_PRIVATE_KEY')
+                if not private_key:
+                    return "No wallet private key configured in .env"
+                addresses = [self._web3.eth.account.from_key(private_key).address]
+
+            return get_balances(self._web3, addresses, tokens, self.native_symbol)
+
+        except Exception as e:
+            logger.error(f"Failed to get balances: {str(e)}")
+            return False
+
     def _prepare_transfer_tx(self, to_address: str, amount: float, token_address: Optional[str] = None) -> Dict[str, Any]:
         """Prepare transfer transaction with proper gas estimation"""
         try:
             private_key = os.getenv('EVM_PRIVATE_KEY') or os.getenv('ETH_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
-            nonce = self._web3.eth.get_transaction_count(account.address)
-            gas_price = self._web3.eth.gas_price
+            gas_price = self._gas_price()
             
             if token_address and token_address.lower() != self.NATIVE_TOKEN.lower():
                 contract = self._web3.eth.contract(
@@ -308,13 +331,11 @@ class EVMConnection(BaseConnection):
                     amount_raw
                 ).build_transaction({
                     'from': account.address,
-                    'nonce': nonce,
                     'gasPrice': gas_price,
                     'chainId': self.chain_id
                 })
             else:
                 tx = {
-                    'nonce': nonce,
                     'to': Web3.to_checksum_address(to_address),
                     'value': self._web3.to_wei(amount, 'ether'),
                     'gas': 21000,
@@ -336,8 +357,7 @@ class EVMConnection(BaseConnection):
             tx = self._prepare_transfer_tx(to_address, amount, token_address)
             private_key = os.getenv('EVM_PRIVATE_KEY') or os.getenv('ETH_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
-            signed = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed.rawTransaction)
+            tx_hash = send_transaction(self._web3, account, tx)
             tx_url = self._get_explorer_link(tx_hash.hex())
             return tx_url
 
@@ -367,7 +387,7 @@ class EVMConnection(BaseConnection):
                 "to": sender,
                 "gasInclude": "true"
             }
-            response = requests.get(url, headers=headers, params=params)
+            response = http_pool.get(url, headers=headers, params=params)
             response.raise_for_status()
             data = response.json()
             if data.get("code") != 0:
@@ -393,7 +413,7 @@ class EVMConnection(BaseConnection):
                 "deadline": int(time.time() + 1200),
                 "source": "zerepy"
             }
-            response = requests.post(url, headers=headers, json=payload)
+            response = http_pool.post(url, headers=headers, json=payload)
             response.raise_for_status()
             data = response.json()
             if data.get("code") != 0:
@@ -403,8 +423,7 @@ class EVMConnection(BaseConnection):
                 'to': Web3.to_checksum_address(route_data["routerAddress"]),
                 'data': data["data"]["data"],
                 'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0,
-                'nonce': self._web3.eth.get_transaction_count(account.address),
-                'gasPrice': self._web3.eth.gas_price,
+                'gasPrice': self._gas_price(),
                 'chainId': self.chain_id
             }
             try:
@@ -435,8 +454,7 @@ class EVMConnection(BaseConnection):
                     amount
                 ).build_transaction({
                     'from': account.address,
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
-                    'gasPrice': self._web3.eth.gas_price,
+                    'gasPrice': self._gas_price(),
                     'chainId': self.chain_id
                 })
                 try:
@@ -445,8 +463,7 @@ class EVMConnection(BaseConnection):
                 except Exception as e:
                     logger.warning(f"Approval gas estimation failed: {e}, using default")
                     approve_tx['gas'] = 100000
-                signed_approve = account.sign_transaction(approve_tx)
-                tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
+                tx_hash = send_transaction(self._web3, account, approve_tx)
                 receipt = self._web3.eth.wait_for_transaction_receipt(tx_hash)
                 if receipt['status'] != 1:
                     raise ValueError("Token approval failed")
@@ -483,8 +500,7 @@ class EVMConnection(BaseConnection):
                 if approval_hash:
                     logger.info(f"Token approval transaction: {self._get_explorer_link(approval_hash)}")
             swap_tx = self._build_swap_tx(token_in, token_out, amount, slippage, route_data)
-            signed_tx = account.sign_transaction(swap_tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            tx_hash = send_transaction(self._web3, account, swap_tx)
             tx_url = self._get_explorer_link(tx_hash.hex())
             return (f"Swap transaction sent! (allow time for scanner to populate it):\nTransaction: {tx_url}")
                 
@@ -495,7 +511,7 @@ class EVMConnection(BaseConnection):
         """Execute an Ethereum action with validation"""
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
-        load_dotenv()
+        env_store.load()
         if not self.is_configured(verbose=True):
             raise EthereumConnectionError("Ethereum connection is not properly configured")
         action = self.actions[action_name]
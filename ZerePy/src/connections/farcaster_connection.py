@@ -1,7 +1,7 @@
 import os
 import logging
 from typing import Dict, Any, List, Optional
-from dotenv import set_key, load_dotenv
+from src.helpers.env_store import env_store
 from farcaster import Warpcast
 from farcaster.models import CastContent, CastHash, IterableCastsResult, Parent, ReactionsPutResult
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
@@ -109,10 +109,17 @@ class FarcasterConnection(BaseConnection):
             )
         }
     
+    def refresh_credentials(self, changed_keys) -> None:
+        """Rebuild the Warpcast client when the mnemonic changed; other keys leave it alone"""
+        if "FARCASTER_MNEMONIC" not in changed_keys:
+            return
+        mnemonic = env_store.get("FARCASTER_MNEMONIC")
+        self._client = Warpcast(mnemonic=mnemonic) if mnemonic else None
+
     def _get_credentials(self) -> Dict[str, str]:
         """Get Farcaster credentials from environment with validation"""
         logger.debug("Retrieving Farcaster credentials")
-        load_dotenv()
+        env_store.load()
 
         required_vars = {
             'FARCASTER_MNEMONIC': 'recovery phrase',
@@ -158,7 +165,7 @@ class FarcasterConnection(BaseConnection):
                     f.write('')
 
             logger.info("Saving recovery phrase to .env file...")
-            set_key('.env', 'FARCASTER_MNEMONIC', recovery_phrase)
+            env_store.set('FARCASTER_MNEMONIC', recovery_phrase)
 
             # Simple validation of token format
             if not recovery_phrase.strip():
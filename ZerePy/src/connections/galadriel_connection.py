@@ -1,11 +1,12 @@
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 
 import requests
-from dotenv import load_dotenv, set_key
+from src.helpers.env_store import env_store
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.llm_batch import prompt_list
 
 logger = logging.getLogger("connections.galadriel_connection")
 
@@ -58,6 +59,24 @@ class GaladrielConnection(BaseConnection):
                 ],
                 description="Generate text using Galadriel models"
             ),
+            "generate-text-batch": Action(
+                name="generate-text-batch",
+                parameters=[
+                    ActionParameter("prompts", True, prompt_list, "Prompts to generate text for, one completion each"),
+                    ActionParameter("system_prompt", True, str, "System prompt shared by all prompts"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Generate text for many prompts at once using Galadriel models"
+            ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream generated text using Galadriel models"
+            ),
         }
 
     def _get_client(self) -> OpenAI:
@@ -95,9 +114,9 @@ class GaladrielConnection(BaseConnection):
                 with open('.env', 'w') as f:
                     f.write('')
 
-            set_key('.env', 'GALADRIEL_API_KEY', api_key)
+            env_store.set('GALADRIEL_API_KEY', api_key)
             if fine_tune_api_key:
-                set_key('.env', 'GALADRIEL_FINE_TUNE_API_KEY', fine_tune_api_key)
+                env_store.set('GALADRIEL_FINE_TUNE_API_KEY', fine_tune_api_key)
 
             # Validate the API key by trying to list models
             if not self._is_api_key_valid(api_key):
@@ -115,7 +134,7 @@ class GaladrielConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if Galadriel API key is configured and valid"""
         try:
-            load_dotenv()
+            env_store.load()
             api_key = os.getenv('GALADRIEL_API_KEY')
             if not api_key:
                 return False
@@ -158,6 +177,31 @@ class GaladrielConnection(BaseConnection):
         except Exception as e:
             raise GaladrielAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from Galadriel models as it is generated"""
+        try:
+            client = self._get_client()
+
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            stream = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            raise GaladrielAPIError(f"Text streaming failed: {e}")
+
     def perform_action(self, action_name: str, kwargs) -> Any:
         """Execute an action with validation"""
         if action_name not in self.actions:
@@ -1,9 +1,10 @@
 import logging
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+from typing import Dict, Any, Iterator
+from src.helpers.env_store import env_store
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.llm_batch import prompt_list
 
 logger = logging.getLogger("connections.groq_connection")
 
@@ -54,6 +55,25 @@ class GroqConnection(BaseConnection):
                 ],
                 description="Generate text using Groq models"
             ),
+            "generate-text-batch": Action(
+                name="generate-text-batch",
+                parameters=[
+                    ActionParameter("prompts", True, prompt_list, "Prompts to generate text for, one completion each"),
+                    ActionParameter("system_prompt", True, str, "System prompt shared by all prompts"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Generate text for many prompts at once using Groq models"
+            ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation"),
+                    ActionParameter("temperature", False, float, "A decimal number that determines the degree of randomness in the response.")
+                ],
+                description="Stream generated text using Groq models"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -100,7 +120,7 @@ class GroqConnection(BaseConnection):
                 with open('.env', 'w') as f:
                     f.write('')
 
-            set_key('.env', 'GROQ_API_KEY', api_key)
+            env_store.set('GROQ_API_KEY', api_key)
             
             # Validate the API key by trying to list models
             client = OpenAI(
@@ -120,7 +140,7 @@ class GroqConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if Groq API key is configured and valid"""
         try:
-            load_dotenv()
+            env_store.load()
             api_key = os.getenv('GROQ_API_KEY')
             if not api_key:
                 return False
@@ -160,6 +180,32 @@ class GroqConnection(BaseConnection):
         except Exception as e:
             raise GroqAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, temperature: float = None, **kwargs) -> Iterator[str]:
+        """Stream text from Groq models as it is generated"""
+        try:
+            client = self._get_client()
+            
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            stream = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+                **({"temperature": temperature} if temperature is not None else {})
+            )
+
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            
+        except Exception as e:
+            raise GroqAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -197,7 +243,7 @@ class GroqConnection(BaseConnection):
             raise KeyError(f"Unknown action: {action_name}")
 
         # Explicitly reload environment variables
-        load_dotenv()
+        env_store.load()
         
         if not self.is_configured(verbose=True):
             raise GroqConfigurationError("Groq is not properly configured")
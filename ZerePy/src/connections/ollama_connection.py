@@ -1,8 +1,9 @@
 import logging
 import requests
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.llm_batch import prompt_list
 
 logger = logging.getLogger("connections.ollama_connection")
 
@@ -53,6 +54,24 @@ class OllamaConnection(BaseConnection):
                 ],
                 description="Generate text using Ollama's running model"
             ),
+            "generate-text-batch": Action(
+                name="generate-text-batch",
+                parameters=[
+                    ActionParameter("prompts", True, prompt_list, "Prompts to generate text for, one completion each"),
+                    ActionParameter("system_prompt", True, str, "System prompt shared by all prompts"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Generate text for many prompts at once using Ollama's running model"
+            ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation"),
+                ],
+                description="Stream generated text using Ollama's running model"
+            ),
         }
 
     def configure(self) -> bool:
@@ -98,36 +117,35 @@ class OllamaConnection(BaseConnection):
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
         """Generate text using Ollama API with streaming support"""
         try:
-            url = f"{self.base_url}/api/generate"
-            payload = {
-                "model": model or self.config["model"],
-                "prompt": prompt,
-                "system": system_prompt,
-            }
-            response = requests.post(url, json=payload, stream=True)
-
-            if response.status_code != 200:
-                raise OllamaAPIError(f"API error: {response.status_code} - {response.text}")
-
-            # Initialize an empty string to store the complete response
-            full_response = ""
-
-            # Process each line of the response as a JSON object
-            for line in response.iter_lines():
-                if line:
-                    try:
-                        # Parse the JSON object
-                        data = json.loads(line.decode("utf-8"))
-                        # Append the "response" field to the full response
-                        full_response += data.get("response", "")
-                    except json.JSONDecodeError as e:
-                        raise OllamaAPIError(f"Failed to parse JSON: {e}")
-
-            return full_response
+            # Collect the streamed chunks into the complete response
+            return "".join(self.generate_text_stream(prompt, system_prompt, model))
 
         except Exception as e:
             raise OllamaAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from the Ollama API as it is generated"""
+        url = f"{self.base_url}/api/generate"
+        payload = {
+            "model": model or self.config["model"],
+            "prompt": prompt,
+            "system": system_prompt,
+        }
+        response = requests.post(url, json=payload, stream=True)
+
+        if response.status_code != 200:
+            raise OllamaAPIError(f"API error: {response.status_code} - {response.text}")
+
+        # Process each line of the response as a JSON object
+        for line in response.iter_lines():
+            if line:
+                try:
+                    data = json.loads(line.decode("utf-8"))
+                except json.JSONDecodeError as e:
+                    raise OllamaAPIError(f"Failed to parse JSON: {e}")
+                if data.get("response"):
+                    yield data["response"]
+
     def perform_action(self, action_name: str, kwargs) -> Any:
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
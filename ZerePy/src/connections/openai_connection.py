@@ -1,9 +1,10 @@
 import logging
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+from typing import Dict, Any, Iterator
+from src.helpers.env_store import env_store
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.llm_batch import prompt_list
 
 logger = logging.getLogger("connections.openai_connection")
 
@@ -54,6 +55,24 @@ class OpenAIConnection(BaseConnection):
                 ],
                 description="Generate text using OpenAI models"
             ),
+            "generate-text-batch": Action(
+                name="generate-text-batch",
+                parameters=[
+                    ActionParameter("prompts", True, prompt_list, "Prompts to generate text for, one completion each"),
+                    ActionParameter("system_prompt", True, str, "System prompt shared by all prompts"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Generate text for many prompts at once using OpenAI models"
+            ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream generated text using OpenAI models"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -99,7 +118,7 @@ class OpenAIConnection(BaseConnection):
                 with open('.env', 'w') as f:
                     f.write('')
 
-            set_key('.env', 'OPENAI_API_KEY', api_key)
+            env_store.set('OPENAI_API_KEY', api_key)
             
             # Validate the API key by trying to list models
             client = OpenAI(api_key=api_key)
@@ -116,7 +135,7 @@ class OpenAIConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if OpenAI API key is configured and valid"""
         try:
-            load_dotenv()
+            env_store.load()
             api_key = os.getenv('OPENAI_API_KEY')
             if not api_key:
                 return False
@@ -152,6 +171,31 @@ class OpenAIConnection(BaseConnection):
         except Exception as e:
             raise OpenAIAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from OpenAI models as it is generated"""
+        try:
+            client = self._get_client()
+            
+            # Use configured model if none provided
+            if not model:
+                model = self.config["model"]
+
+            stream = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            
+        except Exception as e:
+            raise OpenAIAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model, **kwargs):
         try:
             client = self._get_client()
@@ -1,7 +1,7 @@
 import logging
 import os
 from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+from src.helpers.env_store import env_store
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
@@ -92,7 +92,7 @@ class PerplexityConnection(BaseConnection):
                 with open('.env', 'w') as f:
                     f.write('')
 
-            set_key('.env', 'PERPLEXITY_API_KEY', api_key)
+            env_store.set('PERPLEXITY_API_KEY', api_key)
             
             # Test the configuration
             client = self._get_client()
@@ -108,7 +108,7 @@ class PerplexityConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if Perplexity API key is configured and valid"""
         try:
-            load_dotenv()
+            env_store.load()
             api_key = os.getenv('PERPLEXITY_API_KEY')
             if not api_key:
                 return False
@@ -1,8 +1,8 @@
 import logging
 import os
-import requests
 import asyncio
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, Optional, Coroutine
 
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.types import JupiterTokenData
@@ -18,7 +18,7 @@ from src.helpers.solana.transfer import SolanaTransferHelper
 from src.helpers.solana.read import SolanaReadHelper
 
 
-from dotenv import load_dotenv, set_key
+from src.helpers.env_store import env_store
 
 from jupiter_python_sdk.jupiter import Jupiter
 
@@ -47,14 +47,61 @@ class SolanaConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Solana connection...")
         super().__init__(config)
+        # Long-lived event loop owned by this connection. The pooled AsyncClient and the
+        # Jupiter instance are bound to it, so every coroutine is executed on this loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._async_client: Optional[AsyncClient] = None
+        self._jupiter: Optional[Jupiter] = None
+        self._jupiter_wallet = None
 
     @property
     def is_llm_provider(self) -> bool:
         return False
 
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get or start the background event loop"""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="solana-connection-loop",
+                    daemon=True,
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _run(self, coro: Coroutine) -> Any:
+        """Run a coroutine on the connection loop and block for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+    async def _run_async(self, coro: Coroutine) -> Any:
+        """Run a coroutine on the connection loop and await it from any other loop"""
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+        )
+
     def _get_connection_async(self) -> AsyncClient:
-        conn = AsyncClient(self.config["rpc"])
-        return conn
+        """Get the shared AsyncClient. Must be called from the connection loop"""
+        if self._async_client is None:
+            self._async_client = AsyncClient(self.config["rpc"])
+        return self._async_client
+
+    def close(self) -> None:
+        """Close the RPC client and stop the background loop"""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._async_client is not None:
+            asyncio.run_coroutine_threadsafe(self._async_client.close(), loop).result()
+            self._async_client = None
+        self._jupiter = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop_thread.join(timeout=5)
+        loop.close()
 
     def _get_wallet(self):
         creds = self._get_credentials()
@@ -63,7 +110,7 @@ class SolanaConnection(BaseConnection):
     def _get_credentials(self) -> Dict[str, str]:
         """Get Solana credentials from environment with validation"""
         logger.debug("Retrieving Solana Credentials")
-        load_dotenv()
+        env_store.load()
         required_vars = {"SOLANA_PRIVATE_KEY": "solana wallet private key"}
         credentials = {}
         missing = []
@@ -83,7 +130,9 @@ class SolanaConnection(BaseConnection):
         return credentials
 
     def _get_jupiter(self, keypair, async_client):
-        jupiter = Jupiter(
+        if self._jupiter is not None and self._jupiter_wallet == keypair:
+            return self._jupiter
+        self._jupiter = Jupiter(
             async_client=async_client,
             keypair=keypair,
             quote_api_url="https://quote-api.jup.ag/v6/quote?",
@@ -94,7 +143,8 @@ class SolanaConnection(BaseConnection):
             query_order_history_api_url="https://jup.ag/api/limit/v1/orderHistory",
             query_trade_history_api_url="https://jup.ag/api/limit/v1/tradeHistory",
         )
-        return jupiter
+        self._jupiter_wallet = keypair
+        return self._jupiter
 
     def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Validate Solana configuration from JSON"""
@@ -243,8 +293,7 @@ class SolanaConnection(BaseConnection):
                 with open(".env", "w") as f:
                     f.write("")
 
-            set_key(".env", "SOLANA_PRIVATE_KEY", private_key)
-            load_dotenv(override=True)
+            env_store.set("SOLANA_PRIVATE_KEY", private_key)
 
             logger.info("\n✅ Solana configuration successfully saved!")
             logger.info("Your private key has been stored in the .env file.")
@@ -258,7 +307,7 @@ class SolanaConnection(BaseConnection):
         """Check if Solana credentials are configured and valid"""
         try:
             # First check if credentials exist and key is valid
-            load_dotenv(override=True)
+            env_store.load()
             private_key = os.getenv("SOLANA_PRIVATE_KEY")
             if not private_key:
                 if verbose:
@@ -283,33 +332,42 @@ class SolanaConnection(BaseConnection):
                 logger.debug(f"Solana Configuration validation failed: {error_msg}")
             return False
 
-    def transfer(
+    async def _transfer(
         self, to_address: str, amount: float, token_mint: Optional[str] = None
     ) -> str:
-        res = SolanaTransferHelper.transfer(
+        return await SolanaTransferHelper.transfer(
             self._get_connection_async(),
             self._get_wallet(),
             to_address,
             amount,
             token_mint,
         )
-        res = asyncio.run(res)
+
+    def transfer(
+        self, to_address: str, amount: float, token_mint: Optional[str] = None
+    ) -> str:
+        res = self._run(self._transfer(to_address, amount, token_mint))
         logger.debug(f"Transferred {amount} to {to_address}\nTransaction ID: {res}")
         return res
 
-    # todo: test on mainnet
-    def trade(
+    async def transfer_async(
+        self, to_address: str, amount: float, token_mint: Optional[str] = None
+    ) -> str:
+        res = await self._run_async(self._transfer(to_address, amount, token_mint))
+        logger.debug(f"Transferred {amount} to {to_address}\nTransaction ID: {res}")
+        return res
+
+    async def _trade(
         self,
         output_mint: str,
         input_amount: float,
-        input_mint: Optional[str] = SPL_TOKENS["USDC"],
-        slippage_bps: int = 100,
+        input_mint: Optional[str],
+        slippage_bps: int,
     ) -> str:
-        logger.info(f"Swapping {input_amount} for {output_mint}")
         wallet = self._get_wallet()
         async_client = self._get_connection_async()
         jupiter = self._get_jupiter(wallet, async_client)
-        res = TradeManager.trade(
+        return await TradeManager.trade(
             async_client,
             wallet,
             jupiter,
@@ -318,26 +376,63 @@ class SolanaConnection(BaseConnection):
             input_mint,
             slippage_bps,
         )
-        res = asyncio.run(res)
-        return res
+
+    # todo: test on mainnet
+    def trade(
+        self,
+        output_mint: str,
+        input_amount: float,
+        input_mint: Optional[str] = SPL_TOKENS["USDC"],
+        slippage_bps: int = 100,
+    ) -> str:
+        logger.info(f"Swapping {input_amount} for {output_mint}")
+        return self._run(self._trade(output_mint, input_amount, input_mint, slippage_bps))
+
+    async def trade_async(
+        self,
+        output_mint: str,
+        input_amount: float,
+        input_mint: Optional[str] = SPL_TOKENS["USDC"],
+        slippage_bps: int = 100,
+    ) -> str:
+        logger.info(f"Swapping {input_amount} for {output_mint}")
+        return await self._run_async(
+            self._trade(output_mint, input_amount, input_mint, slippage_bps)
+        )
+
+    async def _get_balance(self, token_address: str = None) -> float:
+        return await SolanaReadHelper.get_balance(
+            self._get_connection_async(), self._get_wallet(), token_address
+        )
 
     def get_balance(self, token_address: str = None) -> float:
         if not token_address:
             logger.info("Getting SOL balance")
         else:
             logger.info(f"Getting balance for {token_address}")
-        res = SolanaReadHelper.get_balance(
-            self._get_connection_async(), self._get_wallet(), token_address
+        return self._run(self._get_balance(token_address))
+
+    async def get_balance_async(self, token_address: str = None) -> float:
+        if not token_address:
+            logger.info("Getting SOL balance")
+        else:
+            logger.info(f"Getting balance for {token_address}")
+        return await self._run_async(self._get_balance(token_address))
+
+    async def _stake(self, amount: float) -> str:
+        return await StakeManager.stake_with_jup(
+            self._get_connection_async(), self._get_wallet(), amount
         )
-        res = asyncio.run(res)
-        return res
 
     def stake(self, amount: float) -> str:
         logger.info(f"Staking {amount} SOL")
-        res = StakeManager.stake_with_jup(
-            self._get_connection_async(), self._get_wallet(), amount
-        )
-        res = asyncio.run(res)
+        res = self._run(self._stake(amount))
+        logger.debug(f"Staked {amount} SOL\nTransaction ID: {res}")
+        return res
+
+    async def stake_async(self, amount: float) -> str:
+        logger.info(f"Staking {amount} SOL")
+        res = await self._run_async(self._stake(amount))
         logger.debug(f"Staked {amount} SOL\nTransaction ID: {res}")
         return res
 
@@ -352,10 +447,20 @@ class SolanaConnection(BaseConnection):
         # logger.debug(f"Lent {amount} USDC\nTransaction ID: {res}")
         # return res
 
+    async def _request_faucet(self) -> str:
+        return await FaucetManager.request_faucet_funds(
+            self._get_connection_async(), self._get_wallet()
+        )
+
     def request_faucet(self) -> str:
         logger.info("Requesting faucet funds")
-        res = FaucetManager.request_faucet_funds(self)
-        res = asyncio.run(res)
+        res = self._run(self._request_faucet())
+        logger.debug(f"Requested faucet funds\nTransaction ID: {res}")
+        return res
+
+    async def request_faucet_async(self) -> str:
+        logger.info("Requesting faucet funds")
+        res = await self._run_async(self._request_faucet())
         logger.debug(f"Requested faucet funds\nTransaction ID: {res}")
         return res
 
@@ -374,11 +479,17 @@ class SolanaConnection(BaseConnection):
     def fetch_price(self, token_id: str) -> float:
         return SolanaReadHelper.fetch_price(token_id)
 
+    async def _get_tps(self) -> float:
+        return await SolanaPerformanceTracker.fetch_current_tps(
+            self._get_connection_async()
+        )
+
     # todo: test on mainnet
     def get_tps(self) -> int:
-        res = SolanaPerformanceTracker.fetch_current_tps(self._get_connection_async())
-        res = asyncio.run(res)
-        return res
+        return self._run(self._get_tps())
+
+    async def get_tps_async(self) -> int:
+        return await self._run_async(self._get_tps())
 
     def get_token_by_ticker(self, ticker: str) -> str:
         ticker = ticker.upper()
@@ -428,3 +539,19 @@ class SolanaConnection(BaseConnection):
         method_name = action_name.replace("-", "_")
         method = getattr(self, method_name)
         return method(**kwargs)
+
+    async def perform_action_async(self, action_name: str, kwargs) -> Any:
+        """Await a Solana action, using the native coroutine when one exists"""
+        if action_name not in self.actions:
+            raise KeyError(f"Unknown action: {action_name}")
+
+        action = self.actions[action_name]
+        errors = action.validate_params(kwargs)
+        if errors:
+            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
+
+        method_name = action_name.replace("-", "_")
+        method = getattr(self, f"{method_name}_async", None)
+        if method is None:
+            return await super().perform_action_async(action_name, kwargs)
+        return await method(**kwargs)
@@ -1,14 +1,17 @@
 import logging
 import os
-import requests
 import time
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv, set_key
+from src.helpers.env_store import env_store
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from src.constants.abi import ERC20_ABI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.constants.networks import SONIC_NETWORKS
+from src.helpers.http_pool import http_pool
+from src.helpers.token_cache import token_cache
+from src.helpers.evm_tx import gas_oracle, send_transaction
+from src.helpers.multicall import address_list, get_balances
 
 logger = logging.getLogger("connections.sonic_connection")
 
@@ -31,6 +34,8 @@ class SonicConnection(BaseConnection):
         network_config = SONIC_NETWORKS[network]
         self.explorer = network_config["scanner_url"]
         self.rpc_url = network_config["rpc_url"]
+        self.block_time = network_config.get("block_time", 1)
+        self.native_symbol = network_config.get("native_symbol", "S")
         
         super().__init__(config)
         self._initialize_web3()
@@ -38,6 +43,10 @@ class SonicConnection(BaseConnection):
         self.NATIVE_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
         self.aggregator_api = "https://aggregator-api.kyberswap.com/sonic/api/v1"
 
+    def _gas_price(self) -> int:
+        """Gas price from the shared oracle, refreshed at most once per block"""
+        return gas_oracle.gas_price(self._web3, self.block_time)
+
     def _get_explorer_link(self, tx_hash: str) -> str:
         """Generate block explorer link for transaction"""
         return f"{self.explorer}/tx/{tx_hash}"
@@ -72,35 +81,33 @@ class SonicConnection(BaseConnection):
             
         return config
 
+    def _search_token_address(self, ticker: str) -> Optional[str]:
+        """Look up a Sonic token address on DexScreener, picking the highest-FDV exact match"""
+        response = http_pool.get(
+            f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
+        )
+        response.raise_for_status()
+
+        data = response.json()
+        sonic_pairs = [
+            pair
+            for pair in data.get("pairs") or []
+            if pair.get("chainId") == "sonic"
+            and pair.get("baseToken", {}).get("symbol", "").lower() == ticker.lower()
+        ]
+        if not sonic_pairs:
+            return None
+
+        best = max(sonic_pairs, key=lambda x: x.get("fdv") or 0)
+        return best.get("baseToken", {}).get("address")
+
     def get_token_by_ticker(self, ticker: str) -> Optional[str]:
         """Get token address by ticker symbol"""
         try:
             if ticker.lower() in ["s", "S"]:
                 return "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
-                
-            response = requests.get(
-                f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
-            )
-            response.raise_for_status()
 
-            data = response.json()
-            if not data.get('pairs'):
-                return None
-
-            sonic_pairs = [
-                pair for pair in data["pairs"] if pair.get("chainId") == "sonic"
-            ]
-            sonic_pairs.sort(key=lambda x: x.get("fdv", 0), reverse=True)
-
-            sonic_pairs = [
-                pair
-                for pair in sonic_pairs
-                if pair.get("baseToken", {}).get("symbol", "").lower() == ticker.lower()
-            ]
-
-            if sonic_pairs:
-                return sonic_pairs[0].get("baseToken", {}).get("address")
-            return None
+            return token_cache.resolve("sonic", ticker, lambda: self._search_token_address(ticker))
 
         except Exception as error:
             logger.error(f"Error fetching token address: {str(error)}")
@@ -123,6 +130,14 @@ class SonicConnection(BaseConnection):
                 ],
                 description="Get $S or token balance"
             ),
+            "get-balances": Action(
+                name="get-balances",
+                parameters=[
+                    ActionParameter("tokens", True, address_list, "Token addresses (comma separated, native token placeholder for $S)"),
+                    ActionParameter("addresses", False, address_list, "Addresses to check (defaults to the configured wallet)")
+                ],
+                description="Get balances of several tokens for several addresses in one batched call"
+            ),
             "transfer": Action(
                 name="transfer",
                 parameters=[
@@ -160,7 +175,7 @@ class SonicConnection(BaseConnection):
             private_key = input("\nEnter your wallet private key: ")
             if not private_key.startswith('0x'):
                 private_key = '0x' + private_key
-            set_key('.env', 'SONIC_PRIVATE_KEY', private_key)
+            env_store.set('SONIC_PRIVATE_KEY', private_key)
 
             if not self._web3.is_connected():
                 raise SonicConnectionError("Failed to connect to Sonic network")
@@ -175,7 +190,7 @@ class SonicConnection(BaseConnection):
 
     def is_configured(self, verbose: bool = False) -> bool:
         try:
-            load_dotenv()
+            env_store.load()
             if not os.getenv('SONIC_PRIVATE_KEY'):
                 if verbose:
                     logger.error("Missing SONIC_PRIVATE_KEY in .env")
@@ -203,13 +218,8 @@ class SonicConnection(BaseConnection):
                 address = account.address
 
             if token_address:
-                contract = self._web3.eth.contract(
-                    address=Web3.to_checksum_address(token_address),
-                    abi=self.ERC20_ABI
-                )
-                balance = contract.functions.balanceOf(address).call()
-                decimals = contract.functions.decimals().call()
-                return balance / (10 ** decimals)
+                balances = get_balances(self._web3, [address], [token_address], self.native_symbol)
+                return balances[Web3.to_checksum_address(address)][Web3.to_checksum_address(token_address)]["balance"]
             else:
                 balance = self._web3.eth.get_balance(address)
                 return self._web3.from_wei(balance, 'ether')
@@ -218,12 +228,27 @@ class SonicConnection(BaseConnection):
             logger.error(f"Failed to get balance: {e}")
             raise
 
+    def get_balances(self, tokens: list, addresses: Optional[list] = None) -> Dict[str, Dict[str, Any]]:
+        """Get balances of several tokens for several addresses through one aggregated read"""
+        try:
+            if not addresses:
+                private_key = os.getenv('SONIC_PRIVATE_KEY')
+                if not private_key:
+                    raise SonicConnectionError("No wallet configured")
+                addresses = [self._web3.eth.account.from_key(private_key).address]
+
+            return get_balances(self._web3, addresses, tokens, self.native_symbol)
+
+        except Exception as e:
+            logger.error(f"Failed to get balances: {e}")
+            raise
+
     def transfer(self, to_address: str, amount: float, token_address: Optional[str] = None) -> str:
         """Transfer $S or tokens to an address"""
         try:
             private_key = os.getenv('SONIC_PRIVATE_KEY')
             account = self._web3.eth.account.from_key(private_key)
-            chain_id = self._web3.eth.chain_id
+            chain_id = gas_oracle.chain_id(self._web3)
             
             if token_address:
                 contract = self._web3.eth.contract(
@@ -238,22 +263,19 @@ class SonicConnection(BaseConnection):
                     amount_raw
                 ).build_transaction({
                     'from': account.address,
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
-                    'gasPrice': self._web3.eth.gas_price,
+                    'gasPrice': self._gas_price(),
                     'chainId': chain_id
                 })
             else:
                 tx = {
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
                     'to': Web3.to_checksum_address(to_address),
                     'value': self._web3.to_wei(amount, 'ether'),
                     'gas': 21000,
-                    'gasPrice': self._web3.eth.gas_price,
+                    'gasPrice': self._gas_price(),
                     'chainId': chain_id
                 }
 
-            signed = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed.rawTransaction)
+            tx_hash = send_transaction(self._web3, account, tx)
 
             # Log and return explorer link immediately
             tx_link = self._get_explorer_link(tx_hash.hex())
@@ -289,7 +311,7 @@ class SonicConnection(BaseConnection):
                 "gasInclude": "true"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = http_pool.get(url, headers=headers, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -320,7 +342,7 @@ class SonicConnection(BaseConnection):
                 "source": "ZerePyBot"
             }
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = http_pool.post(url, headers=headers, json=payload)
             response.raise_for_status()
             
             data = response.json()
@@ -356,13 +378,11 @@ class SonicConnection(BaseConnection):
                     amount
                 ).build_transaction({
                     'from': account.address,
-                    'nonce': self._web3.eth.get_transaction_count(account.address),
-                    'gasPrice': self._web3.eth.gas_price,
-                    'chainId': self._web3.eth.chain_id
+                    'gasPrice': self._gas_price(),
+                    'chainId': gas_oracle.chain_id(self._web3)
                 })
                 
-                signed_approve = account.sign_transaction(approve_tx)
-                tx_hash = self._web3.eth.send_raw_transaction(signed_approve.rawTransaction)
+                tx_hash = send_transaction(self._web3, account, approve_tx)
                 logger.info(f"Approval transaction sent: {self._get_explorer_link(tx_hash.hex())}")
                 
                 # Wait for approval to be mined
@@ -414,9 +434,8 @@ class SonicConnection(BaseConnection):
                 'from': account.address,
                 'to': Web3.to_checksum_address(router_address),
                 'data': encoded_data,
-                'nonce': self._web3.eth.get_transaction_count(account.address),
-                'gasPrice': self._web3.eth.gas_price,
-                'chainId': self._web3.eth.chain_id,
+                'gasPrice': self._gas_price(),
+                'chainId': gas_oracle.chain_id(self._web3),
                 'value': self._web3.to_wei(amount, 'ether') if token_in.lower() == self.NATIVE_TOKEN.lower() else 0
             }
             
@@ -428,8 +447,7 @@ class SonicConnection(BaseConnection):
                 tx['gas'] = 500000  # Default gas limit
             
             # Sign and send transaction
-            signed_tx = account.sign_transaction(tx)
-            tx_hash = self._web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            tx_hash = send_transaction(self._web3, account, tx)
             
             # Log and return explorer link immediately
             tx_link = self._get_explorer_link(tx_hash.hex())
@@ -443,7 +461,7 @@ class SonicConnection(BaseConnection):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        load_dotenv()
+        env_store.load()
         
         if not self.is_configured(verbose=True):
             raise SonicConnectionError("Sonic is not properly configured")
@@ -2,10 +2,11 @@ import os
 import logging
 from typing import Dict, Any, List, Tuple, Iterator
 from requests_oauthlib import OAuth1Session
-from dotenv import set_key, load_dotenv
+from src.helpers.env_store import env_store
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.helpers import print_h_bar
-import json,requests
+from src.helpers.http_pool import http_pool
+import json
 
 logger = logging.getLogger("connections.twitter_connection")
 
@@ -102,10 +103,15 @@ class TwitterConnection(BaseConnection):
             )
         }
 
+    def refresh_credentials(self, changed_keys) -> None:
+        """Drop the OAuth session when a Twitter credential changed"""
+        if any(key.startswith("TWITTER_") for key in changed_keys):
+            self._oauth_session = None
+
     def _get_credentials(self) -> Dict[str, str]:
         """Get Twitter credentials from environment with validation"""
         logger.debug("Retrieving Twitter credentials")
-        load_dotenv()
+        env_store.load()
 
         required_vars = {
             'TWITTER_CONSUMER_KEY': 'consumer key',
@@ -153,7 +159,7 @@ class TwitterConnection(BaseConnection):
             full_url = f"https://api.twitter.com/2/{endpoint.lstrip('/')}"
 
             if use_bearer:
-                response = requests.request(
+                response = http_pool.request(
                     method=method.lower(),
                     url=full_url,
                     auth=self._bearer_oauth,
@@ -188,13 +194,13 @@ class TwitterConnection(BaseConnection):
             logger.debug("Creating new OAuth session")
             try:
                 credentials = self._get_credentials()
-                self._oauth_session = OAuth1Session(
+                self._oauth_session = http_pool.mount(OAuth1Session(
                     credentials['TWITTER_CONSUMER_KEY'],
                     client_secret=credentials['TWITTER_CONSUMER_SECRET'],
                     resource_owner_key=credentials['TWITTER_ACCESS_TOKEN'],
                     resource_owner_secret=credentials[
                         'TWITTER_ACCESS_TOKEN_SECRET'],
-                )
+                ))
                 logger.debug("OAuth session created successfully")
             except Exception as e:
                 logger.error(f"Failed to create OAuth session: {str(e)}")
@@ -314,7 +320,7 @@ class TwitterConnection(BaseConnection):
                 resource_owner_key=oauth_tokens.get('oauth_token'),
                 resource_owner_secret=oauth_tokens.get('oauth_token_secret'))
 
-            self._oauth_session = temp_oauth
+            self._oauth_session = http_pool.mount(temp_oauth)
             user_id, username = self._get_authenticated_user_info()
 
             # Save to .env
@@ -337,9 +343,8 @@ class TwitterConnection(BaseConnection):
             if bearer_token:
                 env_vars['TWITTER_BEARER_TOKEN'] = bearer_token
 
-            for key, value in env_vars.items():
-                set_key('.env', key, value)
-                logger.debug(f"Saved {key} to .env")
+            env_store.update(env_vars)
+            logger.debug(f"Saved {', '.join(env_vars)} to .env")
 
             logger.info("\n✅ Twitter authentication successfully set up!")
             logger.info(
@@ -1,15 +1,21 @@
 SONIC_NETWORKS = {
     "mainnet": {
         "rpc_url": "https://rpc.soniclabs.com",
-        "scanner_url": "https://sonicscan.org"
+        "scanner_url": "https://sonicscan.org",
+        "block_time": 1,
+        "native_symbol": "S"
     },
     "testnet": {
         "rpc_url": "https://rpc.blaze.soniclabs.com",
-        "scanner_url": "https://testnet.sonicscan.org"
+        "scanner_url": "https://testnet.sonicscan.org",
+        "block_time": 1,
+        "native_symbol": "S"
     },
     "custom": {
         "rpc_url": "placeholder",
-        "scanner_url": "https://sonicscan.org"
+        "scanner_url": "https://sonicscan.org",
+        "block_time": 1,
+        "native_symbol": "S"
         }
     }
 
@@ -17,16 +23,22 @@ EVM_NETWORKS = {
     "ethereum": {
         "rpc_url": "https://ethereum-rpc.publicnode.com",
         "scanner_url": "etherscan.io",
-        "chain_id": 1
+        "chain_id": 1,
+        "block_time": 12,
+        "native_symbol": "ETH"
     },
     "base": {
         "rpc_url": "https://mainnet.base.org",
         "scanner_url": "basescan.org",
-        "chain_id": 8453
+        "chain_id": 8453,
+        "block_time": 2,
+        "native_symbol": "ETH"
     },
     "polygon": {
         "rpc_url": "https://polygon-rpc.com",
         "scanner_url": "polygonscan.com",
-        "chain_id": 137
+        "chain_id": 137,
+        "block_time": 2,
+        "native_symbol": "POL"
     }
 }
\ No newline at end of file
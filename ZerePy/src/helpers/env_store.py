@@ -0,0 +1,166 @@
+import inspect
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Optional, Set
+from dotenv import dotenv_values
+
+logger = logging.getLogger("helpers.env_store")
+
+
+def _format_line(key: str, value: str) -> str:
+    # Same quoting as dotenv.set_key so the file stays readable by every dotenv parser
+    return "{}='{}'\n".format(key, value.replace("'", "\\'"))
+
+
+def _line_key(line: str) -> Optional[str]:
+    stripped = line.strip()
+    if not stripped or stripped.startswith("#") or "=" not in stripped:
+        return None
+    key = stripped.split("=", 1)[0].strip()
+    if key.startswith("export "):
+        key = key[len("export "):].strip()
+    return key
+
+
+class EnvStore:
+    """
+    The .env file parsed once and served from memory.
+
+    Values are applied to os.environ, so existing os.getenv reads keep working. Writes are
+    batched into a single atomic rewrite of the file, and subscribers (the connection managers)
+    are told which keys changed so they can drop clients built with old credentials. Edits made
+    to the file by other processes are picked up by an mtime check at most every check_interval
+    seconds.
+    """
+
+    def __init__(self, path: str = ".env", check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._values: Optional[Dict[str, str]] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._subscribers = []
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _read(self) -> Set[str]:
+        """Parse the file and apply it to os.environ; returns the keys whose value changed"""
+        values = {k: v for k, v in dotenv_values(self.path).items() if v is not None} if os.path.exists(self.path) else {}
+        first_load = self._values is None
+        old = self._values or {}
+        changed = {k for k in set(old) | set(values) if old.get(k) != values.get(k)}
+        for key in changed:
+            if key in values:
+                # First load keeps variables already set in the process, like load_dotenv()
+                if not first_load or key not in os.environ:
+                    os.environ[key] = values[key]
+            elif key in old:
+                os.environ.pop(key, None)
+        self._values = values
+        self._mtime = self._file_mtime()
+        self._checked_at = time.monotonic()
+        return set() if first_load else changed
+
+    def load(self) -> Dict[str, str]:
+        """Parse the file on first use, then only again after another process changed it"""
+        changed = set()
+        with self._lock:
+            if self._values is None:
+                self._read()
+            elif time.monotonic() - self._checked_at > self.check_interval:
+                self._checked_at = time.monotonic()
+                if self._file_mtime() != self._mtime:
+                    changed = self._read()
+        if changed:
+            self._notify(changed)
+        return self._values
+
+    def reload(self) -> None:
+        """Re-read the file now, e.g. after another process wrote it"""
+        with self._lock:
+            changed = self._read()
+        if changed:
+            self._notify(changed)
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        self.load()
+        return os.environ.get(key, default)
+
+    def values(self) -> Dict[str, str]:
+        """The variables defined in the file"""
+        return dict(self.load())
+
+    def update(self, values: Dict[str, Optional[str]]) -> None:
+        """Set several variables (None removes one) in a single atomic rewrite of the file"""
+        with self._lock:
+            self.load()
+            lines = []
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    lines = f.readlines()
+
+            pending = dict(values)
+            output = []
+            for line in lines:
+                key = _line_key(line)
+                if key in pending:
+                    value = pending.pop(key)
+                    if value is not None:
+                        output.append(_format_line(key, value))
+                    continue
+                if key in values:
+                    # Duplicate definition of a key already written or removed
+                    continue
+                output.append(line if line.endswith("\n") else line + "\n")
+            output.extend(_format_line(k, v) for k, v in pending.items() if v is not None)
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.writelines(output)
+            os.replace(tmp_path, self.path)
+
+            changed = set()
+            for key, value in values.items():
+                if self._values.get(key) != value:
+                    changed.add(key)
+                if value is None:
+                    self._values.pop(key, None)
+                    os.environ.pop(key, None)
+                else:
+                    self._values[key] = value
+                    os.environ[key] = value
+            self._mtime = self._file_mtime()
+        if changed:
+            self._notify(changed)
+
+    def set(self, key: str, value: str) -> None:
+        self.update({key: value})
+
+    def subscribe(self, callback: Callable[[Set[str]], None]) -> None:
+        """Call callback with the changed keys after every change; bound methods are held weakly"""
+        ref = weakref.WeakMethod(callback) if inspect.ismethod(callback) else (lambda: callback)
+        with self._lock:
+            self._subscribers.append(ref)
+
+    def _notify(self, changed: Set[str]) -> None:
+        with self._lock:
+            self._subscribers = [ref for ref in self._subscribers if ref() is not None]
+            callbacks = [ref() for ref in self._subscribers]
+        for callback in callbacks:
+            if callback is None:
+                continue
+            try:
+                callback(changed)
+            except Exception as e:
+                logger.warning(f"Env change subscriber failed: {e}")
+
+
+env_store = EnvStore()
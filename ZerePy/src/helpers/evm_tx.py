@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from web3 import Web3
+
+logger = logging.getLogger("helpers.evm_tx")
+
+# Send errors meaning our local nonce view is out of sync with the node
+NONCE_ERRORS = ("nonce too low", "nonce too high", "replacement transaction underpriced")
+# The node already has this exact signed transaction: it was broadcast, nothing to retry
+ALREADY_KNOWN_ERRORS = ("already known", "known transaction")
+
+
+def is_already_known(error: Exception) -> bool:
+    return any(err in str(error).lower() for err in ALREADY_KNOWN_ERRORS)
+
+
+def is_nonce_error(error: Exception) -> bool:
+    return any(err in str(error).lower() for err in NONCE_ERRORS)
+
+
+def _chain_key(web3: Web3) -> str:
+    return getattr(web3.provider, "endpoint_uri", None) or str(id(web3))
+
+
+class NonceManager:
+    """
+    Local nonce allocator per (chain, account).
+
+    The first transaction reads the pending transaction count from the node; later ones
+    are numbered locally, so concurrent sends never reuse a nonce and no RPC call is
+    spent on it. A failed send resyncs from the node under the allocation lock. While
+    other sends are still in flight the counter never moves below them, and a failed
+    nonce below one of them is handed out again first, so the ones after it are not
+    left queued behind a gap.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next: Dict[Tuple[str, str], int] = {}
+        self._in_flight: Dict[Tuple[str, str], Set[int]] = {}
+        self._gaps: Dict[Tuple[str, str], Set[int]] = {}
+
+    def allocate(self, web3: Web3, address: str) -> int:
+        key = (_chain_key(web3), address.lower())
+        with self._lock:
+            gaps = self._gaps.get(key)
+            if gaps:
+                nonce = min(gaps)
+                gaps.discard(nonce)
+            else:
+                if key not in self._next:
+                    self._next[key] = web3.eth.get_transaction_count(address, "pending")
+                nonce = self._next[key]
+                self._next[key] = nonce + 1
+            self._in_flight.setdefault(key, set()).add(nonce)
+            return nonce
+
+    def release(self, web3: Web3, address: str, nonce: int) -> None:
+        """The send using nonce has finished, broadcast or not"""
+        with self._lock:
+            self._in_flight.get((_chain_key(web3), address.lower()), set()).discard(nonce)
+
+    def resync(self, web3: Web3, address: str, failed_nonce: Optional[int] = None) -> None:
+        """
+        Re-read the node after a failed send; failed_nonce is the (already released)
+        nonce that was not broadcast.
+        """
+        key = (_chain_key(web3), address.lower())
+        with self._lock:
+            pending = web3.eth.get_transaction_count(address, "pending")
+            in_flight = self._in_flight.get(key)
+            if not in_flight:
+                # Nothing else outstanding, the node is the source of truth
+                self._next[key] = pending
+                self._gaps.pop(key, None)
+                return
+            self._next[key] = max(self._next.get(key, pending), pending)
+            gaps = self._gaps.get(key, set()) | ({failed_nonce} if failed_nonce is not None else set())
+            # Nonces the node already counts were used after all
+            self._gaps[key] = {n for n in gaps if n >= pending and n not in in_flight}
+
+
+class GasOracle:
+    """
+    Gas price cache per chain, refreshed at most once per block time.
+
+    Chain ids never change for an endpoint and are cached permanently.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._gas_prices: Dict[str, Tuple[int, float]] = {}
+        self._chain_ids: Dict[str, int] = {}
+
+    def gas_price(self, web3: Web3, block_time: float = 12) -> int:
+        key = _chain_key(web3)
+        now = time.monotonic()
+        cached = self._gas_prices.get(key)
+        if cached is not None and now - cached[1] < block_time:
+            return cached[0]
+
+        price = web3.eth.gas_price
+        with self._lock:
+            self._gas_prices[key] = (price, now)
+        return price
+
+    def chain_id(self, web3: Web3) -> int:
+        key = _chain_key(web3)
+        if key not in self._chain_ids:
+            self._chain_ids[key] = web3.eth.chain_id
+        return self._chain_ids[key]
+
+    def tx_params(self, web3: Web3, address: str, block_time: float = 12) -> Dict[str, Any]:
+        """Common build_transaction params, without a nonce (assigned at send time)"""
+        return {
+            'from': address,
+            'gasPrice': self.gas_price(web3, block_time),
+            'chainId': self.chain_id(web3)
+        }
+
+
+nonce_manager = NonceManager()
+gas_oracle = GasOracle()
+
+
+def send_transaction(web3: Web3, account, tx: Dict[str, Any], on_signed: Optional[Callable[[Any], None]] = None):
+    """
+    Assign a locally allocated nonce, sign and broadcast a transaction without
+    waiting for its receipt, so several transactions can be in flight at once.
+
+    on_signed is called with the signed transaction before it is broadcast.
+
+    Returns:
+        HexBytes: the transaction hash
+    """
+    for attempt in range(2):
+        nonce = nonce_manager.allocate(web3, account.address)
+        tx['nonce'] = nonce
+        signed = None
+        try:
+            signed = account.sign_transaction(tx)
+            if on_signed is not None:
+                on_signed(signed)
+            # raw_transaction on eth-account >= 0.13 (web3 7), rawTransaction before
+            raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
+            tx_hash = web3.eth.send_raw_transaction(raw)
+        except Exception as e:
+            if signed is not None and is_already_known(e):
+                # This exact transaction is in the mempool; re-signing would send it twice
+                nonce_manager.release(web3, account.address, nonce)
+                return signed.hash
+            nonce_manager.release(web3, account.address, nonce)
+            nonce_manager.resync(web3, account.address, failed_nonce=nonce)
+            if attempt == 0 and is_nonce_error(e):
+                logger.warning(f"Nonce out of sync ({e}), resyncing and retrying")
+                continue
+            raise
+        # Broadcast, so the node's pending count now covers it
+        nonce_manager.release(web3, account.address, nonce)
+        return tx_hash
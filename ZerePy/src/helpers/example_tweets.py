@@ -0,0 +1,68 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger("helpers.example_tweets")
+
+DEFAULT_STORE_PATH = Path.home() / ".zerepy" / "example_tweets.db"
+
+
+class ExampleTweetStore:
+    """
+    Latest tweet texts of example accounts, the style corpus of the system prompt.
+
+    Kept in a small SQLite file so restarts reuse it; entries older than the caller's TTL
+    are still served while they are refreshed. If the file cannot be opened the entries are
+    kept in memory for this run instead.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH):
+        self._lock = threading.Lock()
+        self._db = self._open_db(path)
+        self._memory = {}
+
+    @staticmethod
+    def _open_db(path: Path) -> Optional[sqlite3.Connection]:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS example_tweets ("
+                "account TEXT PRIMARY KEY, tweets TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            db.commit()
+            return db
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Example tweet store unavailable, tweets will only be kept in memory: {e}")
+            return None
+
+    def get(self, account: str) -> Optional[Tuple[List[str], float]]:
+        """Stored tweet texts and when they were fetched, or None"""
+        if self._db is None:
+            return self._memory.get(account.lower())
+        with self._lock:
+            row = self._db.execute(
+                "SELECT tweets, fetched_at FROM example_tweets WHERE account = ?", (account.lower(),)
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def set(self, account: str, tweets: List[str]) -> None:
+        if self._db is None:
+            self._memory[account.lower()] = (list(tweets), time.time())
+            return
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO example_tweets (account, tweets, fetched_at) VALUES (?, ?, ?)",
+                    (account.lower(), json.dumps(tweets), time.time())
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to store example tweets of {account}: {e}")
+
+
+example_tweet_store = ExampleTweetStore()
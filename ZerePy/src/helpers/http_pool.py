@@ -0,0 +1,119 @@
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("helpers.http_pool")
+
+
+class HTTPSessionPool:
+    """
+    Process-wide keep-alive HTTP transport shared by the REST-based connections.
+
+    A single HTTPAdapter holds one urllib3 connection pool per host, so repeated
+    calls to the same API reuse open TCP/TLS connections instead of paying a new
+    handshake every time. Sessions owned by other libraries (e.g. OAuth1Session)
+    can be mounted onto the same adapter to share its pools.
+
+    requests/urllib3 only speak HTTP/1.1, so connection reuse comes from keep-alive
+    rather than HTTP/2 multiplexing.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20,
+                 timeout: float = 10, max_retries: int = 0):
+        self._lock = threading.Lock()
+        self.session: Optional[requests.Session] = None
+        self.adapter: Optional[HTTPAdapter] = None
+        # Every session routed through the pool, re-mounted when the pool is rebuilt
+        self._sessions: "weakref.WeakSet[requests.Session]" = weakref.WeakSet()
+        self._build(pool_connections, pool_maxsize, timeout, max_retries)
+
+    def _build(self, pool_connections: int, pool_maxsize: int, timeout: float, max_retries: int) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries
+        )
+        self.session = requests.Session()
+        self._sessions.add(self.session)
+        for session in list(self._sessions):
+            self._mount_adapter(session)
+
+    def configure(self, pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+                  timeout: Optional[float] = None, max_retries: Optional[int] = None) -> None:
+        """
+        Rebuild the shared pool with new limits.
+
+        The pool is process-wide, so the last call wins when several agents configure it.
+        Sessions mounted earlier are moved onto the new adapter.
+
+        Args:
+            pool_connections: Number of per-host pools kept open
+            pool_maxsize: Maximum idle connections kept per host
+            timeout: Default request timeout in seconds
+            max_retries: Connection-level retries performed by urllib3
+        """
+        with self._lock:
+            old_session = self.session
+            self._sessions.discard(old_session)
+            self._build(
+                pool_connections if pool_connections is not None else self.pool_connections,
+                pool_maxsize if pool_maxsize is not None else self.pool_maxsize,
+                timeout if timeout is not None else self.timeout,
+                max_retries if max_retries is not None else self.max_retries
+            )
+        old_session.close()
+        logger.debug(f"HTTP pool configured: {self.pool_connections} hosts x {self.pool_maxsize} connections, "
+                     f"timeout {self.timeout}s")
+
+    def _mount_adapter(self, session: requests.Session) -> None:
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+
+    def mount(self, session: requests.Session) -> requests.Session:
+        """Route a session's traffic through the shared connection pools"""
+        with self._lock:
+            self._sessions.add(session)
+            self._mount_adapter(session)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request over the shared session, applying the default timeout"""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host connection reuse statistics for the pools currently held"""
+        pools = self.adapter.poolmanager.pools
+        result = {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{key.key_scheme}://{key.key_host}:{key.key_port or pool.port}"
+            requests_sent = pool.num_requests
+            connections_opened = pool.num_connections
+            result[host] = {
+                "requests": requests_sent,
+                "connections_opened": connections_opened,
+                "reused": max(requests_sent - connections_opened, 0),
+                "idle_connections": pool.pool.qsize() if pool.pool else 0
+            }
+        return result
+
+
+# Shared instance used by all connections
+http_pool = HTTPSessionPool()
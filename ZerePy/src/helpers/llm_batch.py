@@ -0,0 +1,34 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Union
+
+logger = logging.getLogger("helpers.llm_batch")
+
+
+def prompt_list(value: Union[str, List[str], None]) -> List[str]:
+    """Action parameter type accepting a list of prompts or a JSON array string"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = json.loads(value) if value.lstrip().startswith("[") else [value]
+    return [str(item) for item in value]
+
+
+def generate_batch(generate: Callable[[str], str], prompts: List[str], max_workers: int = 4) -> List[Optional[str]]:
+    """
+    Run generate over all prompts with up to max_workers requests in flight.
+
+    Results are in prompt order. A failed prompt gives None instead of failing the batch.
+    """
+    def run(prompt: str) -> Optional[str]:
+        try:
+            return generate(prompt)
+        except Exception as e:
+            logger.warning(f"Batch generation failed for one prompt: {e}")
+            return None
+
+    if not prompts:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(prompts)))) as executor:
+        return list(executor.map(run, prompts))
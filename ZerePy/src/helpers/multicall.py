@@ -0,0 +1,186 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from eth_abi import decode
+from web3 import Web3
+
+from src.constants.abi import ERC20_ABI, MULTICALL3_ABI, MULTICALL3_ADDRESS
+from src.helpers.evm_tx import _chain_key
+
+logger = logging.getLogger("helpers.multicall")
+
+NATIVE_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+
+# Keep each eth_call well under typical RPC gas / response size limits
+MAX_CALLS_PER_BATCH = 500
+
+
+def address_list(value: Union[str, List[str], None]) -> List[str]:
+    """Action parameter type accepting a list or a comma separated string of addresses"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [item.strip() for item in value if item and item.strip()]
+
+
+class TokenMetadataCache:
+    """
+    Permanent (symbol, decimals) cache per (chain, token).
+
+    ERC20 symbol and decimals never change after deployment, so once read they are
+    never fetched again for the life of the process. symbol is optional in ERC20 and
+    is None for tokens that do not implement it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metadata: Dict[Tuple[str, str], Tuple[Optional[str], int]] = {}
+
+    def get(self, web3: Web3, token: str) -> Optional[Tuple[Optional[str], int]]:
+        return self._metadata.get((_chain_key(web3), token.lower()))
+
+    def set(self, web3: Web3, token: str, symbol: Optional[str], decimals: int) -> None:
+        with self._lock:
+            self._metadata[(_chain_key(web3), token.lower())] = (symbol, decimals)
+
+
+# Shared instance used by the EVM-family connections
+token_metadata = TokenMetadataCache()
+
+
+def _is_native(token: Optional[str]) -> bool:
+    return not token or token.lower() == NATIVE_TOKEN.lower()
+
+
+def _decode_symbol(data: bytes) -> Optional[str]:
+    if not data:
+        return None
+    try:
+        return decode(["string"], data)[0]
+    except Exception:
+        # A few old tokens (e.g. MKR) return bytes32 instead of string
+        return data[:32].rstrip(b"\x00").decode("utf-8", errors="ignore")
+
+
+def _decode_uint(data: bytes, abi_type: str = "uint256") -> Optional[int]:
+    """Decode a single integer return value; None for empty or malformed data (nonstandard tokens)"""
+    if not data:
+        return None
+    try:
+        return decode([abi_type], data)[0]
+    except Exception:
+        return None
+
+
+def _call_or_none(call):
+    try:
+        return call()
+    except Exception:
+        return None
+
+
+def _aggregate(web3: Web3, calls: List[Tuple[str, bytes]]) -> List[Tuple[bool, bytes]]:
+    """Run (target, calldata) pairs through Multicall3 aggregate3, chunked, allowing failures"""
+    multicall = web3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+    results = []
+    for start in range(0, len(calls), MAX_CALLS_PER_BATCH):
+        chunk = [(target, True, data) for target, data in calls[start:start + MAX_CALLS_PER_BATCH]]
+        results.extend(multicall.functions.aggregate3(chunk).call())
+    return results
+
+
+def _read_sequential(web3: Web3, owners: List[str], tokens: List[str],
+                     missing: List[str]) -> Dict[Tuple[str, str], int]:
+    """Fallback for chains without Multicall3: plain eth_calls, still using the metadata cache"""
+    for token in missing:
+        contract = web3.eth.contract(address=token, abi=ERC20_ABI)
+        decimals = _call_or_none(contract.functions.decimals().call)
+        if decimals is None:
+            logger.debug(f"Could not read decimals of {token}")
+            continue
+        token_metadata.set(web3, token, _call_or_none(contract.functions.symbol().call), decimals)
+
+    raw = {}
+    for owner in owners:
+        for token in tokens:
+            if _is_native(token):
+                raw[(owner, token)] = web3.eth.get_balance(owner)
+            else:
+                contract = web3.eth.contract(address=token, abi=ERC20_ABI)
+                raw[(owner, token)] = _call_or_none(contract.functions.balanceOf(owner).call)
+    return raw
+
+
+def get_balances(web3: Web3, owners: List[str], tokens: List[str],
+                 native_symbol: str = "ETH") -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Read balances of several tokens for several owners in as few RPC round trips as possible.
+
+    All balanceOf calls, native balances (via Multicall3 getEthBalance) and any symbol /
+    decimals not yet in the metadata cache are aggregated into Multicall3 calls. Chains
+    without Multicall3 fall back to individual calls.
+
+    Args:
+        web3: Connected Web3 instance
+        owners: Wallet addresses to read
+        tokens: Token addresses; the native token placeholder (or an empty value) reads
+                the native balance
+        native_symbol: Symbol reported for the native token
+
+    Returns:
+        Dict mapping owner -> token -> {"symbol", "decimals", "raw_balance", "balance"};
+        balances are None for calls that reverted
+    """
+    owners = [Web3.to_checksum_address(owner) for owner in owners]
+    tokens = [NATIVE_TOKEN if _is_native(token) else Web3.to_checksum_address(token) for token in tokens]
+    tokens = list(dict.fromkeys(tokens))
+    missing = [token for token in tokens if not _is_native(token) and token_metadata.get(web3, token) is None]
+
+    erc20 = web3.eth.contract(abi=ERC20_ABI)
+    multicall = web3.eth.contract(abi=MULTICALL3_ABI)
+
+    calls: List[Tuple[str, bytes]] = []
+    for token in missing:
+        calls.append((token, erc20.encodeABI(fn_name="symbol")))
+        calls.append((token, erc20.encodeABI(fn_name="decimals")))
+    balance_keys = [(owner, token) for owner in owners for token in tokens]
+    for owner, token in balance_keys:
+        if _is_native(token):
+            calls.append((MULTICALL3_ADDRESS, multicall.encodeABI(fn_name="getEthBalance", args=[owner])))
+        else:
+            calls.append((token, erc20.encodeABI(fn_name="balanceOf", args=[owner])))
+
+    try:
+        results = _aggregate(web3, calls)
+    except Exception as e:
+        logger.debug(f"Multicall3 unavailable on {_chain_key(web3)}, reading sequentially: {e}")
+        raw = _read_sequential(web3, owners, tokens, missing)
+    else:
+        for i, token in enumerate(missing):
+            (symbol_ok, symbol_data), (decimals_ok, decimals_data) = results[2 * i], results[2 * i + 1]
+            # Only decimals are needed for balances; a token without symbol() still gets them
+            decimals = _decode_uint(decimals_data, "uint8") if decimals_ok else None
+            if decimals is None:
+                logger.debug(f"Could not read decimals of {token}")
+                continue
+            token_metadata.set(web3, token, _decode_symbol(symbol_data) if symbol_ok else None, decimals)
+        raw = {}
+        for key, (ok, data) in zip(balance_keys, results[2 * len(missing):]):
+            raw[key] = _decode_uint(data) if ok else None
+
+    balances: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for owner, token in balance_keys:
+        if _is_native(token):
+            symbol, decimals = native_symbol, 18
+        else:
+            symbol, decimals = token_metadata.get(web3, token) or (None, None)
+        amount = raw.get((owner, token))
+        balances.setdefault(owner, {})[token] = {
+            "symbol": symbol,
+            "decimals": decimals,
+            "raw_balance": amount,
+            "balance": amount / (10 ** decimals) if amount is not None and decimals is not None else None
+        }
+    return balances
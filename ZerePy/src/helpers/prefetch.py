@@ -0,0 +1,151 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("helpers.prefetch")
+
+
+def item_key(item: Any) -> Optional[str]:
+    """Identity of a fetched item (tweet, message, cast) used to skip ones already buffered"""
+    if isinstance(item, dict):
+        return item.get("id") or item.get("hash")
+    return getattr(item, "hash", None) or getattr(item, "id", None)
+
+
+class InputBuffer:
+    """
+    Bounded, thread-safe queue of inputs (timeline tweets, room messages, ...) for the agent loop.
+
+    Behaves like the list actions already use (len, pop(0), extend, iteration). The prefetcher
+    refills it in the background once it drops below the low watermark, fetching at most once
+    per min_interval seconds and keeping at most high items. Items seen recently are skipped
+    so overlapping fetches do not queue the same tweet twice.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[], Iterable[Any]], low: int = 3, high: int = 50,
+                 min_interval: float = 60, seen_size: int = 1000):
+        self.name = name
+        self.fetch = fetch
+        self.low = low
+        self.high = high
+        self.min_interval = min_interval
+        self.seen_size = seen_size
+        self.last_fetch = 0.0
+        self._items = deque()
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._on_drain: Optional[Callable[[], None]] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._items))
+
+    def pop(self, index: int = 0):
+        with self._lock:
+            if index == 0:
+                item = self._items.popleft()
+            else:
+                item = self._items[index]
+                del self._items[index]
+            low = len(self._items) < self.low
+        if low and self._on_drain:
+            self._on_drain()
+        return item
+
+    def extend(self, items: Iterable[Any]) -> int:
+        """Queue items up to the high watermark, skipping ones seen recently; returns how many were added"""
+        added = 0
+        with self._lock:
+            for item in items:
+                if len(self._items) >= self.high:
+                    break
+                key = item_key(item)
+                if key is not None and not self._remember(key):
+                    continue
+                self._items.append(item)
+                added += 1
+        return added
+
+    def restore(self, items: Iterable[Any]) -> None:
+        """Queue items saved by a previous run, marking them as seen"""
+        self.extend(items)
+
+    def _remember(self, key: str) -> bool:
+        if key in self._seen:
+            return False
+        self._seen[key] = None
+        while len(self._seen) > self.seen_size:
+            self._seen.popitem(last=False)
+        return True
+
+    def needs_refill(self) -> bool:
+        return len(self._items) < self.low and time.monotonic() - self.last_fetch >= self.min_interval
+
+    def refill(self) -> int:
+        """Fetch once and queue the new items up to the high watermark; returns how many were added"""
+        self.last_fetch = time.monotonic()
+        return self.extend(self.fetch() or [])
+
+
+class Prefetcher:
+    """
+    Background stage keeping input buffers topped up.
+
+    A buffer dropping below its low watermark wakes the prefetcher, which refills it on a
+    worker thread (one fetch in flight per buffer, independent buffers in parallel), so
+    actions consume ready inputs instead of fetching inline.
+    """
+
+    def __init__(self, buffers: List[InputBuffer], poll_interval: float = 5.0):
+        self.buffers: Dict[str, InputBuffer] = {buffer.name: buffer for buffer in buffers}
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(len(buffers), 1), thread_name_prefix="prefetch")
+        self._thread: Optional[threading.Thread] = None
+        for buffer in buffers:
+            buffer._on_drain = self._wake.set
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="prefetcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _refill(self, buffer: InputBuffer) -> None:
+        try:
+            added = buffer.refill()
+            logger.debug(f"Prefetched {added} new items into {buffer.name} ({len(buffer)} buffered)")
+        except Exception as e:
+            logger.warning(f"Prefetching {buffer.name} failed: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(buffer.name)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            for buffer in self.buffers.values():
+                with self._lock:
+                    if buffer.name in self._in_flight or not buffer.needs_refill():
+                        continue
+                    self._in_flight.add(buffer.name)
+                self._executor.submit(self._refill, buffer)
+            # Woken early when an action drains a buffer below its low watermark
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
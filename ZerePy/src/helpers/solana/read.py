@@ -9,7 +9,9 @@ from src.types import JupiterTokenData
 
 from solders.keypair import Keypair  # type: ignore
 from solders.pubkey import Pubkey  # type: ignore
-import requests
+from src.helpers.http_pool import http_pool
+from src.helpers.token_cache import token_cache
+from src.helpers.solana.token_registry import jupiter_token_registry
 
 from spl.token.async_client import AsyncToken
 from spl.token.instructions import get_associated_token_address
@@ -58,7 +60,7 @@ class SolanaReadHelper:
         url = f"https://api.jup.ag/price/v2?ids={token_address}"
 
         try:
-            with requests.get(url) as response:
+            with http_pool.get(url) as response:
                 response.raise_for_status()
                 data = response.json()
                 price = data.get("data", {}).get(token_address, {}).get("price")
@@ -70,34 +72,34 @@ class SolanaReadHelper:
         except Exception as e:
             raise Exception(f"Price fetch failed: {str(e)}")
 
+    @staticmethod
+    def _search_token_address(ticker: str) -> str:
+        response = http_pool.get(
+            f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
+        )
+        response.raise_for_status()
+
+        data = response.json()
+        solana_pairs = [
+            pair
+            for pair in data.get("pairs") or []
+            if pair.get("chainId") == "solana"
+            and pair.get("baseToken", {}).get("symbol", "").lower() == ticker.lower()
+        ]
+        if not solana_pairs:
+            return None
+
+        best = max(solana_pairs, key=lambda x: x.get("fdv") or 0)
+        return best.get("baseToken", {}).get("address")
+
     @staticmethod
     def get_token_by_ticker(
         ticker: str,
     ) -> str:
         try:
-            response = requests.get(
-                f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
+            return token_cache.resolve(
+                "solana", ticker, lambda: SolanaReadHelper._search_token_address(ticker)
             )
-            response.raise_for_status()
-
-            data = response.json()
-            if not data.get("pairs"):
-                return None
-
-            solana_pairs = [
-                pair for pair in data["pairs"] if pair.get("chainId") == "solana"
-            ]
-            solana_pairs.sort(key=lambda x: x.get("fdv", 0), reverse=True)
-
-            solana_pairs = [
-                pair
-                for pair in solana_pairs
-                if pair.get("baseToken", {}).get("symbol", "").lower() == ticker.lower()
-            ]
-
-            if solana_pairs:
-                return solana_pairs[0].get("baseToken", {}).get("address")
-            return None
         except Exception as error:
             logger.error(
                 f"Error fetching token address from DexScreener: {str(error)}",
@@ -110,20 +112,13 @@ class SolanaReadHelper:
         address: str,
     ) -> str:
         try:
-            response = requests.get(
-                "https://tokens.jup.ag/tokens?tags=verified",
-                headers={"Content-Type": "application/json"},
+            token = jupiter_token_registry.get_by_address(address)
+            if token is None:
+                return None
+            return JupiterTokenData(
+                address=token["address"],
+                symbol=token["symbol"],
+                name=token["name"],
             )
-            response.raise_for_status()
-
-            data = response.json()
-            for token in data:
-                if token.get("address") == str(address):
-                    return JupiterTokenData(
-                        address=token.get("address"),
-                        symbol=token.get("symbol"),
-                        name=token.get("name"),
-                    )
-            return None
         except Exception as error:
             raise Exception(f"Error fetching token data: {str(error)}")
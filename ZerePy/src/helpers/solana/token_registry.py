@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.helpers.http_pool import http_pool
+
+logger = logging.getLogger("helpers.solana.token_registry")
+
+JUPITER_VERIFIED_TOKENS_URL = "https://tokens.jup.ag/tokens?tags=verified"
+DEFAULT_SNAPSHOT_PATH = Path.home() / ".zerepy" / "jupiter_tokens.json"
+
+
+class JupiterTokenRegistry:
+    """
+    Local, indexed copy of the Jupiter verified token list.
+
+    The list is downloaded once, indexed by address and symbol, and kept fresh by a
+    background thread using conditional requests (ETag / If-Modified-Since), so lookups
+    are dict reads with no network in the steady state. A compact snapshot is written to
+    disk and loaded on cold start.
+    """
+
+    def __init__(self, url: str = JUPITER_VERIFIED_TOKENS_URL, snapshot_path: Path = DEFAULT_SNAPSHOT_PATH,
+                 refresh_interval: float = 3600):
+        self.url = url
+        self.snapshot_path = snapshot_path
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._by_address: Dict[str, Dict[str, str]] = {}
+        self._by_symbol: Dict[str, List[Dict[str, str]]] = {}
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._fetched_at = 0.0
+        self._loaded = False
+        self._refresher: Optional[threading.Thread] = None
+
+    def _index(self, tokens: List[Dict[str, str]]) -> None:
+        by_address = {}
+        by_symbol = {}
+        for token in tokens:
+            by_address[token["address"]] = token
+            by_symbol.setdefault(token["symbol"].upper(), []).append(token)
+        self._by_address = by_address
+        self._by_symbol = by_symbol
+
+    def _load_snapshot(self) -> bool:
+        try:
+            with open(self.snapshot_path, "r") as f:
+                snapshot = json.load(f)
+            tokens = [
+                {"address": address, "symbol": symbol, "name": name}
+                for address, symbol, name in snapshot["tokens"]
+            ]
+        except FileNotFoundError:
+            return False
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable token snapshot: {e}")
+            return False
+
+        self._index(tokens)
+        self._etag = snapshot.get("etag")
+        self._last_modified = snapshot.get("last_modified")
+        self._fetched_at = snapshot.get("fetched_at", 0.0)
+        logger.debug(f"Loaded {len(tokens)} Jupiter tokens from snapshot")
+        return True
+
+    def _save_snapshot(self) -> None:
+        snapshot = {
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+            "fetched_at": self._fetched_at,
+            "tokens": [[t["address"], t["symbol"], t["name"]] for t in self._by_address.values()]
+        }
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Failed to write token snapshot: {e}")
+
+    def refresh(self) -> bool:
+        """
+        Re-download the token list if it changed upstream.
+
+        Returns:
+            bool: True if the index was rebuilt, False if the list was unchanged
+        """
+        headers = {"Content-Type": "application/json"}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+
+        response = http_pool.get(self.url, headers=headers)
+        if response.status_code == 304:
+            with self._lock:
+                self._fetched_at = time.time()
+            return False
+        response.raise_for_status()
+
+        tokens = [
+            {"address": t.get("address"), "symbol": t.get("symbol") or "", "name": t.get("name") or ""}
+            for t in response.json()
+            if t.get("address")
+        ]
+        with self._lock:
+            self._index(tokens)
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+            self._fetched_at = time.time()
+            self._save_snapshot()
+        logger.debug(f"Indexed {len(tokens)} Jupiter tokens")
+        return True
+
+    def _refresh_loop(self) -> None:
+        while True:
+            delay = max(self._fetched_at + self.refresh_interval - time.time(), 0)
+            time.sleep(delay)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Jupiter token list refresh failed: {e}")
+                time.sleep(min(self.refresh_interval, 300))
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            if not self._load_snapshot():
+                self.refresh()
+            self._loaded = True
+
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name="jupiter-token-registry", daemon=True
+            )
+            self._refresher.start()
+
+    def get_by_address(self, address: str) -> Optional[Dict[str, str]]:
+        """Get token data by mint address"""
+        self._ensure_loaded()
+        return self._by_address.get(str(address))
+
+    def get_by_symbol(self, symbol: str) -> List[Dict[str, str]]:
+        """Get all verified tokens using a symbol"""
+        self._ensure_loaded()
+        return self._by_symbol.get(symbol.upper(), [])
+
+
+# Shared instance used by the Solana helpers
+jupiter_token_registry = JupiterTokenRegistry()
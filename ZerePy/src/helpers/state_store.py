@@ -0,0 +1,259 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("helpers.state_store")
+
+DEFAULT_STATE_DIR = Path.home() / ".zerepy"
+
+# Marks a key removed from the state in a batch of changes
+DELETED = object()
+
+
+def _encode(value: Any):
+    """JSON fallback for the non-JSON values agent state holds"""
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": list(value)}
+    if isinstance(value, deque):
+        return list(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "__iter__") and not isinstance(value, (str, bytes, dict)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} is not serializable")
+
+
+def _decode(obj: dict):
+    if "__set__" in obj and len(obj) == 1:
+        return set(obj["__set__"])
+    return obj
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, default=_encode, sort_keys=True)
+
+
+def loads(text: str) -> Any:
+    return json.loads(text, object_hook=_decode)
+
+
+class SQLiteStateBackend:
+    """Agent state as one row per (agent, key) in a SQLite file; a batch of changes is one transaction"""
+
+    def __init__(self, path: Path = DEFAULT_STATE_DIR / "agent_state.db"):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS agent_state ("
+            "agent TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (agent, key))"
+        )
+        self._db.commit()
+
+    def load(self, agent: str) -> Dict[str, str]:
+        rows = self._db.execute("SELECT key, value FROM agent_state WHERE agent = ?", (agent,)).fetchall()
+        return dict(rows)
+
+    def write(self, agent: str, changes: Dict[str, Any]) -> None:
+        with self._db:
+            for key, value in changes.items():
+                if value is DELETED:
+                    self._db.execute("DELETE FROM agent_state WHERE agent = ? AND key = ?", (agent, key))
+                else:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO agent_state (agent, key, value) VALUES (?, ?, ?)", (agent, key, value)
+                    )
+
+    def snapshot(self, agent: str, state: Dict[str, str]) -> None:
+        with self._db:
+            self._db.execute("DELETE FROM agent_state WHERE agent = ?", (agent,))
+            self._db.executemany(
+                "INSERT INTO agent_state (agent, key, value) VALUES (?, ?, ?)",
+                [(agent, key, value) for key, value in state.items()]
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class LogStateBackend:
+    """
+    Agent state as an append-only log of change batches next to a snapshot file.
+
+    Loading reads the snapshot and replays the log; a snapshot rewrites the snapshot file
+    atomically and truncates the log. A batch torn by a crash is ignored on replay.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_STATE_DIR / "state"):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+
+    def _paths(self, agent: str):
+        return self.directory / f"{agent}.snapshot.json", self.directory / f"{agent}.log"
+
+    def load(self, agent: str) -> Dict[str, str]:
+        snapshot_path, log_path = self._paths(agent)
+        state = {}
+        if snapshot_path.exists():
+            with open(snapshot_path, "r") as f:
+                state = json.load(f)
+        if log_path.exists():
+            with open(log_path, "r") as f:
+                for line in f:
+                    try:
+                        batch = json.loads(line)
+                    except ValueError:
+                        break
+                    for key, value in batch.items():
+                        if value is None:
+                            state.pop(key, None)
+                        else:
+                            state[key] = value
+        return state
+
+    def write(self, agent: str, changes: Dict[str, Any]) -> None:
+        _, log_path = self._paths(agent)
+        batch = {key: (None if value is DELETED else value) for key, value in changes.items()}
+        with open(log_path, "a") as f:
+            f.write(json.dumps(batch) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def snapshot(self, agent: str, state: Dict[str, str]) -> None:
+        snapshot_path, log_path = self._paths(agent)
+        tmp_path = snapshot_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, snapshot_path)
+        open(log_path, "w").close()
+
+    def close(self) -> None:
+        pass
+
+
+BACKENDS = {
+    "sqlite": SQLiteStateBackend,
+    "log": LogStateBackend,
+}
+
+
+class AgentStateStore:
+    """
+    Durable copy of an agent's state with write-behind batching.
+
+    Reads never touch the backend: the agent keeps using its plain state dict. A background
+    thread serializes the tracked state every flush_interval seconds and writes only the keys
+    whose value changed since the last flush, in one batch. Every snapshot_interval seconds
+    the full state is written and the backend compacted. A crash loses at most the last
+    flush_interval seconds of changes.
+    """
+
+    def __init__(self, agent_name: str, backend: str = "sqlite", flush_interval: float = 2.0,
+                 snapshot_interval: float = 300):
+        self.agent_name = agent_name
+        self.flush_interval = flush_interval
+        self.snapshot_interval = snapshot_interval
+        self._backend = BACKENDS[backend]()
+        self._written: Dict[str, str] = {}
+        self._source: Optional[Callable[[], Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_snapshot = time.monotonic()
+        self._unserializable = set()
+
+    def load(self) -> Dict[str, Any]:
+        """State saved by a previous run, decoded"""
+        try:
+            self._written = self._backend.load(self.agent_name)
+        except Exception as e:
+            logger.warning(f"Could not load saved state of {self.agent_name}, starting fresh: {e}")
+            self._written = {}
+        state = {}
+        for key, value in self._written.items():
+            try:
+                state[key] = loads(value)
+            except ValueError:
+                logger.warning(f"Dropping unreadable saved state entry {key}")
+        return state
+
+    def _serialize(self) -> Optional[Dict[str, str]]:
+        try:
+            source = self._source()
+        except RuntimeError:
+            # The agent changed the state while it was being copied; try again on the next flush
+            return None
+        serialized = {}
+        for key, value in source.items():
+            try:
+                serialized[key] = dumps(value)
+            except RuntimeError:
+                # Mutated during serialization, keep the last written value for now
+                if key in self._written:
+                    serialized[key] = self._written[key]
+            except (TypeError, ValueError) as e:
+                if key not in self._unserializable:
+                    self._unserializable.add(key)
+                    logger.warning(f"State entry {key} is not persisted: {e}")
+        return serialized
+
+    def flush(self) -> int:
+        """Write the keys that changed since the last flush; returns how many were written"""
+        if self._source is None:
+            return 0
+        with self._lock:
+            current = self._serialize()
+            if current is None:
+                return 0
+            changes = {key: value for key, value in current.items() if self._written.get(key) != value}
+            changes.update({key: DELETED for key in self._written if key not in current})
+            if changes:
+                self._backend.write(self.agent_name, changes)
+                self._written = current
+            return len(changes)
+
+    def snapshot(self) -> None:
+        if self._source is None:
+            return
+        with self._lock:
+            current = self._serialize()
+            if current is None:
+                return
+            self._backend.snapshot(self.agent_name, current)
+            self._written = current
+            self._last_snapshot = time.monotonic()
+
+    def start(self, source: Callable[[], Dict[str, Any]]) -> None:
+        """Persist whatever source() returns in the background until stop()"""
+        self._source = source
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"state-{self.agent_name}", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                if time.monotonic() - self._last_snapshot > self.snapshot_interval:
+                    self.snapshot()
+                else:
+                    self.flush()
+            except Exception as e:
+                logger.warning(f"Failed to persist state of {self.agent_name}: {e}")
+
+    def stop(self) -> None:
+        """Stop the background writer and write a final snapshot"""
+        self._stop.set()
+        try:
+            self.snapshot()
+        except Exception as e:
+            logger.warning(f"Failed to persist state of {self.agent_name}: {e}")
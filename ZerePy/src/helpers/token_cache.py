@@ -0,0 +1,113 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger("helpers.token_cache")
+
+DEFAULT_CACHE_PATH = Path.home() / ".zerepy" / "token_cache.db"
+
+_MISS = object()
+
+
+class TokenCache:
+    """
+    Ticker -> token address cache keyed by (chain, ticker).
+
+    Lookups are served from an in-memory LRU, then from a small SQLite file so the
+    cache survives restarts, and only then from the network. Tickers the network
+    does not know are cached too (as None) with a shorter TTL.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, ttl: float = 7 * 24 * 3600,
+                 negative_ttl: float = 3600, max_entries: int = 1024):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[Optional[str], float]]" = OrderedDict()
+        self._db = self._open_db(path)
+
+    @staticmethod
+    def _open_db(path: Path) -> Optional[sqlite3.Connection]:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS token_addresses ("
+                "chain TEXT NOT NULL, ticker TEXT NOT NULL, address TEXT, expires_at REAL NOT NULL, "
+                "PRIMARY KEY (chain, ticker))"
+            )
+            db.commit()
+            return db
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Token cache store unavailable, using memory only: {e}")
+            return None
+
+    @staticmethod
+    def _key(chain: str, ticker: str) -> Tuple[str, str]:
+        return chain.lower(), ticker.lower()
+
+    def _remember(self, key: Tuple[str, str], address: Optional[str], expires_at: float) -> None:
+        self._memory[key] = (address, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, chain: str, ticker: str):
+        """Return the cached address (possibly None for unknown tickers), or _MISS"""
+        key = self._key(chain, ticker)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > now:
+                self._memory.move_to_end(key)
+                return entry[0]
+
+            if self._db is None:
+                return _MISS
+            row = self._db.execute(
+                "SELECT address, expires_at FROM token_addresses WHERE chain = ? AND ticker = ?", key
+            ).fetchone()
+            if row is None or row[1] <= now:
+                return _MISS
+            self._remember(key, row[0], row[1])
+            return row[0]
+
+    def set(self, chain: str, ticker: str, address: Optional[str]) -> None:
+        key = self._key(chain, ticker)
+        expires_at = time.time() + (self.ttl if address else self.negative_ttl)
+        with self._lock:
+            self._remember(key, address, expires_at)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO token_addresses (chain, ticker, address, expires_at) VALUES (?, ?, ?, ?)",
+                    (*key, address, expires_at)
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist token cache entry: {e}")
+
+    def resolve(self, chain: str, ticker: str, fetch: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Get a token address, calling fetch on a cache miss.
+
+        fetch should return None only when the ticker is genuinely unknown and raise on
+        network errors, so failures are not cached as unknown tickers.
+        """
+        cached = self.get(chain, ticker)
+        if cached is not _MISS:
+            return cached
+
+        address = fetch()
+        self.set(chain, ticker, address)
+        return address
+
+
+# Shared instance used by all connections
+token_cache = TokenCache()
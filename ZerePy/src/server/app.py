@@ -1,13 +1,17 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
+import json
 import logging
 import asyncio
 import signal
 import threading
 from pathlib import Path
 from src.cli import ZerePyCLI
+from src.agent import ZerePyAgent
+from src.helpers.http_pool import http_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("server/app")
@@ -23,6 +27,25 @@ class ConfigureRequest(BaseModel):
     connection: str
     params: Optional[Dict[str, Any]] = {}
 
+def _sse_event(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format a single Server-Sent Events message"""
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data, default=str)}\n\n"
+
+def _sse_stream(result: Any) -> Iterator[str]:
+    """Relay a streaming action's chunks as SSE messages, ending with a done or error event"""
+    try:
+        if isinstance(result, Iterator):
+            for chunk in result:
+                yield _sse_event({"delta": chunk})
+        else:
+            # Non-streaming actions are delivered as a single result event
+            yield _sse_event({"result": result}, event="result")
+        yield _sse_event({}, event="done")
+    except Exception as e:
+        logger.error(f"Error while streaming action: {e}")
+        yield _sse_event({"detail": str(e)}, event="error")
+
 class ServerState:
     """Simple state management for the server"""
     def __init__(self):
@@ -30,6 +53,38 @@ class ServerState:
         self.agent_running = False
         self.agent_task = None
         self._stop_event = threading.Event()
+        # Registry of concurrently loaded agents, addressed by agent file name
+        self.agents: Dict[str, ZerePyAgent] = {}
+        # Connections shared by every loaded agent with an identical connection config
+        self.connection_cache: Dict[str, Any] = {}
+
+    def load_agent(self, name: str) -> ZerePyAgent:
+        """Load an agent into the registry, reusing shared connections"""
+        agent = ZerePyAgent(name, connection_cache=self.connection_cache)
+        self.agents[name] = agent
+        return agent
+
+    def unload_agent(self, name: str) -> None:
+        """Remove an agent from the registry and drop connections no other agent uses"""
+        agent = self.agents.pop(name)
+        if self.cli.agent is agent:
+            self.cli.agent = None
+
+        in_use = {
+            key
+            for loaded in self.agents.values()
+            for key in loaded.connection_manager.connection_keys.values()
+        }
+        for key in list(self.connection_cache):
+            if key not in in_use:
+                del self.connection_cache[key]
+
+    def get_agent(self, name: str) -> ZerePyAgent:
+        """Get a loaded agent by name"""
+        agent = self.agents.get(name)
+        if not agent:
+            raise KeyError(f"Agent {name} is not loaded")
+        return agent
 
     def _run_agent_loop(self):
         """Run agent loop in a separate thread"""
@@ -79,6 +134,25 @@ class ZerePyServer:
         self.state = ServerState()
         self.setup_routes()
 
+    async def _stream_action(self, agent: ZerePyAgent, action_request: ActionRequest) -> StreamingResponse:
+        """Start an action and relay its chunks to the client as they are produced"""
+        try:
+            result = await agent.perform_action_async(
+                connection=action_request.connection,
+                action=action_request.action,
+                params=action_request.params
+            )
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if result is None:
+            raise HTTPException(status_code=400, detail=f"Action {action_request.action} failed")
+
+        return StreamingResponse(
+            _sse_stream(result),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
     def setup_routes(self):
         @self.app.get("/")
         async def root():
@@ -86,7 +160,8 @@ class ZerePyServer:
             return {
                 "status": "running",
                 "agent": self.state.cli.agent.name if self.state.cli.agent else None,
-                "agent_running": self.state.agent_running
+                "agent_running": self.state.agent_running,
+                "loaded_agents": list(self.state.agents.keys())
             }
 
         @self.app.get("/agents")
@@ -105,9 +180,9 @@ class ZerePyServer:
 
         @self.app.post("/agents/{name}/load")
         async def load_agent(name: str):
-            """Load a specific agent"""
+            """Load a specific agent into the registry and make it the current agent"""
             try:
-                self.state.cli._load_agent_from_file(name)
+                self.state.cli.agent = self.state.agents.get(name) or self.state.load_agent(name)
                 return {
                     "status": "success",
                     "agent": name
@@ -115,6 +190,66 @@ class ZerePyServer:
             except Exception as e:
                 raise HTTPException(status_code=400, detail=str(e))
 
+        @self.app.post("/agents/{name}/unload")
+        async def unload_agent(name: str):
+            """Unload a specific agent from the registry"""
+            try:
+                self.state.unload_agent(name)
+                return {"status": "success", "agent": name}
+            except KeyError:
+                raise HTTPException(status_code=404, detail=f"Agent {name} is not loaded")
+
+        @self.app.get("/agents/loaded")
+        async def list_loaded_agents():
+            """List agents currently loaded in this server"""
+            return {
+                "agents": list(self.state.agents.keys()),
+                "shared_connections": len(self.state.connection_cache)
+            }
+
+        @self.app.get("/agents/{name}/connections")
+        async def list_agent_connections(name: str):
+            """List connections of a specific loaded agent"""
+            try:
+                agent = self.state.get_agent(name)
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+
+            connections = {}
+            for conn_name, conn in agent.connection_manager.connections.items():
+                connections[conn_name] = {
+                    "configured": agent.connection_manager.is_connection_configured(conn_name),
+                    "is_llm_provider": conn.is_llm_provider
+                }
+            return {"agent": name, "connections": connections}
+
+        @self.app.post("/agents/{name}/action")
+        async def named_agent_action(name: str, action_request: ActionRequest):
+            """Execute a single action on a specific loaded agent"""
+            try:
+                agent = self.state.get_agent(name)
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+
+            try:
+                result = await agent.perform_action_async(
+                    connection=action_request.connection,
+                    action=action_request.action,
+                    params=action_request.params
+                )
+                return {"status": "success", "result": result}
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        @self.app.post("/agents/{name}/action/stream")
+        async def named_agent_action_stream(name: str, action_request: ActionRequest):
+            """Execute a streaming action on a specific loaded agent, relayed as SSE"""
+            try:
+                agent = self.state.get_agent(name)
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            return await self._stream_action(agent, action_request)
+
         @self.app.get("/connections")
         async def list_connections():
             """List all available connections"""
@@ -123,15 +258,21 @@ class ZerePyServer:
             
             try:
                 connections = {}
-                for name, conn in self.state.cli.agent.connection_manager.connections.items():
+                manager = self.state.cli.agent.connection_manager
+                for name, conn in manager.connections.items():
                     connections[name] = {
-                        "configured": conn.is_configured(),
+                        "configured": manager.is_connection_configured(name),
                         "is_llm_provider": conn.is_llm_provider
                     }
                 return {"connections": connections}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @self.app.get("/http-pool/stats")
+        async def http_pool_stats():
+            """Per-host connection reuse statistics of the shared HTTP pool"""
+            return {"hosts": http_pool.stats()}
+
         @self.app.post("/agent/action")
         async def agent_action(action_request: ActionRequest):
             """Execute a single agent action"""
@@ -139,8 +280,7 @@ class ZerePyServer:
                 raise HTTPException(status_code=400, detail="No agent loaded")
             
             try:
-                result = await asyncio.to_thread(
-                    self.state.cli.agent.perform_action,
+                result = await self.state.cli.agent.perform_action_async(
                     connection=action_request.connection,
                     action=action_request.action,
                     params=action_request.params
@@ -149,6 +289,13 @@ class ZerePyServer:
             except Exception as e:
                 raise HTTPException(status_code=400, detail=str(e))
 
+        @self.app.post("/agent/action/stream")
+        async def agent_action_stream(action_request: ActionRequest):
+            """Execute a streaming agent action (e.g. generate-text-stream), relayed as SSE"""
+            if not self.state.cli.agent:
+                raise HTTPException(status_code=400, detail="No agent loaded")
+            return await self._stream_action(self.state.cli.agent, action_request)
+
         @self.app.post("/agent/start")
         async def start_agent():
             """Start the agent loop"""
@@ -182,6 +329,7 @@ class ZerePyServer:
                     raise HTTPException(status_code=404, detail=f"Connection {name} not found")
                 
                 success = connection.configure(**config.params)
+                self.state.cli.agent.connection_manager.invalidate_config_status(name)
                 if success:
                     return {"status": "success", "message": f"Connection {name} configured successfully"}
                 else:
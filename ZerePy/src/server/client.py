@@ -1,5 +1,6 @@
+import json
 import requests
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 
 class ZerePyClient:
     def __init__(self, base_url: str = "http://localhost:8000"):
@@ -28,6 +29,15 @@ class ZerePyClient:
         """Load a specific agent"""
         return self._make_request("POST", f"/agents/{agent_name}/load")
 
+    def unload_agent(self, agent_name: str) -> Dict[str, Any]:
+        """Unload a specific agent"""
+        return self._make_request("POST", f"/agents/{agent_name}/unload")
+
+    def list_loaded_agents(self) -> List[str]:
+        """List agents currently loaded in the server"""
+        response = self._make_request("GET", "/agents/loaded")
+        return response.get("agents", [])
+
     def list_connections(self) -> Dict[str, Any]:
         """List available connections"""
         return self._make_request("GET", "/connections")
@@ -41,6 +51,45 @@ class ZerePyClient:
         }
         return self._make_request("POST", "/agent/action", json=data)
 
+    def perform_agent_action(self, agent_name: str, connection: str, action: str, params: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Execute an action on a specific loaded agent"""
+        data = {
+            "connection": connection,
+            "action": action,
+            "params": params or []
+        }
+        return self._make_request("POST", f"/agents/{agent_name}/action", json=data)
+
+    def stream_action(self, connection: str, action: str, params: Optional[List[str]] = None) -> Iterator[str]:
+        """Execute a streaming agent action (e.g. generate-text-stream), yielding text chunks as they arrive"""
+        data = {
+            "connection": connection,
+            "action": action,
+            "params": params or []
+        }
+        url = f"{self.base_url}/agent/action/stream"
+        try:
+            with requests.post(url, json=data, stream=True) as response:
+                response.raise_for_status()
+                event = None
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith("event:"):
+                        event = line[len("event:"):].strip()
+                    elif line.startswith("data:"):
+                        payload = json.loads(line[len("data:"):])
+                        if event == "error":
+                            raise Exception(f"Stream failed: {payload.get('detail')}")
+                        if event == "done":
+                            return
+                        if event == "result":
+                            yield str(payload.get("result"))
+                        else:
+                            yield payload.get("delta", "")
+                    elif not line:
+                        event = None
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Request failed: {str(e)}")
+
     def start_agent(self) -> Dict[str, Any]:
         """Start the agent loop"""
         return self._make_request("POST", "/agent/start")
@@ -0,0 +1,101 @@
+import heapq
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("task_scheduler")
+
+
+class TaskScheduler:
+    """
+    Deadline-driven scheduler for agent loop tasks.
+
+    Every task has a next-eligible time, kept in a priority queue. After a task runs it is
+    pushed back by the larger of its minimum interval and its weighted share of the loop:
+    with loop_delay seconds per action on average, a task holding weight w of the total
+    weight W is due every loop_delay * W / w seconds. Weights are re-read through weight_fn
+    on every reschedule, so time based multipliers apply to the hour the task runs in.
+    A task that reports it had nothing to do is retried after retry_delay. Tasks with
+    weight 0 never run.
+    """
+
+    def __init__(
+        self,
+        tasks: List[dict],
+        loop_delay: float,
+        intervals: Optional[Dict[str, float]] = None,
+        weight_fn: Optional[Callable[[List[float]], List[float]]] = None,
+        retry_delay: Optional[float] = None,
+    ):
+        self.tasks = {task["name"]: task for task in tasks}
+        self.loop_delay = loop_delay
+        self.intervals = intervals or {}
+        self.weight_fn = weight_fn
+        self.retry_delay = retry_delay if retry_delay is not None else loop_delay
+        self._lock = threading.Lock()
+        self._due: Dict[str, float] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._order = {name: i for i, name in enumerate(self.tasks)}
+
+        now = time.time()
+        for name in self.tasks:
+            if self._weights().get(name, 0) > 0:
+                self._push(name, now)
+
+    def _weights(self) -> Dict[str, float]:
+        names = list(self.tasks)
+        weights = [self.tasks[name].get("weight", 0) for name in names]
+        if self.weight_fn:
+            weights = self.weight_fn(weights)
+        return dict(zip(names, weights))
+
+    def _push(self, name: str, due: float) -> None:
+        self._due[name] = due
+        heapq.heappush(self._queue, (due, self._order[name], name))
+
+    def interval(self, name: str) -> float:
+        """Seconds until a task that just ran successfully is due again"""
+        weights = self._weights()
+        weight = weights.get(name, 0)
+        if weight <= 0:
+            return float("inf")
+        share = self.loop_delay * sum(w for w in weights.values() if w > 0) / weight
+        return max(self.intervals.get(name, 0), share)
+
+    def next_task(self) -> Tuple[Optional[dict], float]:
+        """The task due soonest and the seconds left until it is due (0 if it already is)"""
+        with self._lock:
+            while self._queue:
+                due, _, name = self._queue[0]
+                if self._due.get(name) != due:
+                    # Superseded by a later reschedule
+                    heapq.heappop(self._queue)
+                    continue
+                return self.tasks[name], max(0.0, due - time.time())
+        return None, self.loop_delay
+
+    def export_due(self) -> Dict[str, float]:
+        """Next-eligible time of every scheduled task, for saving across restarts"""
+        with self._lock:
+            return dict(self._due)
+
+    def restore_due(self, due: Dict[str, float]) -> None:
+        """Resume the schedule of a previous run; tasks it does not know keep running now"""
+        with self._lock:
+            for name, when in due.items():
+                if name in self._due:
+                    self._push(name, when)
+
+    def start(self, name: str) -> None:
+        """Mark a task as running so it is not handed out again until it completes"""
+        with self._lock:
+            self._due.pop(name, None)
+
+    def complete(self, name: str, success: bool) -> None:
+        """Reschedule a task after it ran: a full interval on success, retry_delay otherwise"""
+        delay = self.interval(name) if success else self.retry_delay
+        with self._lock:
+            if delay != float("inf"):
+                self._push(name, time.time() + delay)
+        logger.debug(f"Task {name} {'done' if success else 'not ready'}, next run in {delay:.0f}s")
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+from src.action_handler import execute_action, execute_action_async, register_action
+from src.connections.base_connection import Action, ActionParameter, BaseConnection
+
+
+@register_action("test-sync-action")
+def sync_action(agent, **kwargs):
+    return threading.current_thread() is threading.main_thread(), kwargs
+
+
+@register_action("test-async-action")
+async def async_action(agent, **kwargs):
+    return "awaited", kwargs
+
+
+class EchoConnection(BaseConnection):
+    @property
+    def is_llm_provider(self):
+        return False
+
+    def validate_config(self, config):
+        return config
+
+    def configure(self, **kwargs):
+        return True
+
+    def is_configured(self, verbose=False):
+        return True
+
+    def register_actions(self):
+        self.actions = {
+            "echo": Action("echo", [ActionParameter("text", True, str, "Text to echo")], "Echo text")
+        }
+
+    def perform_action(self, action_name, kwargs):
+        return threading.current_thread() is threading.main_thread(), kwargs["text"]
+
+
+def test_execute_action_runs_sync_handler_inline():
+    assert execute_action(None, "test-sync-action", value=1) == (True, {"value": 1})
+
+
+def test_execute_action_async_runs_sync_handler_in_worker_thread():
+    on_main_thread, kwargs = asyncio.run(execute_action_async(None, "test-sync-action", value=2))
+    assert on_main_thread is False
+    assert kwargs == {"value": 2}
+
+
+def test_execute_action_async_awaits_coroutine_handler():
+    assert asyncio.run(execute_action_async(None, "test-async-action", value=3)) == ("awaited", {"value": 3})
+
+
+def test_unknown_action_returns_none():
+    assert execute_action(None, "test-missing-action") is None
+    assert asyncio.run(execute_action_async(None, "test-missing-action")) is None
+
+
+def test_connection_perform_action_async_runs_off_the_event_loop():
+    connection = EchoConnection({})
+    on_main_thread, text = asyncio.run(connection.perform_action_async("echo", {"text": "hi"}))
+    assert on_main_thread is False
+    assert text == "hi"
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from src.connection_manager import ConnectionManager
+from src.connections.base_connection import BaseConnection
+
+
+class ProbedConnection(BaseConnection):
+    """is_configured answers from a script of results (exceptions are raised)"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.probes = 0
+        super().__init__({})
+
+    @property
+    def is_llm_provider(self):
+        return False
+
+    def validate_config(self, config):
+        return config
+
+    def configure(self, **kwargs):
+        return True
+
+    def register_actions(self):
+        self.actions = {}
+
+    def is_configured(self, verbose=False):
+        self.probes += 1
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def manager_with(connection, **kwargs):
+    manager = ConnectionManager([], **kwargs)
+    manager.connections["probed"] = connection
+    return manager
+
+
+def test_positive_status_is_cached():
+    connection = ProbedConnection([True])
+    manager = manager_with(connection)
+    assert manager.is_connection_configured("probed")
+    assert manager.is_connection_configured("probed")
+    assert connection.probes == 1
+
+
+def test_transient_failure_is_reprobed_inline_after_failure_ttl():
+    connection = ProbedConnection([ConnectionError("network down"), True])
+    manager = manager_with(connection, config_failure_ttl=0.05)
+
+    assert manager.is_connection_configured("probed") is False
+    # Within the failure TTL the negative result is reused
+    assert manager.is_connection_configured("probed") is False
+    assert connection.probes == 1
+
+    time.sleep(0.06)
+    assert manager.is_connection_configured("probed") is True
+    assert connection.probes == 2
+
+
+def test_stale_positive_status_is_served_while_refreshing():
+    connection = ProbedConnection([True, False])
+    manager = manager_with(connection, config_status_ttl=0)
+    assert manager.is_connection_configured("probed") is True
+    time.sleep(0.01)
+    # Served from cache; the refresh runs in the background
+    assert manager.is_connection_configured("probed") is True
+    deadline = time.time() + 1
+    while manager._config_status["probed"][0] and time.time() < deadline:
+        time.sleep(0.01)
+    assert manager._config_status["probed"][0] is False
+
+
+def test_status_cache_is_warmed_in_the_background(monkeypatch):
+    connection = ProbedConnection([True])
+    monkeypatch.setattr(ConnectionManager, "_register_connection",
+                        lambda self, config: self.connections.__setitem__(config["name"], connection))
+    manager = ConnectionManager([{"name": "probed"}])
+    deadline = time.time() + 1
+    while "probed" not in manager._config_status and time.time() < deadline:
+        time.sleep(0.01)
+    assert manager._config_status["probed"][0] is True
+    assert manager.is_connection_configured("probed") is True
+    assert connection.probes == 1
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+pytest.importorskip("dotenv")
+from dotenv import dotenv_values
+
+from src.helpers.env_store import EnvStore
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    path = tmp_path / ".env"
+    path.write_text("# credentials\nENV_STORE_A=one\nexport ENV_STORE_B='two'\nENV_STORE_A=duplicate\n")
+    for key in ("ENV_STORE_A", "ENV_STORE_B", "ENV_STORE_C"):
+        monkeypatch.delenv(key, raising=False)
+    yield path
+    for key in ("ENV_STORE_A", "ENV_STORE_B", "ENV_STORE_C"):
+        os.environ.pop(key, None)
+
+
+def test_load_applies_the_file_to_the_environment(env_file):
+    store = EnvStore(str(env_file))
+    assert store.get("ENV_STORE_B") == "two"
+    assert os.environ["ENV_STORE_B"] == "two"
+
+
+def test_update_rewrites_the_file_once_and_keeps_other_lines(env_file):
+    store = EnvStore(str(env_file))
+    store.update({"ENV_STORE_A": "new", "ENV_STORE_B": None, "ENV_STORE_C": "it's"})
+
+    text = env_file.read_text()
+    assert text.startswith("# credentials\n")
+    assert text.count("ENV_STORE_A") == 1
+    assert "ENV_STORE_B" not in text
+    assert not os.path.exists(f"{env_file}.tmp")
+    assert dotenv_values(env_file) == {"ENV_STORE_A": "new", "ENV_STORE_C": "it's"}
+    assert os.environ["ENV_STORE_C"] == "it's"
+    assert "ENV_STORE_B" not in os.environ
+
+
+def test_subscribers_get_only_the_changed_keys(env_file):
+    store = EnvStore(str(env_file))
+    changes = []
+    store.subscribe(changes.append)
+    store.update({"ENV_STORE_A": "duplicate", "ENV_STORE_C": "three"})
+    assert changes == [{"ENV_STORE_C"}]
+
+
+def test_bound_method_subscribers_are_held_weakly(env_file):
+    class Manager:
+        def __init__(self):
+            self.changes = []
+
+        def refresh(self, keys):
+            self.changes.append(keys)
+
+    store = EnvStore(str(env_file))
+    manager = Manager()
+    store.subscribe(manager.refresh)
+    store.set("ENV_STORE_C", "x")
+    assert manager.changes == [{"ENV_STORE_C"}]
+    del manager
+    store.set("ENV_STORE_C", "y")
+    assert store._subscribers == []
+
+
+def test_edits_by_other_processes_are_picked_up(env_file):
+    store = EnvStore(str(env_file), check_interval=0)
+    changes = []
+    store.subscribe(changes.append)
+    store.load()
+    env_file.write_text("ENV_STORE_A=edited\n")
+    os.utime(env_file, (1, 1))
+    assert store.get("ENV_STORE_A") == "edited"
+    assert changes == [{"ENV_STORE_A", "ENV_STORE_B"}]
@@ -0,0 +1,116 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("web3")
+from eth_account import Account
+from web3 import Web3
+
+from src.helpers import evm_tx
+from src.helpers.evm_tx import NonceManager
+
+
+class FakeEth:
+    def __init__(self, pending=5, errors=()):
+        self.pending = pending
+        self.errors = list(errors)
+        self.sent = []
+
+    def get_transaction_count(self, address, block):
+        return self.pending
+
+    def send_raw_transaction(self, raw):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append(raw)
+        self.pending += 1
+        return b"hash-%d" % len(self.sent)
+
+
+def fake_web3(**kwargs):
+    return SimpleNamespace(provider=SimpleNamespace(endpoint_uri="http://node"), eth=FakeEth(**kwargs))
+
+
+ADDRESS = "0x00000000000000000000000000000000000000aa"
+
+
+def test_allocates_sequential_nonces_from_the_node():
+    web3, nonces = fake_web3(pending=7), NonceManager()
+    assert [nonces.allocate(web3, ADDRESS) for _ in range(3)] == [7, 8, 9]
+
+
+def test_concurrent_allocations_never_repeat():
+    web3, nonces = fake_web3(), NonceManager()
+    allocated = []
+    threads = [threading.Thread(target=lambda: allocated.append(nonces.allocate(web3, ADDRESS))) for _ in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(allocated) == list(range(5, 55))
+
+
+def test_failed_nonce_below_an_in_flight_one_is_reused():
+    web3, nonces = fake_web3(pending=5), NonceManager()
+    failed, in_flight = nonces.allocate(web3, ADDRESS), nonces.allocate(web3, ADDRESS)
+    nonces.release(web3, ADDRESS, failed)
+    nonces.resync(web3, ADDRESS, failed_nonce=failed)
+    # 6 is still being sent, so 5 must be issued again or 6 stays queued forever
+    assert nonces.allocate(web3, ADDRESS) == failed
+    assert nonces.allocate(web3, ADDRESS) == in_flight + 1
+
+
+def test_resync_with_nothing_in_flight_follows_the_node():
+    web3, nonces = fake_web3(pending=5), NonceManager()
+    for _ in range(3):
+        nonces.release(web3, ADDRESS, nonces.allocate(web3, ADDRESS))
+    web3.eth.pending = 6
+    nonces.resync(web3, ADDRESS, failed_nonce=7)
+    assert nonces.allocate(web3, ADDRESS) == 6
+
+
+def test_gaps_the_node_already_counts_are_dropped():
+    web3, nonces = fake_web3(pending=5), NonceManager()
+    failed, _ = nonces.allocate(web3, ADDRESS), nonces.allocate(web3, ADDRESS)
+    nonces.release(web3, ADDRESS, failed)
+    web3.eth.pending = 6  # 5 was mined after all ("nonce too low")
+    nonces.resync(web3, ADDRESS, failed_nonce=failed)
+    assert nonces.allocate(web3, ADDRESS) == 7
+
+
+@pytest.fixture
+def fresh_manager(monkeypatch):
+    monkeypatch.setattr(evm_tx, "nonce_manager", NonceManager())
+
+
+def tx():
+    return {"to": Web3.to_checksum_address(ADDRESS), "value": 1, "gas": 21000, "gasPrice": 1, "chainId": 1}
+
+
+def test_already_known_is_success_and_not_resent(fresh_manager):
+    account = Account.create()
+    web3 = fake_web3(errors=[ValueError("already known")])
+    signed = []
+    tx_hash = evm_tx.send_transaction(web3, account, tx(), on_signed=signed.append)
+    assert tx_hash == signed[0].hash
+    assert len(signed) == 1
+    assert web3.eth.sent == []
+
+
+def test_nonce_error_resyncs_and_retries_once(fresh_manager):
+    account = Account.create()
+    web3 = fake_web3(pending=5, errors=[ValueError("nonce too low")])
+    # Another wallet using the account sent up to nonce 8 meanwhile
+    counts = iter([5, 9])
+    web3.eth.get_transaction_count = lambda address, block: next(counts)
+    sent_tx, nonces = tx(), []
+    evm_tx.send_transaction(web3, account, sent_tx, on_signed=lambda signed: nonces.append(sent_tx["nonce"]))
+    assert nonces == [5, 9]
+    assert len(web3.eth.sent) == 1
+
+
+def test_other_errors_are_raised(fresh_manager):
+    web3 = fake_web3(errors=[ValueError("insufficient funds")])
+    with pytest.raises(ValueError, match="insufficient funds"):
+        evm_tx.send_transaction(web3, Account.create(), tx())
@@ -0,0 +1,31 @@
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from src.helpers.http_pool import HTTPSessionPool
+
+
+def test_mounted_session_shares_the_pool_adapter():
+    pool = HTTPSessionPool()
+    session = pool.mount(requests.Session())
+    assert session.get_adapter("https://api.example.com") is pool.adapter
+    assert session.get_adapter("http://api.example.com") is pool.adapter
+
+
+def test_configure_moves_mounted_sessions_to_the_new_adapter():
+    pool = HTTPSessionPool(pool_maxsize=20)
+    session = pool.mount(requests.Session())
+    old_adapter = pool.adapter
+
+    pool.configure(pool_maxsize=5)
+
+    assert pool.adapter is not old_adapter
+    assert pool.pool_maxsize == 5
+    assert session.get_adapter("https://api.example.com") is pool.adapter
+    assert pool.session.get_adapter("https://api.example.com") is pool.adapter
+
+
+def test_configure_keeps_unset_limits():
+    pool = HTTPSessionPool(pool_connections=3, pool_maxsize=7, timeout=4, max_retries=1)
+    pool.configure(timeout=9)
+    assert (pool.pool_connections, pool.pool_maxsize, pool.timeout, pool.max_retries) == (3, 7, 9, 1)
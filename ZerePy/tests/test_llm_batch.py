@@ -0,0 +1,72 @@
+import threading
+import time
+
+from src.connections.base_connection import Action, ActionParameter, BaseConnection
+from src.helpers.llm_batch import generate_batch, prompt_list
+
+
+def test_prompt_list_accepts_lists_json_arrays_and_single_prompts():
+    assert prompt_list(["a", 1]) == ["a", "1"]
+    assert prompt_list('["a", "b"]') == ["a", "b"]
+    assert prompt_list("just one") == ["just one"]
+    assert prompt_list(None) == []
+
+
+def test_malformed_json_array_is_a_parameter_error():
+    action = Action("generate-text-batch", [ActionParameter("prompts", True, prompt_list, "Prompts")], "Batch")
+    assert action.validate_params({"prompts": '["a", '}) == ["Invalid type for prompts. Expected prompt_list"]
+
+
+def test_results_keep_prompt_order_and_failures_are_none():
+    def generate(prompt):
+        # Later prompts finish first
+        time.sleep(0.01 * (3 - int(prompt)))
+        if prompt == "1":
+            raise RuntimeError("rate limited")
+        return f"reply {prompt}"
+
+    assert generate_batch(generate, ["0", "1", "2"]) == ["reply 0", None, "reply 2"]
+    assert generate_batch(generate, []) == []
+
+
+def test_at_most_max_workers_requests_in_flight():
+    lock = threading.Lock()
+    in_flight, peak = [0], [0]
+
+    def generate(prompt):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        return prompt
+
+    assert generate_batch(generate, [str(i) for i in range(8)], max_workers=2) == [str(i) for i in range(8)]
+    assert peak[0] == 2
+
+
+class EchoLLMConnection(BaseConnection):
+    @property
+    def is_llm_provider(self):
+        return True
+
+    def validate_config(self, config):
+        return config
+
+    def configure(self, **kwargs):
+        return True
+
+    def is_configured(self, verbose=False):
+        return True
+
+    def register_actions(self):
+        self.actions = {}
+
+    def generate_text(self, prompt, system_prompt, model=None, **kwargs):
+        return f"{system_prompt}:{prompt}:{model}"
+
+
+def test_connection_batch_shares_system_prompt_and_model():
+    connection = EchoLLMConnection({"batch_concurrency": 2})
+    assert connection.generate_text_batch(["a", "b"], "sys", model="m") == ["sys:a:m", "sys:b:m"]
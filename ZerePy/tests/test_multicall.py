@@ -0,0 +1,87 @@
+import pytest
+
+pytest.importorskip("web3")
+pytest.importorskip("solders")
+from eth_abi import encode
+from web3 import Web3
+
+from src.helpers import multicall
+from src.helpers.multicall import NATIVE_TOKEN, TokenMetadataCache, address_list, get_balances
+
+SYMBOL, DECIMALS, BALANCE_OF, GET_ETH_BALANCE = "95d89b41", "313ce567", "70a08231", "4d2301cc"
+
+OWNER = Web3.to_checksum_address("0x" + "01" * 20)
+GOOD = Web3.to_checksum_address("0x" + "a1" * 20)
+NO_SYMBOL = Web3.to_checksum_address("0x" + "a2" * 20)
+BAD_DECIMALS = Web3.to_checksum_address("0x" + "a3" * 20)
+MALFORMED = Web3.to_checksum_address("0x" + "a4" * 20)
+
+# token -> selector -> (success, return data)
+RESPONSES = {
+    GOOD: {SYMBOL: (True, encode(["string"], ["GOOD"])), DECIMALS: (True, encode(["uint8"], [6])),
+           BALANCE_OF: (True, encode(["uint256"], [2_500_000]))},
+    NO_SYMBOL: {SYMBOL: (False, b""), DECIMALS: (True, encode(["uint8"], [18])),
+                BALANCE_OF: (True, encode(["uint256"], [10 ** 18]))},
+    BAD_DECIMALS: {SYMBOL: (True, encode(["string"], ["BAD"])), DECIMALS: (True, encode(["uint256"], [300])),
+                   BALANCE_OF: (True, encode(["uint256"], [5]))},
+    MALFORMED: {SYMBOL: (True, encode(["string"], ["MAL"])), DECIMALS: (True, b"\x01"),
+                BALANCE_OF: (True, b"\x02")},
+}
+
+
+@pytest.fixture
+def web3(monkeypatch):
+    calls = []
+
+    def aggregate(web3, batch):
+        calls.append(batch)
+        results = []
+        for target, data in batch:
+            data = data.hex() if isinstance(data, bytes) else data
+            selector = data[2:10] if data.startswith("0x") else data[:8]
+            if selector == GET_ETH_BALANCE:
+                results.append((True, encode(["uint256"], [3 * 10 ** 18])))
+            else:
+                results.append(RESPONSES[target][selector])
+        return results
+
+    monkeypatch.setattr(multicall, "_aggregate", aggregate)
+    monkeypatch.setattr(multicall, "token_metadata", TokenMetadataCache())
+    w3 = Web3(Web3.HTTPProvider("http://localhost:1"))
+    w3.aggregate_calls = calls
+    return w3
+
+
+def test_reads_erc20_and_native_balances_in_one_batch(web3):
+    balances = get_balances(web3, [OWNER], [GOOD, NATIVE_TOKEN], native_symbol="S")[OWNER]
+    assert balances[GOOD] == {"symbol": "GOOD", "decimals": 6, "raw_balance": 2_500_000, "balance": 2.5}
+    assert balances[NATIVE_TOKEN]["symbol"] == "S"
+    assert balances[NATIVE_TOKEN]["balance"] == 3.0
+    assert len(web3.aggregate_calls) == 1
+
+
+def test_token_without_symbol_still_has_a_balance(web3):
+    balance = get_balances(web3, [OWNER], [NO_SYMBOL])[OWNER][NO_SYMBOL]
+    assert balance["symbol"] is None
+    assert balance["balance"] == 1.0
+
+
+def test_nonstandard_decimals_do_not_fail_the_batch(web3):
+    balances = get_balances(web3, [OWNER], [BAD_DECIMALS, MALFORMED, GOOD])[OWNER]
+    assert balances[BAD_DECIMALS]["balance"] is None
+    assert balances[MALFORMED]["balance"] is None
+    assert balances[MALFORMED]["raw_balance"] is None
+    assert balances[GOOD]["balance"] == 2.5
+
+
+def test_metadata_is_read_only_once(web3):
+    get_balances(web3, [OWNER], [GOOD])
+    get_balances(web3, [OWNER], [GOOD])
+    assert len(web3.aggregate_calls[0]) == 3
+    assert len(web3.aggregate_calls[1]) == 1
+
+
+def test_address_list_accepts_lists_and_comma_separated_strings():
+    assert address_list(" 0x1, 0x2 ,") == ["0x1", "0x2"]
+    assert address_list(["0x1", ""]) == ["0x1"]
+    assert address_list(None) == []
@@ -0,0 +1,70 @@
+import threading
+
+from src.helpers.prefetch import InputBuffer, Prefetcher, item_key
+
+
+def tweets(*ids):
+    return [{"id": str(i), "text": f"tweet {i}"} for i in ids]
+
+
+def test_item_key_uses_id_or_hash():
+    assert item_key({"id": "1"}) == "1"
+    assert item_key({"hash": "0xab"}) == "0xab"
+    assert item_key("plain") is None
+
+
+def test_refill_skips_seen_items_and_stops_at_high():
+    batches = [tweets(1, 2, 3), tweets(3, 4, 5, 6)]
+    buffer = InputBuffer("timeline_tweets", lambda: batches.pop(0), high=4)
+    assert buffer.refill() == 3
+    assert buffer.refill() == 1
+    assert [t["id"] for t in buffer] == ["1", "2", "3", "4"]
+
+
+def test_extend_applies_the_same_bound_and_seen_set():
+    buffer = InputBuffer("timeline_tweets", lambda: [], high=3)
+    buffer.restore(tweets(1, 2))
+    assert buffer.extend(tweets(2, 3, 4)) == 1
+    assert len(buffer) == 3
+    buffer.pop(0)
+    # Already queued once, so not queued again after being consumed
+    assert buffer.extend(tweets(1)) == 0
+
+
+def test_items_without_an_id_are_always_queued():
+    buffer = InputBuffer("history", lambda: [])
+    buffer.extend(["a", "a"])
+    assert list(buffer) == ["a", "a"]
+
+
+def test_needs_refill_respects_low_and_min_interval():
+    buffer = InputBuffer("timeline_tweets", lambda: tweets(1), low=1, min_interval=60)
+    assert buffer.needs_refill()
+    buffer.refill()
+    buffer.pop(0)
+    assert not buffer.needs_refill()
+    buffer.min_interval = 0
+    assert buffer.needs_refill()
+
+
+def test_draining_a_buffer_wakes_the_prefetcher():
+    fetched = threading.Event()
+    batches = [tweets(1, 2), tweets(3)]
+
+    def fetch():
+        batch = batches.pop(0) if batches else []
+        fetched.set()
+        return batch
+
+    buffer = InputBuffer("timeline_tweets", fetch, low=2, min_interval=0)
+    prefetcher = Prefetcher([buffer], poll_interval=60)
+    prefetcher.start()
+    try:
+        assert fetched.wait(5)
+        while len(buffer) < 2:
+            fetched.wait(0.01)
+        fetched.clear()
+        buffer.pop(0)
+        assert fetched.wait(5)
+    finally:
+        prefetcher.stop()
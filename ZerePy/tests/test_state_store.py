@@ -0,0 +1,80 @@
+from collections import deque
+
+import pytest
+
+from src.helpers import state_store
+from src.helpers.state_store import AgentStateStore, LogStateBackend, SQLiteStateBackend
+
+
+@pytest.fixture(params=["sqlite", "log"])
+def backend(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(state_store, "BACKENDS", {
+        "sqlite": lambda: SQLiteStateBackend(tmp_path / "agent_state.db"),
+        "log": lambda: LogStateBackend(tmp_path / "state"),
+    })
+    return request.param
+
+
+def started(backend, state):
+    store = AgentStateStore("agent", backend=backend, flush_interval=3600)
+    store.load()
+    store.start(lambda: state)
+    return store
+
+
+def test_state_round_trips(backend):
+    state = {
+        "last_tweet_time": 1700000000.5,
+        "replied": {"1", "2"},
+        "queue": deque([{"id": "3"}]),
+        "schedule": {"post": 12.0},
+    }
+    store = started(backend, state)
+    assert store.flush() == 4
+
+    restored = AgentStateStore("agent", backend=backend).load()
+    assert restored == {**state, "queue": [{"id": "3"}]}
+    assert isinstance(restored["replied"], set)
+
+
+def test_flush_writes_only_changes_and_deletions(backend):
+    state = {"a": 1, "b": [1, 2]}
+    store = started(backend, state)
+    store.flush()
+    assert store.flush() == 0
+
+    state["a"] = 2
+    del state["b"]
+    assert store.flush() == 2
+    assert AgentStateStore("agent", backend=backend).load() == {"a": 2}
+
+
+def test_snapshot_compacts_and_keeps_later_changes(backend):
+    state = {"a": 1}
+    store = started(backend, state)
+    store.flush()
+    state["a"] = 2
+    store.snapshot()
+    state["b"] = "x"
+    store.flush()
+    assert AgentStateStore("agent", backend=backend).load() == {"a": 2, "b": "x"}
+
+
+def test_unserializable_entries_are_skipped(backend):
+    state = {"ok": 1, "client": object()}
+    store = started(backend, state)
+    assert store.flush() == 1
+    assert AgentStateStore("agent", backend=backend).load() == {"ok": 1}
+
+
+def test_agents_do_not_share_state(backend):
+    started(backend, {"a": 1}).flush()
+    assert AgentStateStore("other", backend=backend).load() == {}
+
+
+def test_log_replay_ignores_a_torn_batch(tmp_path):
+    backend = LogStateBackend(tmp_path)
+    backend.write("agent", {"a": "1"})
+    with open(tmp_path / "agent.log", "a") as f:
+        f.write('{"a": "2", "b"')
+    assert backend.load("agent") == {"a": "1"}
@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src import task_scheduler
+from src.task_scheduler import TaskScheduler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(task_scheduler, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def tasks(**weights):
+    return [{"name": name, "weight": weight} for name, weight in weights.items()]
+
+
+def test_everything_with_a_weight_is_due_at_start(clock):
+    scheduler = TaskScheduler(tasks(post=1, reply=1, idle=0), loop_delay=10)
+    assert set(scheduler.export_due()) == {"post", "reply"}
+    task, wait = scheduler.next_task()
+    assert task["name"] == "post"
+    assert wait == 0
+
+
+def test_interval_is_the_weighted_share_of_the_loop(clock):
+    scheduler = TaskScheduler(tasks(post=1, reply=3), loop_delay=10, intervals={"reply": 60})
+    assert scheduler.interval("post") == 40
+    # The minimum interval wins over the shorter weighted share
+    assert scheduler.interval("reply") == 60
+    assert scheduler.interval("missing") == float("inf")
+
+
+def test_complete_reschedules_by_interval_or_retry_delay(clock):
+    scheduler = TaskScheduler(tasks(post=1, reply=1), loop_delay=10, retry_delay=5)
+    scheduler.start("post")
+    assert "post" not in scheduler.export_due()
+    scheduler.complete("post", success=True)
+    scheduler.start("reply")
+    scheduler.complete("reply", success=False)
+    assert scheduler.export_due() == {"post": 1020.0, "reply": 1005.0}
+
+    task, wait = scheduler.next_task()
+    assert task["name"] == "reply"
+    assert wait == 5
+    clock.value = 1010.0
+    assert scheduler.next_task() == (scheduler.tasks["reply"], 0.0)
+
+
+def test_weight_fn_is_applied_on_every_reschedule(clock):
+    multiplier = {"post": 1}
+    weights = lambda ws: [ws[0] * multiplier["post"], ws[1]]
+    scheduler = TaskScheduler(tasks(post=1, reply=1), loop_delay=10, weight_fn=weights)
+    assert scheduler.interval("post") == 20
+    multiplier["post"] = 3
+    assert scheduler.interval("post") == pytest.approx(40 / 3)
+
+
+def test_restore_due_resumes_known_tasks_only(clock):
+    scheduler = TaskScheduler(tasks(post=1, reply=1), loop_delay=10)
+    scheduler.restore_due({"post": 1500.0, "retired": 1200.0})
+    assert scheduler.export_due() == {"post": 1500.0, "reply": 1000.0}
+    task, wait = scheduler.next_task()
+    assert task["name"] == "reply"
+    scheduler.start("reply")
+    task, wait = scheduler.next_task()
+    assert task["name"] == "post"
+    assert wait == 500
+
+
+def test_no_tasks_waits_one_loop(clock):
+    scheduler = TaskScheduler(tasks(idle=0), loop_delay=10)
+    assert scheduler.next_task() == (None, 10)
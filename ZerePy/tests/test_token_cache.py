@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from src.helpers.token_cache import TokenCache
+
+
+def counting_fetch(result):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return fetch, calls
+
+
+def test_resolve_fetches_once_and_ignores_ticker_case(tmp_path):
+    cache = TokenCache(tmp_path / "tokens.db")
+    fetch, calls = counting_fetch("0xabc")
+    assert cache.resolve("sonic", "USDC", fetch) == "0xabc"
+    assert cache.resolve("Sonic", "usdc", fetch) == "0xabc"
+    assert len(calls) == 1
+
+
+def test_entries_survive_a_restart(tmp_path):
+    TokenCache(tmp_path / "tokens.db").set("ethereum", "WETH", "0xweth")
+    fetch, calls = counting_fetch("0xother")
+    assert TokenCache(tmp_path / "tokens.db").resolve("ethereum", "weth", fetch) == "0xweth"
+    assert not calls
+
+
+def test_unknown_tickers_expire_after_negative_ttl(tmp_path):
+    cache = TokenCache(tmp_path / "tokens.db", negative_ttl=0.05)
+    fetch, calls = counting_fetch(None)
+    assert cache.resolve("sonic", "NOPE", fetch) is None
+    assert cache.resolve("sonic", "NOPE", fetch) is None
+    assert len(calls) == 1
+    time.sleep(0.06)
+    cache.resolve("sonic", "NOPE", fetch)
+    assert len(calls) == 2
+
+
+def test_fetch_errors_are_not_cached(tmp_path):
+    cache = TokenCache(tmp_path / "tokens.db")
+    failing, _ = counting_fetch(ConnectionError("rate limited"))
+    with pytest.raises(ConnectionError):
+        cache.resolve("sonic", "USDC", failing)
+    fetch, calls = counting_fetch("0xabc")
+    assert cache.resolve("sonic", "USDC", fetch) == "0xabc"
+    assert len(calls) == 1
+
+
+def test_memory_is_bounded_and_falls_back_to_the_store(tmp_path):
+    cache = TokenCache(tmp_path / "tokens.db", max_entries=2)
+    for ticker in ("A", "B", "C"):
+        cache.set("sonic", ticker, f"0x{ticker}")
+    assert len(cache._memory) == 2
+    assert cache.get("sonic", "A") == "0xA"
+
+
+def test_unopenable_store_falls_back_to_memory(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = TokenCache(blocker / "sub" / "tokens.db")
+    cache.set("sonic", "USDC", "0xabc")
+    assert cache.get("sonic", "usdc") == "0xabc"
@@ -1,9 +1,20 @@
 import os 
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from eth_account import Account
+from hexbytes import HexBytes
 from web3 import Web3
 import requests
 import json
+from nonceManager import gas_oracle, send_transaction, nonce_manager, NONCE_ERRORS, ALREADY_KNOWN_ERRORS, SONIC_BLOCK_TIME
+from contractRegistry import contracts
+from txJobs import tx_jobs, CONFIRMED
+from bridgeState import bridge_state, PENDING, SUBMITTING, SENT, FAILED, UNKNOWN
+from zerepyClient import zerepy_client
+from zerepyLocal import zerepy_local
 
 base_url = "http://localhost:8000"
 
@@ -11,22 +22,26 @@ load_dotenv()
 
 private_key = os.getenv("PRIVATE_KEY")
 
-SEPOLIA_RPC_URL = os.getenv("SEPOLIA_RPC_URL")
-BASE_SEPOLIA_RPC_URL = os.getenv("BASE_SEPOLIA_RPC_URL")
-SONIC_RPC_URL = os.getenv("SONIC_RPC_URL")
-
-sepolia_web3 = Web3(Web3.HTTPProvider(SEPOLIA_RPC_URL))
-base_sepolia_web3 = Web3(Web3.HTTPProvider(BASE_SEPOLIA_RPC_URL))
-w3 = Web3(Web3.HTTPProvider(SONIC_RPC_URL))
-
 account = Account.from_key(private_key)
 contract_address = os.getenv("CONTRACT_ADDRESS")
-with open("../agentonic-contracts/artifacts/contracts/Agentonic.sol/Agentonic.json", "r") as f:
-    contract_abi = json.load(f)["abi"]
-contract = w3.eth.contract(address=contract_address, abi=contract_abi)
+
+# Sepolia broadcasts run here alongside the Sonic payout; resumed bridges are picked up here too
+bridge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bridge")
+BRIDGE_LEGS = ("sepolia", "sonic")
+TX_HASH_PATTERN = re.compile(r"/tx/(?:0x)?([0-9a-fA-F]{64})")
+
+def zerepy_action(connection: str, action: str, params: list):
+    # Blocking ZerePy action call for code running in the threadpool
+    if zerepy_client.in_process and zerepy_local.available():
+        try:
+            return {"status": "success", "result": zerepy_local.perform_action(connection, action, params)}
+        except Exception as e:
+            return {"detail": str(e)}
+    response = requests.post(f"{base_url}/agent/action", json={"connection": connection, "action": action, "params": params})
+    return response.json()
 
 def bridge_eth_to_base(amount: int, address: str):
-    tx = sepolia_web3.eth.send_transaction({
+    tx = contracts.web3("SEPOLIA_RPC_URL").eth.send_transaction({
         "from": account.address,
         "to": address,
         "value": amount
@@ -34,39 +49,165 @@ def bridge_eth_to_base(amount: int, address: str):
     return tx
 
 def bridge_erc20_to_base(amount: int, address: str, token_address: str):
-    tx = base_sepolia_web3.eth.send_transaction({
+    tx = contracts.web3("BASE_SEPOLIA_RPC_URL").eth.send_transaction({
         "from": account.address,
         "to": address,
         "value": amount
     })
     return tx
 
-def bridge_erc20_to_sepolia(amount: int, address: str):
+def bridge_erc20_to_sepolia(amount: int, address: str, on_signed=None):
+    sepolia_web3 = contracts.web3("SEPOLIA_RPC_URL")
     tx = {
-        'nonce': sepolia_web3.eth.get_transaction_count(account.address),
         'to': account.address,  # Self-transfer to simulate bridging
         'value': Web3.to_wei(1, 'ether'),
         'gas': 31000,
-        'gasPrice': sepolia_web3.eth.gas_price,
+        'gasPrice': gas_oracle.gas_price(sepolia_web3),
         'chainId': 11155111,  # Sepolia chain ID
     }
 
-    signed_tx = sepolia_web3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = sepolia_web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-    return tx_hash
-    
-def bridge_sonic_to_sepolia(amount: int, address: str):
-    tx = bridge_erc20_to_sepolia(amount, address)
+    return send_transaction(sepolia_web3, tx, private_key, account.address, on_signed=on_signed)
+
+def _track_leg(bridge_id: str, leg: str, w3: Web3, tx_hash, started_at: float):
+    # Record the leg's confirmation once the receipt watcher has it
+    def on_done(job):
+        bridge_state.update_leg(
+            bridge_id, leg,
+            status=CONFIRMED if job["status"] == CONFIRMED else FAILED,
+            block_number=job["block_number"],
+            error=job["error"],
+            confirm_latency=round(time.time() - started_at, 3),
+        )
+    tx_jobs.submit(w3, tx_hash, f"bridge_{leg}", on_done=on_done, bridge_id=bridge_id)
+
+def _sent(bridge_id: str, leg: str, w3: Web3, tx_hash, started_at: float):
+    bridge_state.update_leg(bridge_id, leg, status=SENT, tx_hash=tx_hash.hex(), submit_latency=round(time.time() - started_at, 3))
+    _track_leg(bridge_id, leg, w3, tx_hash, started_at)
+
+def _sepolia_leg(bridge_id: str, amount, address: str, signed: threading.Event = None):
+    started_at = time.time()
+    bridge_state.update_leg(bridge_id, "sepolia", status=SUBMITTING, started_at=started_at)
+    persisted = []
+    # The signed transaction is persisted before broadcast, so resuming can rebroadcast the same one
+    def on_signed(signed_tx):
+        bridge_state.update_leg(bridge_id, "sepolia", raw_tx=signed_tx.raw_transaction.hex(), tx_hash=signed_tx.hash.hex())
+        persisted.append(signed_tx.hash)
+        if signed is not None:
+            signed.set()
+    try:
+        tx = bridge_erc20_to_sepolia(amount, address, on_signed=on_signed)
+    except Exception as e:
+        # Once signed the broadcast may have reached the node anyway; the persisted
+        # transaction is rebroadcast to reconcile rather than the leg declared failed
+        status = UNKNOWN if persisted else FAILED
+        bridge_state.update_leg(bridge_id, "sepolia", status=status, error=str(e))
+        raise
     print(f"Transaction sent on Sepolia: {tx.hex()}")
-    txh_url = f"https://sepolia.etherscan.io/tx/0x{tx.hex()}"
-    data = requests.post(f"{base_url}/agent/action", json={"connection": "sonic", "action": "transfer", "params": [address, str(amount)]})
-    data = data.json()
+    _sent(bridge_id, "sepolia", contracts.web3("SEPOLIA_RPC_URL"), tx, started_at)
+    return tx
+
+def _sonic_leg(bridge_id: str, amount, address: str):
+    started_at = time.time()
+    bridge_state.update_leg(bridge_id, "sonic", status=SUBMITTING, started_at=started_at)
+    data = zerepy_action("sonic", "transfer", [address, str(amount)])
     print(data)
-    data.update({"tx_url": txh_url})
+    match = TX_HASH_PATTERN.search(str(data.get("result", "")))
+    if data.get("status") != "success" or not match:
+        bridge_state.update_leg(bridge_id, "sonic", status=FAILED, error=data.get("detail") or str(data.get("result")))
+        return data
+    _sent(bridge_id, "sonic", contracts.web3("SONIC_RPC_URL"), HexBytes(match.group(1)), started_at)
     return data
+
+def _leg_statuses(bridge_id: str) -> dict:
+    return {leg: state["status"] for leg, state in bridge_state.get(bridge_id)["legs"].items()}
+
+def _skip_payout(bridge_id: str, reason):
+    # The Sonic transfer pays the user out; it is never sent unless the Sepolia leg was broadcast
+    bridge_state.update_leg(bridge_id, "sonic", status=FAILED, error=f"Not sent, Sepolia leg failed: {reason}")
+
+def bridge_sonic_to_sepolia(amount: int, address: str):
+    bridge = bridge_state.create(amount, address, BRIDGE_LEGS)
+    signed = threading.Event()
+    sepolia = bridge_executor.submit(_sepolia_leg, bridge["id"], amount, address, signed)
+    sepolia.add_done_callback(lambda _: signed.set())
+    # The payout is only sent once the Sepolia transaction is signed and persisted, and
+    # then goes out while it is being broadcast
+    signed.wait()
+    sepolia_state = bridge_state.get(bridge["id"])["legs"]["sepolia"]
+    if not sepolia_state.get("raw_tx"):
+        error = sepolia.exception()
+        _skip_payout(bridge["id"], error)
+        return {"status": "error", "detail": str(error), "bridge_id": bridge["id"], "legs": _leg_statuses(bridge["id"])}
+
+    # Only broadcast is awaited here; both receipts are tracked in the background
+    data = _sonic_leg(bridge["id"], amount, address)
+    try:
+        sepolia.result()
+    except Exception as e:
+        data["sepolia_error"] = str(e)
+    sepolia_state = bridge_state.get(bridge["id"])["legs"]["sepolia"]
+    txh_url = f"https://sepolia.etherscan.io/tx/0x{sepolia_state['tx_hash'].removeprefix('0x')}"
+    data.update({"tx_url": txh_url, "bridge_id": bridge["id"], "legs": _leg_statuses(bridge["id"])})
+    return data
+
+def _resume_sepolia_leg(bridge_id: str, state: dict):
+    sepolia_web3 = contracts.web3("SEPOLIA_RPC_URL")
+    if not state.get("raw_tx"):
+        # Interrupted before signing, nothing was broadcast
+        return _sepolia_leg(bridge_id, *_bridge_args(bridge_id))
+    started_at = state.get("started_at", time.time())
+    tx_hash = HexBytes(state["tx_hash"])
+    try:
+        sepolia_web3.eth.send_raw_transaction(HexBytes(state["raw_tx"]))
+    except Exception as e:
+        # Already in the mempool or mined; anything else means it was never accepted
+        if not any(err in str(e).lower() for err in NONCE_ERRORS + ALREADY_KNOWN_ERRORS):
+            bridge_state.update_leg(bridge_id, "sepolia", status=FAILED, error=str(e))
+            return
+    nonce_manager.resync(sepolia_web3, account.address)
+    _sent(bridge_id, "sepolia", sepolia_web3, tx_hash, started_at)
+
+def _resume_sonic_leg(bridge_id: str, state: dict):
+    if state["status"] == PENDING:
+        return _sonic_leg(bridge_id, *_bridge_args(bridge_id))
+    # The transfer goes through ZerePy, which may have broadcast it before the crash; never send it twice
+    bridge_state.update_leg(bridge_id, "sonic", status=UNKNOWN, error="Interrupted while submitting")
+
+def _bridge_args(bridge_id: str):
+    bridge = bridge_state.get(bridge_id)
+    return bridge["amount"], bridge["address"]
+
+def _resume_bridge(bridge: dict):
+    bridge_id = bridge["id"]
+    sepolia, sonic = bridge["legs"]["sepolia"], bridge["legs"]["sonic"]
+    # UNKNOWN with a signed transaction: the broadcast failed after the payout went out
+    if sepolia["status"] in (PENDING, SUBMITTING) or (sepolia["status"] == UNKNOWN and sepolia.get("raw_tx")):
+        try:
+            _resume_sepolia_leg(bridge_id, sepolia)
+        except Exception as e:
+            print(f"Resuming Sepolia leg of bridge {bridge_id} failed: {e}")
+    if sonic["status"] == SUBMITTING:
+        _resume_sonic_leg(bridge_id, sonic)
+    elif sonic["status"] == PENDING:
+        sepolia_state = bridge_state.get(bridge_id)["legs"]["sepolia"]
+        if sepolia_state["status"] in (SENT, CONFIRMED):
+            _resume_sonic_leg(bridge_id, sonic)
+        else:
+            _skip_payout(bridge_id, sepolia_state.get("error") or sepolia_state["status"])
+
+def resume_bridges():
+    """Pick up bridges left half-finished by a crash or restart"""
+    for bridge in bridge_state.unfinished():
+        for leg, state in bridge["legs"].items():
+            if state["status"] == SENT:
+                w3 = contracts.web3("SEPOLIA_RPC_URL" if leg == "sepolia" else "SONIC_RPC_URL")
+                _track_leg(bridge["id"], leg, w3, HexBytes(state["tx_hash"]), state.get("started_at", time.time()))
+        bridge_executor.submit(_resume_bridge, bridge)
+        print(f"Resuming bridge {bridge['id']}")
     
 def mint_sbt(uri: str, walletAddress: str):
-    nonce = w3.eth.get_transaction_count(account.address)
+    w3 = contracts.web3("SONIC_RPC_URL")
+    contract = contracts.contract("Agentonic", w3, contract_address)
     estimated_gas = contract.functions.safeMint(1, uri, uri, walletAddress).estimate_gas({
             "from": account.address
     })
@@ -79,18 +220,14 @@ def mint_sbt(uri: str, walletAddress: str):
     tx = contract.functions.safeMint(1, uri, uri, walletAddress).build_transaction({
             "from": account.address,
             "gas": gas_limit,  # Adjust gas based on network
-            "gasPrice": w3.eth.gas_price,
-            "nonce": nonce,
+            "gasPrice": gas_oracle.gas_price(w3, block_time=SONIC_BLOCK_TIME),
     })
 
-    # Sign and Send Transaction
-    signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    # Sign and Send Transaction, the receipt is recorded by the job watcher
+    tx_hash = send_transaction(w3, tx, private_key, account.address)
         
     print(f"Mint transaction sent! Tx Hash: {tx_hash.hex()}")
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-    print(f"Transaction confirmed in block {receipt.blockNumber}")
-    return tx_hash.hex()
+    return tx_jobs.submit(w3, tx_hash, "mint_sbt", to=walletAddress)
 
 
 
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+BRIDGE_STATE_PATH = os.getenv("BRIDGE_STATE_PATH", str(Path(__file__).resolve().parent / "bridge_state.json"))
+
+# Leg statuses, in order
+PENDING = "pending"          # not started
+SUBMITTING = "submitting"    # started, may or may not have been broadcast
+SENT = "sent"                # broadcast, waiting for the receipt
+CONFIRMED = "confirmed"
+FAILED = "failed"
+UNKNOWN = "unknown"          # interrupted while submitting, or signed but the broadcast failed; needs reconciling
+
+FINISHED = (CONFIRMED, FAILED, UNKNOWN)
+
+
+class BridgeStateStore:
+    """
+    Progress of every bridge and each of its legs, written to a JSON file on every change.
+
+    The file is replaced atomically so a crash leaves either the old or the new state. Finished
+    bridges beyond max_finished are dropped, oldest first.
+    """
+
+    def __init__(self, path: str = BRIDGE_STATE_PATH, max_finished: int = 200):
+        self.path = path
+        self.max_finished = max_finished
+        self._lock = threading.Lock()
+        self._bridges = self._load()
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read bridge state {self.path}: {str(e)}")
+            return {}
+
+    def _save(self):
+        finished = [b for b in self._bridges.values() if b["status"] in FINISHED]
+        for bridge in sorted(finished, key=lambda b: b["created_at"])[:max(len(finished) - self.max_finished, 0)]:
+            del self._bridges[bridge["id"]]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._bridges, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def create(self, amount, address: str, legs) -> dict:
+        now = time.time()
+        bridge = {
+            "id": uuid.uuid4().hex,
+            "amount": amount,
+            "address": address,
+            "status": PENDING,
+            "created_at": now,
+            "legs": {leg: {"status": PENDING} for leg in legs},
+        }
+        with self._lock:
+            self._bridges[bridge["id"]] = bridge
+            self._save()
+        return json.loads(json.dumps(bridge))
+
+    def get(self, bridge_id: str):
+        with self._lock:
+            bridge = self._bridges.get(bridge_id)
+            return json.loads(json.dumps(bridge)) if bridge else None
+
+    def unfinished(self) -> list:
+        with self._lock:
+            return [json.loads(json.dumps(b)) for b in self._bridges.values() if b["status"] not in FINISHED]
+
+    def update_leg(self, bridge_id: str, leg: str, **fields) -> dict:
+        with self._lock:
+            bridge = self._bridges[bridge_id]
+            bridge["legs"][leg].update(fields)
+            statuses = [l["status"] for l in bridge["legs"].values()]
+            if all(s == CONFIRMED for s in statuses):
+                bridge["status"] = CONFIRMED
+            elif all(s in FINISHED for s in statuses):
+                bridge["status"] = FAILED if FAILED in statuses else UNKNOWN
+            elif all(s in FINISHED or s == SENT for s in statuses):
+                bridge["status"] = SENT
+            else:
+                bridge["status"] = SUBMITTING
+            self._save()
+            return json.loads(json.dumps(bridge))
+
+
+bridge_state = BridgeStateStore()
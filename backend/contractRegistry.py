@@ -0,0 +1,68 @@
+import json
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+
+ARTIFACTS_PATH = "../agentonic-contracts/artifacts/contracts"
+
+# Contract name -> artifact path relative to ARTIFACTS_PATH
+ARTIFACTS = {
+    "Agentonic": "Agentonic.sol/Agentonic.json",
+    "AgentonicLaunchpad": "AgentonicLaunchpad.sol/AgentonicLauchpad.json",
+}
+
+
+class ContractRegistry:
+    """
+    Web3 providers and contract artifacts, created on first use and shared for the life of the process.
+
+    Each RPC URL gets one Web3 client on a pooled keep-alive session. Artifacts are read and parsed
+    once, and Contract objects are kept per (contract, RPC URL, address).
+    """
+
+    def __init__(self, artifacts_path: str = ARTIFACTS_PATH, pool_size: int = 20):
+        self.artifacts_path = artifacts_path
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._providers = {}
+        self._artifacts = {}
+        self._contracts = {}
+
+    def web3(self, rpc_env: str) -> Web3:
+        """Web3 client for the RPC URL in the given environment variable"""
+        rpc_url = os.getenv(rpc_env)
+        with self._lock:
+            if rpc_url not in self._providers:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._providers[rpc_url] = Web3(Web3.HTTPProvider(rpc_url, session=session))
+            return self._providers[rpc_url]
+
+    def artifact(self, name: str) -> dict:
+        """Parsed artifact with its abi and bytecode"""
+        with self._lock:
+            if name not in self._artifacts:
+                with open(os.path.join(self.artifacts_path, ARTIFACTS[name]), "r") as f:
+                    artifact = json.load(f)
+                self._artifacts[name] = {"abi": artifact["abi"], "bytecode": artifact.get("bytecode")}
+            return self._artifacts[name]
+
+    def contract(self, name: str, w3: Web3, address: str = None):
+        """Contract object at an address, or the deployable contract factory without one"""
+        key = (name, w3.provider.endpoint_uri, address)
+        if key not in self._contracts:
+            artifact = self.artifact(name)
+            if address is None:
+                contract = w3.eth.contract(abi=artifact["abi"], bytecode=artifact["bytecode"])
+            else:
+                contract = w3.eth.contract(address=address, abi=artifact["abi"])
+            with self._lock:
+                self._contracts.setdefault(key, contract)
+        return self._contracts[key]
+
+
+contracts = ContractRegistry()
@@ -1,248 +1,135 @@
+import asyncio
+import json
 import cohere
 from dotenv import load_dotenv
 import os 
+from intentCache import IntentCache
+from promptRegistry import prompts
 
 load_dotenv()
 
 api_key = os.environ.get("COHERE_API_KEY")
 
-co = cohere.ClientV2(api_key=api_key)
+co = cohere.AsyncClientV2(api_key=api_key)
+
+# Upper bound on concurrent Cohere requests from this process
+COHERE_MAX_CONCURRENCY = int(os.environ.get("COHERE_MAX_CONCURRENCY", 8))
+_semaphore = None
+# Identical requests currently waiting on Cohere, keyed by model + messages
+_inflight = {}
+
+def _cohere_slots() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(COHERE_MAX_CONCURRENCY)
+    return _semaphore
+
+async def _cohere_chat(model: str, messages: list, **kwargs) -> str:
+    async with _cohere_slots():
+        res = await co.chat(model=model, messages=messages, **kwargs)
+    return res.message.content[0].text
+
+async def cohere_chat(model: str, messages: list, **kwargs) -> str:
+    """Chat with Cohere on the async client; identical in-flight requests share one upstream call"""
+    key = json.dumps([model, messages, kwargs], sort_keys=True)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_cohere_chat(model, messages, **kwargs))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield the shared call so one caller disconnecting does not cancel it for the others
+    return await asyncio.shield(task)
+
+async def embed_text(text: str) -> list:
+    async with _cohere_slots():
+        res = await co.embed(
+            model="embed-english-light-v3.0",
+            texts=[text],
+            input_type="classification",
+            embedding_types=["float"]
+        )
+    return res.embeddings.float_[0]
+
+async def count_tokens(text: str) -> int:
+    res = await co.tokenize(text=text, model="command-r-plus-08-2024")
+    return len(res.tokens)
+
+# Routing caches for the intent classification calls behind /chat and /launchpadChat
+sonic_intent_cache = IntentCache("chat", embed=embed_text)
+launchpad_intent_cache = IntentCache("launchpadChat", embed=embed_text)
+
+# Agent fields that are always copied verbatim from ExampleAgent.json; they are merged into the
+# model output instead of being sent to the model and echoed back on every request
+AGENT_STATIC_FIELDS = {
+    "example_accounts": ["0xzerebro"],
+    "loop_delay": 900,
+    "config": [
+        {"name": "twitter", "timeline_read_count": 10, "own_tweet_replies_count": 2, "tweet_interval": 5400},
+        {"name": "farcaster", "timeline_read_count": 10, "cast_interval": 60},
+        {"name": "openai", "model": "gpt-3.5-turbo"},
+        {"name": "anthropic", "model": "claude-3-5-sonnet-20241022"},
+        {"name": "xai", "model": "grok-2-latest"},
+        {"name": "together", "model": "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo"},
+        {"name": "solana", "rpc": "https://api.mainnet-beta.solana.com"},
+        {"name": "ethereum", "rpc": "https://eth.blockrazor.xyz"},
+        {"name": "sonic", "network": "testnet"},
+        {"name": "eternalai", "model": "NousResearch/Hermes-3-Llama-3.1-70B-FP8", "chain_id": "45762"},
+        {"name": "ollama", "base_url": "http://localhost:11434", "model": "llama3.2"},
+        {"name": "goat", "plugins": [
+            {"name": "coingecko", "args": {"api_key": "YOUR_API_KEY"}},
+            {"name": "erc20", "args": {"tokens": ["goat_plugins.erc20.token.PEPE", "goat_plugins.erc20.token.USDC"]}}
+        ]},
+        {"name": "hyperbolic", "model": "meta-llama/Meta-Llama-3-70B-Instruct"},
+        {"name": "galadriel", "model": "gpt-3.5-turbo"},
+        {"name": "allora", "chain_slug": "testnet"},
+        {"name": "groq", "model": "llama-3.3-70b-versatile", "temperature": 0.5}
+    ],
+    "use_time_based_weights": False,
+    "time_based_multipliers": {
+        "tweet_night_multiplier": 0.4,
+        "engagement_day_multiplier": 1.5
+    }
+}
+
+# The part of ExampleAgent.json the model actually fills in
+AGENT_PERSONA_EXAMPLE = {
+    "name": "ExampleAgent",
+    "bio": [
+        "You are ExampleAgent, the example agent created to showcase the capabilities of ZerePy.",
+        "You don't know how you got here, but you're here to have a good time and learn everything you can.",
+        "You are naturally curious, and ask a lot of questions."
+    ],
+    "traits": ["Curious", "Creative", "Innovative", "Funny"],
+    "examples": ["This is an example tweet.", "This is another example tweet."],
+    "tasks": [
+        {"name": "post-tweet", "weight": 1},
+        {"name": "reply-to-tweet", "weight": 1},
+        {"name": "like-tweet", "weight": 1}
+    ]
+}
+
+@prompts.register("create_agent")
+def create_agent_prompt():
+    return f"""Context: You are an expert in creating agents. 
+    Instructions: 
+    - Generate a JSON response for a user query about creating agents.
+    - Within the prompt, you can find the intent of the user to create an agent and slot fill the JSON structure accordingly based on the prompt and intent
+    - Only fill the name, bio, traits, examples and tasks fields. Tasks can only be post-tweet, reply-to-tweet and like-tweet with a weight
+    - Don't give 'None' or 'N/A' as a response for anything, if you don't have the data, just search the internet and give the latest data for it and don't ever give `None` as a response for any field
+    - Only give the JSON response, don't give any other text or explanation
+
+    Required JSON Structure for reference, this is an ExampleAgent.json (You can use this as a reference to create the agent):
+    {json.dumps(AGENT_PERSONA_EXAMPLE)}
+    """
 
 async def create_agent(prompt: str):
     try:
-        res = co.chat(
+        response = await cohere_chat(
             model="command-r-plus-08-2024",
             messages=[
                 {
                     "role": "system",
-                    "content": """Context: You are an expert in creating agents. 
-                    Instructions: 
-                    - Generate a JSON response for a user query about creating agents.
-                    - Analyze the user's query about creating agents
-                    - Provide a comprehensive, step-by-step response
-                    - Include protocol recommendations, potential benefits, and risks
-                    - Don't give 'None' or 'N/A' as a response for anything, if you don't have the data, just search the internet and give the latest data for it and don't ever give `None` as a response for any field
-                    - Only give the JSON response, don't give any other text or explanation
-                    - Within the prompt, you can find the intent of the user to create an agent and slot fill the JSON structure accordingly based on the prompt and intent
-                    - Only change the name, description, bio, traits, examples, and actions to be either from these : "- get_address: Get the address of the wallet
-                    - Please keep the config values as given in the ExampleAgent.json JSON response, only change the values that are required to be changed  and follow the Important Note / Instruction given below
-
-                    Important Note / Instruction :
-                    - Do not change the config values, it should stay the same as the ExampleAgent.json JSON response given below
-                    - Do not change `loop_delay` value, it should stay the same as the ExampleAgent.json JSON response given below
-                    - Do not change `time_based_multipliers` values, it should stay the same as the ExampleAgent.json JSON response given below
-                    - The JSON response should always contain this `
-                    "example_accounts": ["0xzerebro"],
-                    "loop_delay": 900,
-                    "config": [
-                        {
-                        "name": "twitter",
-                        "timeline_read_count": 10,
-                        "own_tweet_replies_count": 2,
-                        "tweet_interval": 5400
-                        },
-                        {
-                        "name": "farcaster",
-                        "timeline_read_count": 10,
-                        "cast_interval": 60
-                        },
-                        {
-                        "name": "openai",
-                        "model": "gpt-3.5-turbo"
-                        },
-                        {
-                        "name": "anthropic",
-                        "model": "claude-3-5-sonnet-20241022"
-                        },
-                        {
-                        "name": "xai",
-                        "model": "grok-2-latest"
-                        },
-                        {
-                        "name": "together",
-                        "model": "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo"
-                        },
-                        {
-                        "name": "solana",
-                        "rpc": "https://api.mainnet-beta.solana.com"
-                        },
-                        {
-                        "name": "ethereum",
-                        "rpc": "https://eth.blockrazor.xyz"
-                        },
-                        {
-                        "name": "sonic",
-                        "network": "tesnet"
-                        },
-                        {
-                        "name": "eternalai",
-                        "model": "NousResearch/Hermes-3-Llama-3.1-70B-FP8",
-                        "chain_id": "45762"
-                        },
-                        {
-                        "name": "ollama",
-                        "base_url": "http://localhost:11434",
-                        "model": "llama3.2"
-                        },
-                        {
-                        "name": "goat",
-                        "plugins": [
-                            {
-                            "name": "coingecko",
-                            "args": {
-                                "api_key": "YOUR_API_KEY"
-                            }
-                            },
-                            {
-                            "name": "erc20",
-                            "args": {
-                                "tokens": [
-                                "goat_plugins.erc20.token.PEPE",
-                                "goat_plugins.erc20.token.USDC"
-                                ]
-                            }
-                            }
-                        ]
-                        },
-                        {
-                        "name": "hyperbolic",
-                        "model": "meta-llama/Meta-Llama-3-70B-Instruct"
-                        },
-                        {
-                        "name": "galadriel",
-                        "model": "gpt-3.5-turbo"
-                        },
-                        {
-                        "name": "allora",
-                        "chain_slug": "testnet"
-                        },
-                        {
-                        "name": "groq",
-                        "model": "llama-3.3-70b-versatile",
-                        "temperature": 0.5
-                        }
-                    ],
-                    
-                    "use_time_based_weights": false,
-                    "time_based_multipliers": {
-                        "tweet_night_multiplier": 0.4,
-                        "engagement_day_multiplier": 1.5
-                    }`
-                    - No values should be changed in the `config` array
-
-                    
-                    Required JSON Structure for reference, this is an ExampleAgent.json (You can use this as a reference to create the agent):
-                    {
-                    "name": "ExampleAgent",
-                    "bio": [
-                        "You are ExampleAgent, the example agent created to showcase the capabilities of ZerePy.",
-                        "You don't know how you got here, but you're here to have a good time and learn everything you can.",
-                        "You are naturally curious, and ask a lot of questions."
-                    ],
-                    "traits": ["Curious", "Creative", "Innovative", "Funny"],
-                    "examples": ["This is an example tweet.", "This is another example tweet."],
-                    "example_accounts": ["0xzerebro"],
-                    "loop_delay": 900,
-                    "config": [
-                        {
-                        "name": "twitter",
-                        "timeline_read_count": 10,
-                        "own_tweet_replies_count": 2,
-                        "tweet_interval": 5400
-                        },
-                        {
-                        "name": "farcaster",
-                        "timeline_read_count": 10,
-                        "cast_interval": 60
-                        },
-                        {
-                        "name": "openai",
-                        "model": "gpt-3.5-turbo"
-                        },
-                        {
-                        "name": "anthropic",
-                        "model": "claude-3-5-sonnet-20241022"
-                        },
-                        {
-                        "name": "xai",
-                        "model": "grok-2-latest"
-                        },
-                        {
-                        "name": "together",
-                        "model": "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo"
-                        },
-                        {
-                        "name": "solana",
-                        "rpc": "https://api.mainnet-beta.solana.com"
-                        },
-                        {
-                        "name": "ethereum",
-                        "rpc": "https://eth.blockrazor.xyz"
-                        },
-                        {
-                        "name": "sonic",
-                        "network": "testnet"
-                        },
-                        {
-                        "name": "eternalai",
-                        "model": "NousResearch/Hermes-3-Llama-3.1-70B-FP8",
-                        "chain_id": "45762"
-                        },
-                        {
-                        "name": "ollama",
-                        "base_url": "http://localhost:11434",
-                        "model": "llama3.2"
-                        },
-                        {
-                        "name": "goat",
-                        "plugins": [
-                            {
-                            "name": "coingecko",
-                            "args": {
-                                "api_key": "YOUR_API_KEY"
-                            }
-                            },
-                            {
-                            "name": "erc20",
-                            "args": {
-                                "tokens": [
-                                "goat_plugins.erc20.token.PEPE",
-                                "goat_plugins.erc20.token.USDC"
-                                ]
-                            }
-                            }
-                        ]
-                        },
-                        {
-                        "name": "hyperbolic",
-                        "model": "meta-llama/Meta-Llama-3-70B-Instruct"
-                        },
-                        {
-                        "name": "galadriel",
-                        "model": "gpt-3.5-turbo"
-                        },
-                        {
-                        "name": "allora",
-                        "chain_slug": "testnet"
-                        },
-                        {
-                        "name": "groq",
-                        "model": "llama-3.3-70b-versatile",
-                        "temperature": 0.5
-                        }
-                    ],
-                    "tasks": [
-                        { "name": "post-tweet", "weight": 1 },
-                        { "name": "reply-to-tweet", "weight": 1 },
-                        { "name": "like-tweet", "weight": 1 }
-                    ],
-                    "use_time_based_weights": false,
-                    "time_based_multipliers": {
-                        "tweet_night_multiplier": 0.4,
-                        "engagement_day_multiplier": 1.5
-                    }
-                }
-                """
+                    "content": prompts.get("create_agent")
                 },
                 {
                     "role": "user",
@@ -251,8 +138,13 @@ async def create_agent(prompt: str):
             ],
             response_format={"type": "json_object"}
         )
+        try:
+            agent = json.loads(response)
+        except ValueError:
+            return response
+        agent.update(AGENT_STATIC_FIELDS)
+        return json.dumps(agent, indent=4)
         
-        return res.message.content[0].text
     except Exception as e:
         return f"Error generating response: {str(e)}"
     
@@ -263,29 +155,32 @@ async def handle_prompt(prompt: str):
     else:
         return await create_agent(prompt)
     
+SONIC_ACTIONS = ['get-balance', 'transfer', 'bridge', 'analyze', 'question']
+
+@prompts.register("sonic_actions")
+def sonic_actions_prompt():
+    actions = SONIC_ACTIONS
+    return f"""Context: You are an expert in finding the right action to perform based on the user's query along with all the parameters and values for the action. 
+    Instructions: 
+    - Analyze the user's query and find the right action to perform from this list of actions : {list(actions)}
+    - It may happen that "bridge", "swap", "transfer" could be in the prompt but the user is asking it as a question so you should not consider it as an action
+    - Don't give 'None' or 'N/A' as a response for anything
+    - The `parameters` attribute in the json response should be like these examples for each action :
+    - get-balance : ["0x1234567890123456789012345678901234567890"] (address for the balance)
+    - transfer : ["0x1234567890123456789012345678901234567890", "1"] (address and amount to transfer)
+    - bridge : ["sonic", "ethereum", "1", "0x1234567890123456789012345678901234567890"] (source network, destination network, input amount to bridge and address)
+    - analyze : []
+    - question : [] (the query is not one of the listed actions and is just a normal question)
+    """
+
 async def get_sonic_actions(prompt: str):
-    actions = ['get-balance', 'transfer', 'bridge', 'analyze', 'question']
     try:
-        res = co.chat(
+        return await sonic_intent_cache.resolve(prompt, lambda: cohere_chat(
             model="command-r-plus-08-2024",
             messages=[
                 {
                     "role": "system",
-                    "content": f"""Context: You are an expert in finding the right action to perform based on the user's query along with all the parameters and values for the action. 
-                    Instructions: 
-                    - Analyze the user's query and find the right action to perform from this list of actions : {list(actions)}
-                    - It may happen that "bridge", "swap", "transfer" could be in the prompt but the user is asking it as a question so you should not consider it as an action
-                    - Find the right action to perform based on the user's query
-                    - Provide a comprehensive, step-by-step response
-                    - Include protocol recommendations, potential benefits, and risks
-                    - Don't give 'None' or 'N/A' as a response for anything, if you don't have the data, just search the internet and give the latest data for it and don't ever give `None` as a response for any field.
-                    - The `parameters` attribute in the json response should be like this example : ["0x1234567890123456789012345678901234567890"] (address for the balance) or ["0x1234567890123456789012345678901234567890", "1"] (address and amount to transfer) or ["0x1234567890123456789012345678901234567890", "0x1234567890123456789012345678901234567890", 1, 1] (input token address, output token address, amount to swap and slippage percentage), ["sonic", "ethereum", "1", "0x1234567890123456789012345678901234567890"] (source network, destination network, input amount to bridge and address), for other actions, the parameters should be like this example : [], for analyze-defi, the parameters should be like this example : []
-                    - For action : get-balance, the parameters should be like this example : ["0x1234567890123456789012345678901234567890"]
-                    - For action : transfer, the parameters should be like this example : ["0x1234567890123456789012345678901234567890", "1"]
-                    - For action : bridge, the parameters should be like this example : ["sonic", "ethereum", "1", "0x1234567890123456789012345678901234567890"]
-                    - For action : analyze, the parameters should be like this example : []
-                    - For action : question, the parameters should be like this example : [] # This means that the action is not listed in the actions list and is just a normal question
-                    """
+                    "content": prompts.get("sonic_actions")
                 },
                 {
                     "role": "user",
@@ -302,8 +197,7 @@ async def get_sonic_actions(prompt: str):
                                 "required": ["action", "parameters"]
                              }
                              }
-        )
-        return res.message.content[0].text
+        ))
     except Exception as e:
         return f"Error generating response: {str(e)}"
     
@@ -342,14 +236,16 @@ DefiAnalysisSystemPrompt = """Context: You are an expert DeFi Optimizer.
                         "alternative_protocols": ["string"]
                     }
                 """
+prompts.register("defi_analysis")(lambda: DefiAnalysisSystemPrompt)
+
 async def defi_analysis(prompt: str):
     try:
-        res = co.chat(
+        return await cohere_chat(
             model="command-r-plus-08-2024",
             messages=[
                 {
                     "role": "system",
-                    "content": DefiAnalysisSystemPrompt 
+                    "content": prompts.get("defi_analysis")
                 },
                 {
                     "role": "user",
@@ -358,34 +254,37 @@ async def defi_analysis(prompt: str):
             ],  
             response_format={"type": "json_object"}
         )
-        return res.message.content[0].text
     except Exception as e:
         return f"Error generating response: {str(e)}"
     
-def intent_detection_and_slot_filling(prompt: str):
+@prompts.register("launchpad_intent")
+def launchpad_intent_prompt():
+    return """Context: You are an expert in detecting the intent of the user and slot filling the JSON structure accordingly.
+    Instructions: 
+    - Analyze the user's query and find the slot filling the JSON structure accordingly
+    - Slot fill the JSON structure accordingly
+    - If you can't detect token name, that is the `name` field then create a random name for the token
+    - If you can't detect token symbol, that is the `symbol` field then create a random symbol for the token. For example for token Name : "Agentonic" the symbol can be "AGT"
+    - If you can't detect token initial supply, that is the `initialSupply` field then the default value for initial supply is 1000000
+    - If you can't detect token max supply, that is the `maxSupply` field then the default value for max supply is 10000000
+    Required JSON Structure:
+    {
+        "name": "string", # name of the token
+        "symbol": "string", # symbol of the token
+        "initialSupply": "integer", # initial supply of the token
+        "maxSupply": "integer", # max supply of the token,
+        "owner": "string" # owner of the token
+    }
+    """
+
+async def intent_detection_and_slot_filling(prompt: str):
     try:
-        res = co.chat(
+        return await launchpad_intent_cache.resolve(prompt, lambda: cohere_chat(
             model="command-r-plus-08-2024",
             messages=[
                 {
                     "role": "system",
-                    "content": """Context: You are an expert in detecting the intent of the user and slot filling the JSON structure accordingly.
-                    Instructions: 
-                    - Analyze the user's query and find the slot filling the JSON structure accordingly
-                    - Slot fill the JSON structure accordingly
-                    - If you can't detect token name, that is the `name` field then create a random name for the token
-                    - If you can't detect token symbol, that is the `symbol` field then create a random symbol for the token. For example for token Name : "Agentonic" the symbol can be "AGT"
-                    - If you can't detect token initial supply, that is the `initialSupply` field then the default value for initial supply is 1000000
-                    - If you can't detect token max supply, that is the `maxSupply` field then the default value for max supply is 10000000
-                    Required JSON Structure:
-                    {
-                        "name": "string", # name of the token
-                        "symbol": "string", # symbol of the token
-                        "initialSupply": "integer", # initial supply of the token
-                        "maxSupply": "integer", # max supply of the token,
-                        "owner": "string" # owner of the token
-                    }
-                    """         
+                    "content": prompts.get("launchpad_intent")
                 },
                 {
                     "role": "user",
@@ -405,29 +304,32 @@ def intent_detection_and_slot_filling(prompt: str):
                                 "required": ["name", "symbol", "initialSupply", "maxSupply", "owner"]
                              }
                         }
-        )
-        return res.message.content[0].text
+        ))
     except Exception as e:
         return f"Error generating response: {str(e)}"
     
-def sentiment_analysis(prompt: str, tweets: list):
+# The tweets go in the user turn so the system prompt stays a static, cacheable prefix
+@prompts.register("sentiment_analysis")
+def sentiment_analysis_prompt():
+    return """Context: You are an expert in sentiment analysis.
+    Instructions: 
+    - Analyze the user's query and find the sentiment of the user
+    - Analyze the tweets and find the sentiment of the user
+    - Return false if the sentiment is very negative and for all other cases return true
+    """
+
+async def sentiment_analysis(prompt: str, tweets: list):
     try:
-        res = co.chat(
+        return await cohere_chat(
             model="command-r-plus-08-2024",
             messages=[
                 {
                     "role": "system",
-                    "content": f"""Context: You are an expert in sentiment analysis.
-                    Instructions: 
-                    - Analyze the user's query and find the sentiment of the user
-                    - Analyze the tweets and find the sentiment of the user
-                    - Return false if the sentiment is very negative and for all other cases return true
-                    The tweets are : {list(tweets)}
-                    """
+                    "content": prompts.get("sentiment_analysis")
                 },
                 {
                     "role": "user",
-                    "content": prompt
+                    "content": f"The tweets are : {list(tweets)}\n\n{prompt}"
                 }
             ],
             response_format={"type": "json_object",
@@ -440,30 +342,45 @@ def sentiment_analysis(prompt: str, tweets: list):
                              }
                     }
         )
-        return res.message.content[0].text
     except Exception as e:
         return f"Error generating response: {str(e)}"
     
 
+@prompts.register("normal_query")
+def normal_query_prompt():
+    return """Context: You are an expert in Defi protocols and DWF Labs Liquidity Market.
+    Instructions: 
+    - Analyze the user's query and give the latest, accurate and best response
+    - Always give short to medium, subtle and to the point answers 
+    """
+
+def _normal_query_messages(prompt: str):
+    return [
+        {
+            "role": "system",
+            "content": prompts.get("normal_query")
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
 async def normal_query(prompt: str):
     try:
-        res = co.chat(
+        return await cohere_chat(
             model="command-r-plus-08-2024",
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"""Context: You are an expert in Defi protocols and DWF Labs Liquidity Market.
-                    Instructions: 
-                    - Analyze the user's query and give the latest, accurate and best response
-                    - Always give short to medium, subtle and to the point answers 
-                    """
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
+            messages=_normal_query_messages(prompt)
         )
-        return res.message.content[0].text
     except Exception as e:
         return f"Error generating response: {str(e)}"
+
+async def normal_query_stream(prompt: str):
+    """Yield the answer to a general query as text chunks while Cohere generates it"""
+    async with _cohere_slots():
+        async for event in co.chat_stream(
+            model="command-r-plus-08-2024",
+            messages=_normal_query_messages(prompt)
+        ):
+            if event.type == "content-delta":
+                yield event.delta.message.content.text
@@ -0,0 +1,92 @@
+import os
+import threading
+from dotenv import dotenv_values
+
+ZEREPY_ENV_PATH = "../ZerePy/.env"
+
+
+def format_line(key: str, value: str) -> str:
+    # Same quoting as dotenv.set_key
+    return "{}='{}'\n".format(key, value.replace("'", "\\'"))
+
+
+def line_key(line: str):
+    stripped = line.strip()
+    if not stripped or stripped.startswith("#") or "=" not in stripped:
+        return None
+    key = stripped.split("=", 1)[0].strip()
+    return key[len("export "):].strip() if key.startswith("export ") else key
+
+
+class EnvStore:
+    """
+    ZerePy's .env parsed once and served from memory.
+
+    Writes of any number of keys are one atomic rewrite of the file, after which subscribers
+    are called with the changed keys. The file is re-parsed only when its mtime changes.
+    The line format matches ZerePy's own env store, which edits the same file.
+    """
+
+    def __init__(self, path: str = ZEREPY_ENV_PATH):
+        self.path = os.path.abspath(path)
+        self._lock = threading.Lock()
+        self._values = None
+        self._mtime = None
+        self._subscribers = []
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def values(self) -> dict:
+        with self._lock:
+            mtime = self._file_mtime()
+            if self._values is None or mtime != self._mtime:
+                values = dotenv_values(self.path) if mtime is not None else {}
+                self._values = {k: v for k, v in values.items() if v is not None}
+                self._mtime = mtime
+            return dict(self._values)
+
+    def update(self, values: dict):
+        """Set several variables (None removes one) in a single atomic rewrite"""
+        values = {key: None if value is None else str(value) for key, value in values.items()}
+        with self._lock:
+            lines = []
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    lines = f.readlines()
+
+            pending = dict(values)
+            output = []
+            for line in lines:
+                key = line_key(line)
+                if key in pending:
+                    value = pending.pop(key)
+                    if value is not None:
+                        output.append(format_line(key, value))
+                    continue
+                if key in values:
+                    continue
+                output.append(line if line.endswith("\n") else line + "\n")
+            output.extend(format_line(k, v) for k, v in pending.items() if v is not None)
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.writelines(output)
+            os.replace(tmp_path, self.path)
+            # Re-parse on the next read so values are exactly what dotenv makes of the file
+            self._values = None
+
+        for callback in self._subscribers:
+            try:
+                callback(set(values))
+            except Exception as e:
+                print(f"Env change subscriber failed: {str(e)}")
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+
+env_store = EnvStore()
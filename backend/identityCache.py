@@ -0,0 +1,64 @@
+import asyncio
+from web3 import Web3
+
+
+def is_address(value) -> bool:
+    return isinstance(value, str) and Web3.is_address(value)
+
+
+class IdentityCache:
+    """
+    Wallet addresses and other identity facts of the loaded agent, resolved once per session.
+
+    Entries are keyed by agent, connection and action, so switching agents never serves another
+    agent's wallet. Everything is dropped when the environment variables (and so the keys the
+    addresses are derived from) change.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.agent = None
+        self._entries = {}
+        self._pending = {}
+
+    def set_agent(self, agent_name: str):
+        self.agent = agent_name
+
+    def invalidate(self):
+        self._entries.clear()
+        self._pending.clear()
+
+    async def _fetch(self, connection: str, action: str):
+        response = await self.client.post("/agent/action", json={"connection": connection, "action": action})
+        return response.json()
+
+    async def get(self, connection: str, action: str, valid=None):
+        """
+        Return the ZerePy action response, calling the agent only until a valid result is cached.
+        valid checks the action result; by default any result other than None is kept.
+        """
+        key = (self.agent, connection, action)
+        if key in self._entries:
+            return self._entries[key]
+
+        # Concurrent prompts for the same fact share one lookup
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(connection, action))
+            self._pending[key] = task
+        try:
+            result = await asyncio.shield(task)
+        finally:
+            if self._pending.get(key) is task:
+                del self._pending[key]
+
+        # Errors (no agent loaded, connection not configured, a failed action reported as
+        # success with no result or an error string) are returned but never cached
+        if isinstance(result, dict) and result.get("status") == "success":
+            value = result.get("result")
+            if (valid or (lambda v: v is not None))(value):
+                self._entries[key] = result
+        return result
+
+    async def wallet_address(self, connection: str = "ethereum"):
+        return await self.get(connection, "get-address", valid=is_address)
@@ -0,0 +1,193 @@
+import json
+import logging
+import math
+import re
+from collections import OrderedDict
+
+logger = logging.getLogger("intentCache")
+
+# Values the LLM copies out of the prompt; they are re-extracted from each new prompt on a cache hit
+SLOT_PATTERNS = [
+    ("address", re.compile(r"0x[0-9a-fA-F]{40}")),
+    # "1,000" is one number; a trailing "." ends a sentence, it is not part of the number
+    ("number", re.compile(r"(?<![\w.])(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?(?!\w|\.\d)")),
+]
+
+
+def _slot_key(slot_type: str, value: str):
+    """Slot values are compared by meaning: addresses case-insensitively, numbers numerically"""
+    if slot_type == "number":
+        return slot_type, float(value.replace(",", ""))
+    return slot_type, value.lower()
+
+
+def extract_slots(prompt: str):
+    """Return the prompt with slot values replaced by placeholders, and the slot values by type in order"""
+    slots = {}
+    template = prompt
+    for slot_type, pattern in SLOT_PATTERNS:
+        slots[slot_type] = pattern.findall(template)
+        template = pattern.sub(f"<{slot_type}>", template)
+    template = " ".join(template.lower().split())
+    return template, slots
+
+
+def _contains_literal(text: str, literal: str) -> bool:
+    """Whether literal appears in text as a whole token, so "s" does not match inside "swap"."""
+    return re.search(rf"(?<!\w){re.escape(literal)}(?!\w)", text) is not None
+
+
+def _normalize(vector):
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class IntentCache:
+    """
+    Routing cache in front of an intent classification LLM call.
+
+    Prompts are reduced to a template (addresses and numbers replaced by placeholders). A prompt
+    whose template was seen before is an exact hit; otherwise the nearest cached template by
+    embedding cosine similarity is used if it clears the threshold. On a hit the cached result is
+    reused with its slot values re-extracted from the new prompt. Hits that cannot be re-extracted
+    with confidence fall through to the LLM.
+    """
+
+    def __init__(self, name: str, embed=None, threshold: float = 0.93, max_entries: int = 512):
+        self.name = name
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "rejected": 0, "misses": 0, "embed_errors": 0}
+
+    def _rebind(self, entry, prompt: str, slots):
+        """Map the cached result onto the new prompt's slot values, or None if that is not safe"""
+        old_slots = entry["slots"]
+        if any(len(old_slots[t]) != len(slots[t]) for t in old_slots):
+            return None
+
+        mapping = {}
+        for slot_type, values in old_slots.items():
+            for old, new in zip(values, slots[slot_type]):
+                key = _slot_key(slot_type, old)
+                if key in mapping and _slot_key(slot_type, mapping[key]) != _slot_key(slot_type, new):
+                    return None
+                mapping[key] = new
+
+        old_prompt = entry["prompt"].lower()
+        new_prompt = prompt.lower()
+
+        def substitute(slot_type):
+            def replace(match):
+                # Every number or address in the result must come from a slot of the prompt;
+                # anything else (e.g. an amount the model worked out) is stale for the new one
+                key = _slot_key(slot_type, match.group(0))
+                if key not in mapping:
+                    raise LookupError(match.group(0))
+                new = mapping[key]
+                if slot_type == "number" and "," not in match.group(0):
+                    return new.replace(",", "")
+                return new
+            return replace
+
+        def rebind(value):
+            if isinstance(value, dict):
+                return {k: rebind(v) for k, v in value.items()}
+            if isinstance(value, list):
+                return [rebind(v) for v in value]
+            if isinstance(value, bool) or value is None:
+                return value
+            if isinstance(value, (int, float)):
+                new = mapping.get(("number", float(value)))
+                if new is None:
+                    raise LookupError(value)
+                number = _slot_key("number", new)[1]
+                return int(number) if isinstance(value, int) and number.is_integer() else number
+
+            text = str(value)
+            rebound = text
+            for slot_type, pattern in SLOT_PATTERNS:
+                rebound = pattern.sub(substitute(slot_type), rebound)
+            if rebound != text or any(pattern.search(text) for _, pattern in SLOT_PATTERNS):
+                return rebound
+            # Any other value the model copied from the old prompt (tickers like "S" or "OP"
+            # included) must also be in the new one
+            key = text.lower()
+            if key and _contains_literal(old_prompt, key) and not _contains_literal(new_prompt, key):
+                raise LookupError(value)
+            return value
+
+        try:
+            return rebind(entry["result"])
+        except LookupError:
+            return None
+
+    def _nearest(self, vector):
+        best, best_score = None, -1.0
+        for entry in self._entries.values():
+            if entry["vector"] is None:
+                continue
+            score = sum(a * b for a, b in zip(vector, entry["vector"]))
+            if score > best_score:
+                best, best_score = entry, score
+        return best, best_score
+
+    async def _embed(self, template: str):
+        if self.embed is None:
+            return None
+        try:
+            return _normalize(await self.embed(template))
+        except Exception as e:
+            self.stats["embed_errors"] += 1
+            logger.warning(f"{self.name} intent cache embedding failed: {str(e)}")
+            return None
+
+    def _store(self, template: str, prompt: str, slots, result, vector):
+        self._entries[template] = {"prompt": prompt, "slots": slots, "result": result, "vector": vector}
+        self._entries.move_to_end(template)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def resolve(self, prompt: str, fetch):
+        """Return the routing JSON for a prompt, calling fetch (the LLM) only on a miss"""
+        template, slots = extract_slots(prompt)
+
+        entry = self._entries.get(template)
+        if entry is not None:
+            result = self._rebind(entry, prompt, slots)
+            if result is not None:
+                self._entries.move_to_end(template)
+                self.stats["exact_hits"] += 1
+                return json.dumps(result)
+            self.stats["rejected"] += 1
+
+        vector = await self._embed(template)
+        if entry is None and vector is not None:
+            nearest, score = self._nearest(vector)
+            if nearest is not None and score >= self.threshold:
+                result = self._rebind(nearest, prompt, slots)
+                if result is not None:
+                    self.stats["semantic_hits"] += 1
+                    return json.dumps(result)
+                self.stats["rejected"] += 1
+
+        self.stats["misses"] += 1
+        response = await fetch()
+        try:
+            result = json.loads(response)
+        except (TypeError, ValueError):
+            # Errors and malformed output are returned as is but never cached
+            return response
+        self._store(template, prompt, slots, result, vector)
+        return response
+
+    def get_stats(self):
+        # Rejected hits fall through to the LLM and are counted as misses too
+        lookups = self.stats["exact_hits"] + self.stats["semantic_hits"] + self.stats["misses"]
+        hits = self.stats["exact_hits"] + self.stats["semantic_hits"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
@@ -1,16 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv, set_key
-from createAgent import create_agent, get_sonic_actions, sentiment_analysis, defi_analysis, intent_detection_and_slot_filling, normal_query
+from dotenv import load_dotenv
+from createAgent import create_agent, get_sonic_actions, sentiment_analysis, defi_analysis, intent_detection_and_slot_filling, normal_query, normal_query_stream, sonic_intent_cache, launchpad_intent_cache, count_tokens
+from promptRegistry import prompts
 import json
-import requests
 import os
-from bridgeAgent import bridge_sonic_to_sepolia, mint_sbt
+import re
+from zerepyClient import zerepy_client
+from identityCache import IdentityCache, is_address
+from envStore import env_store
+from zerepyLocal import zerepy_local
+from bridgeAgent import bridge_sonic_to_sepolia, mint_sbt, resume_bridges
+from bridgeState import bridge_state
 from launchpad import deploy_contract, mint_tokens
+from txJobs import tx_jobs, PENDING
 
 load_dotenv() 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    resume_bridges()
+    yield
+    await zerepy_client.aclose()
+
+app = FastAPI(lifespan=lifespan)
+
+identity_cache = IdentityCache(zerepy_client)
+env_store.subscribe(lambda keys: identity_cache.invalidate())
+if zerepy_client.in_process:
+    env_store.subscribe(zerepy_local.reload_env)
 
 origins = [
     "*"
@@ -18,9 +40,9 @@ origins = [
 allow_credentials = True
 allow_methods = ["*"]
 allow_headers = ["*"]
+expose_headers = ["X-Job-Id"]
 
-app.add_middleware(CORSMiddleware, allow_origins=origins, allow_credentials=allow_credentials, allow_methods=allow_methods, allow_headers=allow_headers)
-base_url = "http://localhost:8000"
+app.add_middleware(CORSMiddleware, allow_origins=origins, allow_credentials=allow_credentials, allow_methods=allow_methods, allow_headers=allow_headers, expose_headers=expose_headers)
 
 @app.get("/")
 def read_root():
@@ -47,61 +69,121 @@ async def create_config(request: Request):
 
 @app.get("/listAgents")
 async def list_agents():
-    response = requests.get(f"{base_url}/agents")
+    response = await zerepy_client.get("/agents")
     return response.json()
 
 @app.get("/loadAgent")
 async def load_agent(agent_name: str):
-    response = requests.post(f"{base_url}/agents/{agent_name}/load")
+    response = await zerepy_client.post(f"/agents/{agent_name}/load", route="read")
+    if response.status_code == 200:
+        identity_cache.set_agent(agent_name)
     return response.json()
 
 @app.get("/listConnections")
 async def list_connections():
-    response = requests.get(f"{base_url}/connections")
+    response = await zerepy_client.get("/connections")
+    return response.json()
+
+def sse_event(data, event=None):
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data, default=str)}\n\n"
+
+def sse_response(events):
+    return StreamingResponse(events, media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+MY_PATTERN = re.compile(r"\bmy\b")
+
+async def resolve_prompt(prompt: str):
+    if MY_PATTERN.search(prompt):
+        address = await identity_cache.wallet_address("ethereum")
+        print(address)
+        if isinstance(address, dict) and is_address(address.get("result")):
+            prompt = MY_PATTERN.sub(address["result"], prompt)
+    return prompt
+
+async def run_chat_action(prompt: str, data: dict):
+    if data['action'] == 'analyze':
+        # response = requests.post(f"{base_url}/agent/action", json={"connection": "galadriel", "action": "generate-text", "params": [prompt, DefiAnalysisSystemPrompt]})
+        # return response.json()
+        response = await defi_analysis(prompt)
+        response = json.loads(response)
+        response["status"] = "success"
+        print(response)
+        return response
+    if data['action'] == 'bridge':
+        data = await run_in_threadpool(bridge_sonic_to_sepolia, data['parameters'][2], data['parameters'][3])
+        
+        return data
+    response = await zerepy_client.post("/agent/action", json={"connection": "sonic", "action": data["action"], "params": data['parameters']})
+    print(response.json())
     return response.json()
 
 @app.post("/chat")
 async def chat(request: Request):
     body = await request.json()
-    prompt = body["prompt"]
-    if "my" in prompt:
-        address = requests.post(f"{base_url}/agent/action", json={"connection": "ethereum", "action": "get-address"})
-        address = address.json()
-        print(address)
-        prompt = prompt.replace("my", address["result"])
+    prompt = await resolve_prompt(body["prompt"])
     response = await get_sonic_actions(prompt)
     data = json.loads(response)
     print(data)
     if data['action'] != 'question':
-        if data['action'] == 'analyze':
-            # response = requests.post(f"{base_url}/agent/action", json={"connection": "galadriel", "action": "generate-text", "params": [prompt, DefiAnalysisSystemPrompt]})
-            # return response.json()
-            response = await defi_analysis(prompt)
-            response = json.loads(response)
-            response["status"] = "success"
-            print(response)
-            return response
-        if data['action'] == 'bridge':
-            data = bridge_sonic_to_sepolia(data['parameters'][2], data['parameters'][3])
-            
-            return data
-        response = requests.post(f"{base_url}/agent/action", json={"connection": "sonic", "action": data["action"], "params": data['parameters']})
-        print(response.json())
-        return response.json()
+        return await run_chat_action(prompt, data)
     else:
         # response = requests.post(f"{base_url}/agent/action", json={"connection": "galadriel", "action": "generate-text", "params": [prompt, "You are a defi expert with all the knowledge of defi and crypto including protocols, latest news, slippage charges, social sentiments on twitter. You give statistical insights with values and risk analysis on each of the prompts. Give stepy by step response with bullet points and numbers which can be easily parsed by the frontend."]})
         # print(response.json())
         response = await normal_query(prompt)
         data = {"status": "success", "result": response}
         return data
+
+@app.post("/chat/stream")
+async def chat_stream(request: Request):
+    # Same routing as /chat, but answers to questions are streamed token by token over SSE
+    body = await request.json()
+    prompt = await resolve_prompt(body["prompt"])
+    response = await get_sonic_actions(prompt)
+    data = json.loads(response)
+    print(data)
+    if data['action'] != 'question':
+        result = await run_chat_action(prompt, data)
+        return sse_response(iter([sse_event(result, event="result"), sse_event({}, event="done")]))
+
+    async def events():
+        try:
+            async for chunk in normal_query_stream(prompt):
+                yield sse_event({"delta": chunk})
+            yield sse_event({}, event="done")
+        except Exception as e:
+            yield sse_event({"detail": f"Error generating response: {str(e)}"}, event="error")
+    return sse_response(events())
+
+@app.post("/generateTextStream")
+async def generate_text_stream(request: Request):
+    # Relay a ZerePy generate-text-stream action over SSE
+    body = await request.json()
+    payload = {"connection": body["connection"], "action": "generate-text-stream", "params": [body["prompt"], body["systemPrompt"]]}
+
+    async def events():
+        async with zerepy_client.stream("POST", "/agent/action/stream", json=payload) as response:
+            if response.status_code != 200:
+                await response.aread()
+                yield sse_event({"detail": response.text}, event="error")
+                return
+            async for line in response.aiter_lines():
+                yield f"{line}\n"
+    return sse_response(events())
     
+def job_response(job, value):
+    # Same body as before the receipt moved to the job watcher; the job id is sent as a header
+    if not job:
+        return job
+    return JSONResponse(value, headers={"X-Job-Id": job["id"]})
+
 @app.post("/mintSbt")
 async def handle_sbt(request: Request):
     body = await request.json()
     uri = body["uri"]
     walletAddress = body["walletAddress"]
-    response = mint_sbt(uri, walletAddress)
-    return response
+    job = await run_in_threadpool(mint_sbt, uri, walletAddress)
+    return job_response(job, job["tx_hash"])
 
 @app.get("/readAgent")
 async def read_agent(agent_name: str):
@@ -112,31 +194,76 @@ async def read_agent(agent_name: str):
 @app.post("/deployContract")
 async def deploy_contract_endpoint(request: Request):
     body = await request.json()
-    response = deploy_contract(body["name"], body["symbol"], body["initialSupply"], body["maxSupply"])  
-    print(response)
-    return response
+    job = await run_in_threadpool(deploy_contract, body["name"], body["symbol"], body["initialSupply"], body["maxSupply"])  
+    print(job)
+    return job_response(job, job and job["contract_address"])
 
 @app.post("/mintTokens")
 async def mint_tokens_endpoint(request: Request):
     body = await request.json()
-    response = mint_tokens(body["contractAddress"], body["to"], body["amount"])
-    print(response)
-    return response
+    # Minting into a contract still being deployed has to wait for the deployment receipt
+    deployment = tx_jobs.find(kind="deploy_contract", contract_address=body["contractAddress"])
+    if deployment and deployment["status"] == PENDING:
+        await tx_jobs.wait(deployment["id"])
+    job = await run_in_threadpool(mint_tokens, body["contractAddress"], body["to"], body["amount"])
+    print(job)
+    return job_response(job, job and job["tx_hash"])
+
+@app.get("/bridges/{bridge_id}")
+async def get_bridge(bridge_id: str):
+    bridge = bridge_state.get(bridge_id)
+    if bridge is None:
+        return JSONResponse({"detail": "Bridge not found"}, status_code=404)
+    bridge["legs"] = {leg: {k: v for k, v in state.items() if k != "raw_tx"} for leg, state in bridge["legs"].items()}
+    return bridge
+
+@app.get("/jobs")
+async def list_jobs(limit: int = 50):
+    return tx_jobs.list(limit)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = tx_jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"detail": "Job not found"}, status_code=404)
+    return job
+
+@app.get("/jobs/{job_id}/stream")
+async def stream_job(job_id: str):
+    if tx_jobs.get(job_id) is None:
+        return JSONResponse({"detail": "Job not found"}, status_code=404)
+
+    async def events():
+        async for job in tx_jobs.updates(job_id):
+            yield sse_event(job, event="job")
+        yield sse_event({}, event="done")
+    return sse_response(events())
 
 @app.post("/launchpadChat")
 async def lauchpad_chat(request: Request):
     body = await request.json()
     prompt = body["prompt"]
-    response = intent_detection_and_slot_filling(prompt)
+    response = await intent_detection_and_slot_filling(prompt)
     response = json.loads(response)
     print(response)
     return response
 
+@app.get("/intentCache/stats")
+async def intent_cache_stats():
+    return {
+        "chat": sonic_intent_cache.get_stats(),
+        "launchpadChat": launchpad_intent_cache.get_stats()
+    }
+
+@app.get("/prompts/stats")
+async def prompt_stats():
+    return await prompts.stats(count_tokens)
+
 @app.post("/sentimentAnalysis")
 async def sentiment_analysis_endpoint(request: Request):
     body = await request.json()
     prompt = body["prompt"]
-    docs = requests.post(f"{base_url}/agent/action", json={"connection": "twitter", "action": "get-latest-tweets", "params": ['aixbt_agent']})
+    docs = await zerepy_client.post("/agent/action", route="twitter", json={"connection": "twitter", "action": "get-latest-tweets", "params": ['aixbt_agent']})
     print(docs.json())
     
     if not docs or not docs.json()["result"]:
@@ -145,7 +272,7 @@ async def sentiment_analysis_endpoint(request: Request):
     else:
         tweets = docs.json()["result"]
     print(tweets)
-    response = sentiment_analysis(prompt, tweets)
+    response = await sentiment_analysis(prompt, tweets)
     response = json.loads(response)
     print(response)
     return response
@@ -154,7 +281,7 @@ async def sentiment_analysis_endpoint(request: Request):
 async def post_tweet(request: Request):
     body = await request.json()
     content = body["content"]
-    docs = requests.post(f"{base_url}/agent/action", json={"connection": "twitter", "action": "post-tweet", "params": [content]})
+    docs = await zerepy_client.post("/agent/action", route="twitter", json={"connection": "twitter", "action": "post-tweet", "params": [content]})
     response = docs.json()
     print(response)
     return response
@@ -166,48 +293,39 @@ async def perform_action(request: Request):
     action = body["action"]
     params = body["text"]
 
-    response = requests.post(f"{base_url}/agent/action", json={"connection": connection, "action": action, "params": [params]})
+    response = await zerepy_client.post("/agent/action", json={"connection": connection, "action": action, "params": [params]})
     print(response.json())
     return response.json()
 
 @app.get("/env-vars")
 async def get_env_vars():
-    env_path = "../ZerePy/.env"
-    env_vars = {}
-    
-    if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            for line in f:
-                if '=' in line:
-                    key, value = line.strip().split('=', 1)
-                    env_vars[key] = value
-    
-    return env_vars
+    return env_store.values()
+
+def env_updates(body: dict) -> dict:
+    # Either a single {"key", "value"} or a batch {"vars": {key: value}}
+    if "vars" in body:
+        return dict(body["vars"])
+    return {body["key"]: body["value"]}
 
 @app.post("/env-vars")
 async def add_env_var(request: Request):
     body = await request.json()
-    key = body["key"]
-    value = body["value"]
-    
-    env_path = "../ZerePy/.env"
-    
-    set_key(env_path, key, value)
+    env_store.update(env_updates(body))
     
     return {"message": "Environment variable added successfully"}
 
 @app.put("/env-vars")
 async def update_env_var(request: Request):
     body = await request.json()
-    key = body["key"]
-    value = body["value"]
-    
-    env_path = "../ZerePy/.env"
-    
-    # Update variable in .env file
-    set_key(env_path, key, value)
+    env_store.update(env_updates(body))
     
     return {"message": "Environment variable updated successfully"}
 
+@app.delete("/env-vars/{key}")
+async def delete_env_var(key: str):
+    env_store.update({key: None})
+    
+    return {"message": "Environment variable deleted successfully"}
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=5001, reload=True)
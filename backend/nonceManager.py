@@ -0,0 +1,26 @@
+import importlib.util
+from eth_account import Account
+from web3 import Web3
+from zerepyLocal import ZEREPY_PATH
+
+# Nonce allocation and the gas price cache are ZerePy's implementation, loaded from its file so
+# the backend does not need ZerePy's package (and its dependencies) importable
+_spec = importlib.util.spec_from_file_location("zerepy_evm_tx", ZEREPY_PATH / "src" / "helpers" / "evm_tx.py")
+evm_tx = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(evm_tx)
+
+NONCE_ERRORS = evm_tx.NONCE_ERRORS
+ALREADY_KNOWN_ERRORS = evm_tx.ALREADY_KNOWN_ERRORS
+nonce_manager = evm_tx.nonce_manager
+gas_oracle = evm_tx.gas_oracle
+
+# Sonic produces a block about every second
+SONIC_BLOCK_TIME = 1
+
+
+def send_transaction(w3: Web3, tx: dict, private_key: str, address: str, on_signed=None):
+    """
+    Assign a local nonce, sign and broadcast without waiting for the receipt.
+    on_signed is called with the signed transaction before it is broadcast.
+    """
+    return evm_tx.send_transaction(w3, Account.from_key(private_key), tx, on_signed=on_signed)
@@ -0,0 +1,46 @@
+def compact(text: str) -> str:
+    """Strip the source indentation and blank-line runs that would otherwise be sent as tokens"""
+    lines = [line.strip() for line in text.strip().splitlines()]
+    return "\n".join(line for i, line in enumerate(lines) if line or (i and lines[i - 1]))
+
+
+class PromptRegistry:
+    """
+    Static system prompts, built once on first use and kept for the life of the process.
+
+    Token counts are measured once per prompt with the provider's tokenizer so prompt
+    size can be tracked over time.
+    """
+
+    def __init__(self):
+        self._builders = {}
+        self._prompts = {}
+        self._tokens = {}
+
+    def register(self, name: str):
+        """Decorator registering a function that builds the prompt text"""
+        def decorator(builder):
+            self._builders[name] = builder
+            return builder
+        return decorator
+
+    def get(self, name: str) -> str:
+        if name not in self._prompts:
+            self._prompts[name] = compact(self._builders[name]())
+        return self._prompts[name]
+
+    async def stats(self, count_tokens) -> dict:
+        """Characters and tokens of every registered prompt; tokens are None if counting failed"""
+        result = {}
+        for name in self._builders:
+            text = self.get(name)
+            if name not in self._tokens:
+                try:
+                    self._tokens[name] = await count_tokens(text)
+                except Exception as e:
+                    print(f"Token count failed for prompt {name}: {str(e)}")
+            result[name] = {"characters": len(text), "tokens": self._tokens.get(name)}
+        return result
+
+
+prompts = PromptRegistry()
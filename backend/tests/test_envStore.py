@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+pytest.importorskip("dotenv")
+from dotenv import dotenv_values
+
+from envStore import EnvStore
+
+
+def test_update_coerces_values_to_strings_and_removes_none(tmp_path):
+    path = tmp_path / ".env"
+    path.write_text("KEEP=1\nDROP=2\n")
+    store = EnvStore(str(path))
+    changes = []
+    store.subscribe(changes.append)
+
+    store.update({"PORT": 8000, "DROP": None, "QUOTED": "it's"})
+
+    assert dotenv_values(path) == {"KEEP": "1", "PORT": "8000", "QUOTED": "it's"}
+    assert store.values() == {"KEEP": "1", "PORT": "8000", "QUOTED": "it's"}
+    assert changes == [{"PORT", "DROP", "QUOTED"}]
+
+
+def test_values_are_reparsed_when_the_file_changes(tmp_path):
+    path = tmp_path / ".env"
+    path.write_text("A=1\n")
+    store = EnvStore(str(path))
+    assert store.values() == {"A": "1"}
+    path.write_text("A=2\n")
+    os.utime(path, (1, 1))
+    assert store.values() == {"A": "2"}
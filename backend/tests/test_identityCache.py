@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("web3")
+from identityCache import IdentityCache
+
+ADDRESS = "0x" + "ab" * 20
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class FakeClient:
+    def __init__(self, *payloads):
+        self.payloads = list(payloads)
+        self.requests = []
+
+    async def post(self, path, json):
+        self.requests.append(json)
+        await asyncio.sleep(0)
+        return FakeResponse(self.payloads.pop(0) if len(self.payloads) > 1 else self.payloads[0])
+
+
+def success(result):
+    return {"status": "success", "result": result}
+
+
+def test_concurrent_lookups_share_one_request():
+    client = FakeClient(success(ADDRESS))
+    cache = IdentityCache(client)
+
+    async def lookups():
+        return await asyncio.gather(*(cache.wallet_address() for _ in range(5)))
+
+    results = asyncio.run(lookups())
+    assert all(r == success(ADDRESS) for r in results)
+    assert len(client.requests) == 1
+
+
+def test_only_valid_addresses_are_cached():
+    client = FakeClient(success("Error: wallet not configured"), success(ADDRESS))
+    cache = IdentityCache(client)
+    assert asyncio.run(cache.wallet_address())["result"].startswith("Error")
+    assert asyncio.run(cache.wallet_address()) == success(ADDRESS)
+    assert asyncio.run(cache.wallet_address()) == success(ADDRESS)
+    assert len(client.requests) == 2
+
+
+def test_errors_are_not_cached():
+    client = FakeClient({"status": "error", "message": "No agent loaded"}, success(1))
+    cache = IdentityCache(client)
+    assert asyncio.run(cache.get("sonic", "get-balance"))["status"] == "error"
+    assert asyncio.run(cache.get("sonic", "get-balance")) == success(1)
+
+
+def test_entries_are_per_agent_and_dropped_on_invalidate():
+    client = FakeClient(success(ADDRESS))
+    cache = IdentityCache(client)
+    cache.set_agent("a")
+    asyncio.run(cache.wallet_address())
+    cache.set_agent("b")
+    asyncio.run(cache.wallet_address())
+    assert len(client.requests) == 2
+
+    cache.invalidate()
+    asyncio.run(cache.wallet_address())
+    assert len(client.requests) == 3
@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+from intentCache import IntentCache, extract_slots
+
+ADDRESS_A = "0x" + "aa" * 20
+ADDRESS_B = "0x" + "bb" * 20
+
+
+def resolve(cache, prompt, result):
+    calls = []
+
+    async def fetch():
+        calls.append(prompt)
+        return json.dumps(result)
+
+    response = asyncio.run(cache.resolve(prompt, fetch))
+    return json.loads(response), bool(calls)
+
+
+async def same_vector(template):
+    return [1.0, 0.0]
+
+
+def test_extract_slots_keeps_thousands_separated_numbers_whole():
+    template, slots = extract_slots(f"Send 1,000 S to {ADDRESS_A}.")
+    assert slots == {"address": [ADDRESS_A], "number": ["1,000"]}
+    assert template == "send <number> s to <address>."
+
+
+def test_rebinds_numbers_the_model_normalised():
+    cache = IntentCache("test")
+    resolve(cache, f"send 5 S to {ADDRESS_A}", {"amount": 5.0, "to": ADDRESS_A})
+    result, fetched = resolve(cache, f"send 7 S to {ADDRESS_B}", {})
+    assert not fetched
+    assert result == {"amount": 7.0, "to": ADDRESS_B}
+
+
+def test_rebinds_thousands_separators():
+    cache = IntentCache("test")
+    resolve(cache, "swap 1,000 USDC for S", {"amount": 1000, "text": "1000"})
+    result, fetched = resolve(cache, "swap 2,500 USDC for S", {})
+    assert not fetched
+    assert result == {"amount": 2500, "text": "2500"}
+
+
+def test_integer_result_keeps_a_fractional_new_value():
+    cache = IntentCache("test")
+    resolve(cache, "stake 5 S", {"amount": 5})
+    result, _ = resolve(cache, "stake 2.5 S", {})
+    assert result == {"amount": 2.5}
+
+
+def test_number_not_taken_from_the_prompt_is_not_reused():
+    cache = IntentCache("test")
+    resolve(cache, "send half of 10 S", {"amount": 5})
+    result, fetched = resolve(cache, "send half of 20 S", {"amount": 10})
+    assert fetched
+    assert result == {"amount": 10}
+    assert cache.stats["rejected"] == 1
+
+
+def test_changed_ticker_falls_through_on_a_semantic_hit():
+    cache = IntentCache("test", embed=same_vector)
+    resolve(cache, "buy 5 S", {"amount": 5, "token": "S"})
+    result, fetched = resolve(cache, "buy 5 OP", {"amount": 5, "token": "OP"})
+    assert fetched
+    assert result["token"] == "OP"
+
+
+def test_embedding_failure_is_counted_and_falls_through():
+    async def broken(template):
+        raise RuntimeError("down")
+
+    cache = IntentCache("test", embed=broken)
+    result, fetched = resolve(cache, "price of S", {"intent": "price"})
+    assert fetched
+    assert cache.get_stats()["embed_errors"] == 1
+
+
+def test_malformed_responses_are_not_cached():
+    cache = IntentCache("test")
+
+    async def fetch():
+        return "error"
+
+    assert asyncio.run(cache.resolve("hello", fetch)) == "error"
+    assert cache.get_stats()["entries"] == 0
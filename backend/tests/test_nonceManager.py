@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("web3")
+from eth_account import Account
+from web3 import Web3
+
+import nonceManager
+
+
+class FakeEth:
+    def __init__(self, error=None):
+        self.error = error
+        self.sent = []
+
+    def get_transaction_count(self, address, block):
+        return 3
+
+    def send_raw_transaction(self, raw):
+        if self.error:
+            raise self.error
+        self.sent.append(raw)
+        return b"hash"
+
+
+def fake_web3(error=None):
+    return SimpleNamespace(provider=SimpleNamespace(endpoint_uri=f"http://node/{id(error)}"), eth=FakeEth(error))
+
+
+def test_uses_zerepys_allocator_and_error_lists():
+    assert type(nonceManager.nonce_manager).__name__ == "NonceManager"
+    assert nonceManager.nonce_manager is nonceManager.evm_tx.nonce_manager
+    assert "already known" not in nonceManager.NONCE_ERRORS
+    assert "already known" in nonceManager.ALREADY_KNOWN_ERRORS
+
+
+def tx():
+    return {"to": Web3.to_checksum_address("0x" + "11" * 20), "value": 1, "gas": 21000, "gasPrice": 1, "chainId": 1}
+
+
+def test_send_transaction_signs_with_the_private_key():
+    account = Account.create()
+    web3 = fake_web3()
+    signed = []
+    assert nonceManager.send_transaction(web3, tx(), account.key, account.address, on_signed=signed.append) == b"hash"
+    assert len(web3.eth.sent) == 1
+    assert Account.recover_transaction(web3.eth.sent[0]) == account.address
+
+
+def test_send_transaction_treats_already_known_as_sent():
+    account = Account.create()
+    web3 = fake_web3(ValueError("already known"))
+    signed = []
+    tx_hash = nonceManager.send_transaction(web3, tx(), account.key, account.address, on_signed=signed.append)
+    assert tx_hash == signed[0].hash
@@ -0,0 +1,82 @@
+import asyncio
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("web3")
+pytest.importorskip("rlp")
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+
+from txJobs import CONFIRMED, FAILED, PENDING, TIMEOUT, TxJobs, contract_address_for
+
+
+class FakeEth:
+    def __init__(self, receipt=None):
+        self.receipt = receipt
+        self._blocks = itertools.count(1)
+
+    @property
+    def block_number(self):
+        return next(self._blocks)
+
+    def get_transaction_receipt(self, tx_hash):
+        if self.receipt is None:
+            raise TransactionNotFound("not yet")
+        return self.receipt
+
+
+def fake_web3(receipt=None):
+    return SimpleNamespace(provider=SimpleNamespace(endpoint_uri=f"http://node/{id(receipt)}"), eth=FakeEth(receipt))
+
+
+def tx_hash(n=1):
+    return HexBytes(bytes([n]) * 32)
+
+
+def test_contract_address_for_matches_create_address():
+    sender = "0x6ac7ea33f8831ea9dcc53393aaa88b25a785dbf0"
+    assert contract_address_for(sender, 0) == Web3.to_checksum_address("0xcd234a471b72ba2f1ccf0a70fcaba648a5eecd8d")
+    assert contract_address_for(sender, 1).lower() == "0x343c43a37d37dff08ae8c4a11544c718abb4fcf8"
+
+
+def test_watcher_records_receipt_and_calls_on_done():
+    jobs = TxJobs(poll_interval=0.01)
+    done = []
+    receipt = {"status": 1, "blockNumber": 7, "gasUsed": 21000, "contractAddress": "0x" + "cd" * 20}
+    job = jobs.submit(fake_web3(receipt), tx_hash(), "deploy", on_done=done.append, token="T")
+    assert job["status"] == PENDING
+    assert job["tx_hash"] == tx_hash().hex()
+
+    finished = asyncio.run(jobs.wait(job["id"], timeout=5))
+    assert finished["status"] == CONFIRMED
+    assert finished["block_number"] == 7
+    assert finished["contract_address"] == "0x" + "cd" * 20
+    assert done[0]["id"] == job["id"]
+    assert jobs.find(token="T")["id"] == job["id"]
+
+
+def test_reverted_transaction_is_failed():
+    jobs = TxJobs(poll_interval=0.01)
+    job = jobs.submit(fake_web3({"status": 0, "blockNumber": 3, "gasUsed": 50000}), tx_hash(), "transfer")
+    finished = asyncio.run(jobs.wait(job["id"], timeout=5))
+    assert finished["status"] == FAILED
+    assert finished["error"] == "Transaction reverted"
+
+
+def test_missing_receipt_times_out():
+    jobs = TxJobs(poll_interval=0.01, receipt_timeout=0)
+    job = jobs.submit(fake_web3(), tx_hash(), "transfer")
+    finished = asyncio.run(jobs.wait(job["id"], timeout=5))
+    assert finished["status"] == TIMEOUT
+
+
+def test_only_finished_jobs_are_evicted():
+    jobs = TxJobs(poll_interval=0.01, max_jobs=1)
+    first = jobs.submit(fake_web3({"status": 1, "blockNumber": 1, "gasUsed": 1}), tx_hash(1), "transfer")
+    asyncio.run(jobs.wait(first["id"], timeout=5))
+    pending = jobs.submit(fake_web3(), tx_hash(2), "transfer")
+    assert jobs.get(first["id"]) is None
+    assert jobs.get(pending["id"])["status"] == PENDING
@@ -0,0 +1,181 @@
+import asyncio
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+import rlp
+from eth_utils import keccak, to_checksum_address
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+
+PENDING = "pending"
+CONFIRMED = "confirmed"
+FAILED = "failed"
+TIMEOUT = "timeout"
+
+
+def contract_address_for(sender: str, nonce: int) -> str:
+    """Address a contract deployed by sender with this nonce will have"""
+    return to_checksum_address(keccak(rlp.encode([bytes.fromhex(sender[2:]), nonce]))[12:])
+
+
+class TxJobs:
+    """
+    Table of submitted transactions and a background watcher recording their receipts.
+
+    Endpoints return as soon as a transaction is broadcast; the watcher thread checks each chain
+    for a new block every poll interval and only then looks up the receipts still pending there.
+    Clients poll or stream a job by id. Finished jobs are kept up to max_jobs.
+    """
+
+    def __init__(self, poll_interval: float = 1.0, receipt_timeout: float = 600, max_jobs: int = 1000):
+        self.poll_interval = poll_interval
+        self.receipt_timeout = receipt_timeout
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._clients = {}
+        self._callbacks = {}
+        self._last_block = {}
+        self._watcher = None
+
+    def submit(self, w3: Web3, tx_hash, kind: str, on_done=None, **info) -> dict:
+        """Start tracking a broadcast transaction; on_done is called with the job once it leaves pending"""
+        now = time.time()
+        job = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "tx_hash": tx_hash.hex(),
+            "status": PENDING,
+            "block_number": None,
+            "error": None,
+            "submitted_at": now,
+            "updated_at": now,
+            **info,
+        }
+        with self._lock:
+            self._jobs[job["id"]] = job
+            self._clients[job["id"]] = (w3, tx_hash)
+            if on_done is not None:
+                self._callbacks[job["id"]] = on_done
+            self._evict()
+            if self._watcher is None or not self._watcher.is_alive():
+                self._watcher = threading.Thread(target=self._watch, name="tx-jobs", daemon=True)
+                self._watcher.start()
+        return dict(job)
+
+    def _evict(self):
+        finished = (job_id for job_id, job in self._jobs.items() if job["status"] != PENDING)
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in list(itertools.islice(finished, max(excess, 0))):
+            del self._jobs[job_id]
+
+    def get(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list(self, limit: int = 50):
+        with self._lock:
+            return [dict(job) for job in list(self._jobs.values())[-limit:]]
+
+    def find(self, **info):
+        """Most recent job whose fields match, e.g. find(contract_address=...)"""
+        with self._lock:
+            for job in reversed(self._jobs.values()):
+                if all(job.get(k) == v for k, v in info.items()):
+                    return dict(job)
+        return None
+
+    async def wait(self, job_id: str, timeout: float = None):
+        """Wait without blocking the event loop until the job leaves pending, and return it"""
+        deadline = time.monotonic() + (timeout if timeout is not None else self.receipt_timeout)
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] != PENDING or time.monotonic() > deadline:
+                return job
+            await asyncio.sleep(self.poll_interval)
+
+    async def updates(self, job_id: str):
+        """Yield the job every time it changes until it leaves pending"""
+        last = None
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                return
+            if job["updated_at"] != last:
+                last = job["updated_at"]
+                yield job
+            if job["status"] != PENDING:
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    def _update(self, job_id: str, **fields):
+        callback = None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields, updated_at=time.time())
+            if fields.get("status", PENDING) != PENDING:
+                self._clients.pop(job_id, None)
+                callback = self._callbacks.pop(job_id, None)
+        if callback is not None and job is not None:
+            try:
+                callback(dict(job))
+            except Exception as e:
+                print(f"Job {job_id} callback failed: {str(e)}")
+
+    def _new_block(self, w3: Web3) -> bool:
+        key = w3.provider.endpoint_uri
+        block_number = w3.eth.block_number
+        if self._last_block.get(key) == block_number:
+            return False
+        self._last_block[key] = block_number
+        return True
+
+    def _check(self, job_id: str, w3: Web3, tx_hash):
+        try:
+            receipt = w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            job = self.get(job_id)
+            if job and time.time() - job["submitted_at"] > self.receipt_timeout:
+                self._update(job_id, status=TIMEOUT, error="No receipt before the timeout")
+            return
+        fields = {
+            "status": CONFIRMED if receipt["status"] == 1 else FAILED,
+            "block_number": receipt["blockNumber"],
+            "gas_used": receipt["gasUsed"],
+        }
+        if receipt.get("contractAddress"):
+            fields["contract_address"] = receipt["contractAddress"]
+        if fields["status"] == FAILED:
+            fields["error"] = "Transaction reverted"
+        self._update(job_id, **fields)
+
+    def _watch(self):
+        while True:
+            with self._lock:
+                pending = list(self._clients.items())
+            if not pending:
+                with self._lock:
+                    if not self._clients:
+                        self._watcher = None
+                        return
+                continue
+
+            by_chain = {}
+            for job_id, (w3, tx_hash) in pending:
+                by_chain.setdefault(w3.provider.endpoint_uri, (w3, []))[1].append((job_id, tx_hash))
+            for w3, jobs in by_chain.values():
+                try:
+                    if not self._new_block(w3):
+                        continue
+                    for job_id, tx_hash in jobs:
+                        self._check(job_id, w3, tx_hash)
+                except Exception as e:
+                    print(f"Receipt watcher error: {str(e)}")
+            time.sleep(self.poll_interval)
+
+
+tx_jobs = TxJobs()
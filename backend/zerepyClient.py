@@ -0,0 +1,73 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+import httpx
+from zerepyLocal import zerepy_local
+
+ZEREPY_BASE_URL = os.getenv("ZEREPY_BASE_URL", "http://localhost:8000")
+# Run ZerePy agents inside the backend process instead of calling the ZerePy server over HTTP
+ZEREPY_IN_PROCESS = os.getenv("ZEREPY_IN_PROCESS", "false").lower() == "true"
+
+# Per route group: (timeout in seconds, max requests in flight to the ZerePy server)
+ROUTE_LIMITS = {
+    "read": (10.0, 64),      # listings and agent loading
+    "action": (60.0, 32),    # agent actions, on-chain actions can take a while
+    "twitter": (30.0, 4),    # rate limited upstream, no point in piling up requests
+    "stream": (300.0, 32),   # SSE relays stay open for the whole generation
+}
+
+
+class ZerePyClient:
+    """
+    Pooled keep-alive async client for the ZerePy server with per-route timeouts and concurrency limits.
+    With in_process set, the same calls are answered by agents loaded in this process.
+    """
+
+    def __init__(self, base_url: str = ZEREPY_BASE_URL, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 in_process: bool = ZEREPY_IN_PROCESS):
+        self.base_url = base_url
+        self.in_process = in_process
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        self._client = None
+        self._semaphores = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(base_url=self.base_url, limits=self.limits)
+        return self._client
+
+    def _semaphore(self, route: str) -> asyncio.Semaphore:
+        if route not in self._semaphores:
+            self._semaphores[route] = asyncio.Semaphore(ROUTE_LIMITS[route][1])
+        return self._semaphores[route]
+
+    async def request(self, method: str, path: str, route: str = "read", **kwargs) -> httpx.Response:
+        kwargs.setdefault("timeout", ROUTE_LIMITS[route][0])
+        async with self._semaphore(route):
+            if self.in_process and zerepy_local.available():
+                return await zerepy_local.request(method, path, **kwargs)
+            return await self._get_client().request(method, path, **kwargs)
+
+    async def get(self, path: str, route: str = "read", **kwargs) -> httpx.Response:
+        return await self.request("GET", path, route, **kwargs)
+
+    async def post(self, path: str, route: str = "action", **kwargs) -> httpx.Response:
+        return await self.request("POST", path, route, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, path: str, route: str = "stream", **kwargs):
+        kwargs.setdefault("timeout", ROUTE_LIMITS[route][0])
+        async with self._semaphore(route):
+            if self.in_process and zerepy_local.available():
+                yield await zerepy_local.stream(method, path, **kwargs)
+                return
+            async with self._get_client().stream(method, path, **kwargs) as response:
+                yield response
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+zerepy_client = ZerePyClient()
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+ZEREPY_PATH = Path(os.getenv("ZEREPY_PATH", Path(__file__).resolve().parent.parent / "ZerePy"))
+
+
+class LocalResponse:
+    """The parts of httpx.Response the backend uses, for actions dispatched in-process"""
+
+    def __init__(self, status_code: int, body=None, lines=None):
+        self.status_code = status_code
+        self._body = body
+        self._lines = lines
+
+    def json(self):
+        return self._body
+
+    @property
+    def text(self) -> str:
+        return json.dumps(self._body, default=str)
+
+    async def aread(self) -> bytes:
+        return self.text.encode()
+
+    async def aiter_lines(self):
+        async for line in self._lines:
+            yield line
+
+
+def _sse_lines(data, event=None):
+    """One Server-Sent Events message as the lines an SSE response body would contain"""
+    lines = [f"event: {event}"] if event else []
+    return lines + [f"data: {json.dumps(data, default=str)}", ""]
+
+
+class LocalZerePy:
+    """
+    ZerePy agents loaded inside the backend process.
+
+    Answers the ZerePy server routes the backend uses with the same response shapes, without
+    the HTTP loopback hop and the second round of JSON encoding and FastAPI dispatch.
+    """
+
+    def __init__(self, path: Path = ZEREPY_PATH):
+        self.path = Path(path)
+        self.agents = {}
+        self.connection_cache = {}
+        self.agent = None
+        self._agent_class = None
+        self._import_error = None
+        self._lock = threading.Lock()
+
+    def _get_agent_class(self):
+        with self._lock:
+            if self._agent_class is None:
+                if str(self.path) not in sys.path:
+                    sys.path.insert(0, str(self.path))
+                # ZerePy imports a connection's SDK only when an agent configures it, so this needs
+                # just ZerePy's core dependencies on top of the backend's
+                from src.agent import ZerePyAgent
+                from src.helpers.env_store import env_store
+                # Absolute paths instead of chdir: the backend's own relative paths must keep working
+                env_store.path = str(self.path / ".env")
+                env_store.reload()
+                self._agent_class = ZerePyAgent
+        return self._agent_class
+
+    def available(self) -> bool:
+        """Whether ZerePy can be imported here; if not the client keeps calling the server over HTTP"""
+        if self._import_error is None and self._agent_class is None:
+            try:
+                self._get_agent_class()
+            except ImportError as e:
+                self._import_error = e
+                print(f"In-process ZerePy unavailable, falling back to {os.getenv('ZEREPY_BASE_URL', 'http://localhost:8000')}: {e}")
+        return self._agent_class is not None
+
+    def reload_env(self, changed_keys=None):
+        """Make agents loaded in this process pick up a changed .env right away"""
+        if self._agent_class is None:
+            return
+        from src.helpers.env_store import env_store
+        env_store.reload()
+
+    def list_agents(self):
+        return [f.stem for f in (self.path / "agents").glob("*.json") if f.stem != "general"]
+
+    def load_agent(self, name: str):
+        agent_class = self._get_agent_class()
+        if name not in self.agents:
+            self.agents[name] = agent_class(name, connection_cache=self.connection_cache, agents_dir=self.path / "agents")
+        self.agent = self.agents[name]
+        return self.agent
+
+    def list_connections(self):
+        manager = self.agent.connection_manager
+        return {
+            name: {
+                "configured": manager.is_connection_configured(name),
+                "is_llm_provider": conn.is_llm_provider
+            }
+            for name, conn in manager.connections.items()
+        }
+
+    def perform_action(self, connection: str, action: str, params=None):
+        """Synchronous dispatch for callers running outside the event loop"""
+        if not self.agent:
+            raise RuntimeError("No agent loaded")
+        return self.agent.perform_action(connection=connection, action=action, params=params or [])
+
+    async def _perform_action(self, body: dict):
+        return await self.agent.perform_action_async(
+            connection=body["connection"],
+            action=body["action"],
+            params=body.get("params") or []
+        )
+
+    async def request(self, method: str, path: str, json=None, **kwargs) -> LocalResponse:
+        try:
+            if method == "GET" and path == "/agents":
+                return LocalResponse(200, {"agents": self.list_agents()})
+            if method == "POST" and path.startswith("/agents/") and path.endswith("/load"):
+                name = path[len("/agents/"):-len("/load")]
+                await asyncio.to_thread(self.load_agent, name)
+                return LocalResponse(200, {"status": "success", "agent": name})
+            if not self.agent:
+                return LocalResponse(400, {"detail": "No agent loaded"})
+            if method == "GET" and path == "/connections":
+                return LocalResponse(200, {"connections": await asyncio.to_thread(self.list_connections)})
+            if method == "POST" and path == "/agent/action":
+                return LocalResponse(200, {"status": "success", "result": await self._perform_action(json)})
+        except Exception as e:
+            return LocalResponse(400, {"detail": str(e)})
+        return LocalResponse(404, {"detail": "Not Found"})
+
+    async def stream(self, method: str, path: str, json=None, **kwargs) -> LocalResponse:
+        if path != "/agent/action/stream":
+            return LocalResponse(404, {"detail": "Not Found"})
+        if not self.agent:
+            return LocalResponse(400, {"detail": "No agent loaded"})
+        try:
+            result = await self._perform_action(json)
+        except Exception as e:
+            return LocalResponse(400, {"detail": str(e)})
+        if result is None:
+            return LocalResponse(400, {"detail": f"Action {json['action']} failed"})
+
+        async def lines():
+            done = object()
+            try:
+                if hasattr(result, "__next__"):
+                    # Pull chunks from the blocking provider stream off the event loop
+                    while (chunk := await asyncio.to_thread(next, result, done)) is not done:
+                        for line in _sse_lines({"delta": chunk}):
+                            yield line
+                else:
+                    for line in _sse_lines({"result": result}, event="result"):
+                        yield line
+                for line in _sse_lines({}, event="done"):
+                    yield line
+            except Exception as e:
+                for line in _sse_lines({"detail": str(e)}, event="error"):
+                    yield line
+
+        return LocalResponse(200, lines=lines())
+
+
+zerepy_local = LocalZerePy()